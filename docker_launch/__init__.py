@@ -8,17 +8,37 @@ try:
 except:  # noqa: E722
     __version__ = "0.0.0"
 
+import functools
+import importlib
 import logging
+from typing import Any, List
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("docker-launch")
 
-# Aliases
-from .launch import launch_containers  # noqa: F401, E402
-from .connection import check_connection  # noqa: F401, E402
+# Aliases, imported on first access to keep ``import docker_launch`` free of docker
+# and paramiko.
+_aliases = {
+    "launch_containers": ".launch",
+    "check_connection": ".connection",
+    "ClientPool": ".pool",
+    "AsyncContainers": ".async_launch",
+}
 
 
-def check_docker_available():
+def __getattr__(name: str) -> Any:
+    if name in _aliases:
+        module = importlib.import_module(_aliases[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals().keys()) + list(_aliases.keys()))
+
+
+@functools.lru_cache(maxsize=None)
+def check_docker_available() -> bool:
     import docker
 
     try:
@@ -26,7 +46,3 @@ def check_docker_available():
         return True
     except docker.errors.DockerException:
         return False
-
-
-if not check_docker_available():
-    logger.warning("Docker isn't available in this environment.")
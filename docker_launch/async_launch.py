@@ -0,0 +1,231 @@
+"""Start, watch and terminate distributed containers on an asyncio event loop.
+
+Docker SDK is blocking, so every API call is still run in a thread. Unlike
+:class:`docker_launch.launch.Containers`, the threads come from single bounded executor
+shared by all operations, and the number of in-flight calls per host is limited.
+
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import itertools
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import docker
+
+from docker_launch import logger
+from . import profiling, utils
+from .config_parser import LaunchEntry, LaunchPlan
+from .exceptions import LaunchError
+from .launch import (
+    Containers,
+    _call,
+    _ensure_image,
+    _images,
+    _set_status,
+    list_status,
+    wait_ready,
+)
+from .metrics import LaunchMetrics
+from .pool import ClientPool
+from .typing import PathLike
+
+
+class AsyncContainers:
+    """Asynchronous counterpart of :class:`docker_launch.launch.Containers`.
+
+    Parameters
+    ----------
+    config_path
+        Path to launch configuration file.
+    pool
+        Docker clients to use. New pool is created if omitted.
+    group_id
+        ID of the launch group, labelled on the containers. Random if omitted.
+    max_per_host
+        Maximum number of concurrent API calls to single Docker daemon.
+    max_workers
+        Number of threads which run blocking API calls.
+
+    Examples
+    --------
+    >>> async def main():
+    ...     c = AsyncContainers("path/to/config.toml")
+    ...     await c.start()
+    ...     await c.watch()
+    >>> asyncio.run(main())
+
+    """
+
+    def __init__(
+        self,
+        config_path: PathLike,
+        pool: ClientPool = None,
+        group_id: str = None,
+        *,
+        max_per_host: int = 8,
+        max_workers: int = 32,
+    ) -> None:
+        self.config_path = config_path
+        self.pool = ClientPool() if pool is None else pool
+        self.group_id = uuid.uuid4().hex[:12] if group_id is None else group_id
+        self.metrics = LaunchMetrics()
+        self.max_per_host = max_per_host
+        self.containers_list = []
+        self._machines: Dict[str, Hashable] = {}
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._limits: Dict[Optional[str], asyncio.Semaphore] = {}
+
+    @property
+    def config(self) -> LaunchPlan:
+        return LaunchPlan.load(self.config_path)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+    async def _run(self, machine: Hashable, func: Callable, *args, **kwargs) -> Any:
+        base_url = utils.resolve_base_url(machine)
+        if base_url not in self._limits:
+            self._limits[base_url] = asyncio.Semaphore(self.max_per_host)
+        async with self._limits[base_url]:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(func, *args, **kwargs)
+            return await loop.run_in_executor(self._executor, call)
+
+    def _call(
+        self, container: docker.client.ContainerCollection, method: str, **kwargs
+    ) -> Any:
+        machine = self._machines.get(container.id)
+        return _call(self.pool, machine, container, method, **kwargs)
+
+    async def prepare(self) -> None:
+        """Pull images missing on each daemon, see ``Containers.prepare``."""
+
+        def _prepare(machine: Hashable, image: str) -> None:
+            _ensure_image(self.pool.get(machine), image)
+
+        await asyncio.gather(
+            *[
+                self._run(machine, _prepare, machine, image)
+                for (_, image), machine in _images(self.config).items()
+            ]
+        )
+
+    async def start(
+        self, ready_timeout: float = 120.0, **docker_run_kwargs
+    ) -> List[docker.client.ContainerCollection]:
+        if len(self.containers_list) > 0:
+            raise LaunchError("This process is already running a launch group.")
+        await self.prepare()
+        plan = self.config
+        group_labels = Containers._group_labels(self.group_id, plan)
+
+        def _start(machine: Hashable, entry: LaunchEntry):
+            client = self.pool.get(machine)
+            return Containers._create(
+                client, machine, entry, group_labels, self.metrics, **docker_run_kwargs
+            )
+
+        def _wait_ready(
+            container: docker.client.ContainerCollection, entry: LaunchEntry
+        ):
+            host = utils.resolve_base_url(self._machines.get(container.id))
+            with profiling.span("container.ready", host):
+                wait_ready(container, entry.ready_log, ready_timeout)
+
+        async def _start_one(entry: LaunchEntry):
+            container = await self._run(entry.machine, _start, entry.machine, entry)
+            self._machines[container.id] = entry.machine
+            self.containers_list.append(container)
+            return container
+
+        # Readiness of containers per table, which entries depending on it await.
+        ready: Dict[str, List[asyncio.Future]] = defaultdict(list)
+
+        async def _launch(entry: LaunchEntry):
+            await asyncio.gather(*[t for d in entry.depends_on for t in ready[d]])
+            container = await _start_one(entry)
+            if entry.table is not None:
+                await self._run(entry.machine, _wait_ready, container, entry)
+            return container
+
+        tasks = []
+        # Layers put every table before the ones depending on it.
+        for entry in itertools.chain.from_iterable(plan.layers):
+            tasks.append(asyncio.ensure_future(_launch(entry)))
+            if entry.table is not None:
+                ready[entry.table].append(tasks[-1])
+        await asyncio.gather(*tasks)
+        logger.info(f"Launch group '{self.group_id}' started.")
+        return self.containers_list
+
+    async def _each(self, func: Callable, containers: List = None) -> List:
+        containers = self.containers_list if containers is None else containers
+        return await asyncio.gather(
+            *[self._run(self._machines.get(c.id), func, c) for c in containers]
+        )
+
+    async def stop(self) -> None:
+        def _stop(container: docker.client.ContainerCollection) -> None:
+            try:
+                self._call(container, "stop", timeout=3)
+                logger.info(f"Container {container} has stopped.")
+            except Exception as e:
+                logger.warning(str(e))
+
+        logger.info("Gracefully stopping containers, may take time.")
+        await self._each(_stop)
+
+    async def remove(self) -> None:
+        def _remove(container: docker.client.ContainerCollection) -> None:
+            try:
+                self._call(container, "remove")
+                logger.info(f"Container {container} successfully removed.")
+            except Exception as e:
+                logger.warning(str(e))
+
+        await self._each(_remove)
+
+    async def ping(self) -> Dict[str, List[docker.client.ContainerCollection]]:
+        def _ping(machine: Hashable, ids: List[str]) -> Dict[str, str]:
+            try:
+                return list_status(self.pool.get(machine), ids)
+            except docker.errors.APIError:
+                raise
+            except Exception:
+                return list_status(self.pool.reconnect(machine), ids)
+
+        machines, grouped = {}, {}
+        for c in self.containers_list:
+            machine = self._machines.get(c.id)
+            machine = machines.setdefault(utils.resolve_base_url(machine), machine)
+            grouped.setdefault(machine, []).append(c.id)
+
+        status = {}
+        results = await asyncio.gather(
+            *[self._run(m, _ping, m, ids) for m, ids in grouped.items()]
+        )
+        _ = [status.update(r) for r in results]
+
+        info = []
+        for c in self.containers_list:
+            _status = status.get(c.id, "not found")
+            _set_status(c, _status)
+            if _status != "running":
+                info.append({"container": c, "status": _status})
+        return utils.groupby(info, "status")
+
+    async def watch(self, interval: float = 1.0) -> None:
+        try:
+            while True:
+                not_running = await self.ping()
+                if not_running:
+                    logger.info(str(not_running))
+                await asyncio.sleep(interval)
+        except Exception as e:
+            logger.error(e)
+            await self.stop()
@@ -6,28 +6,231 @@ configuration file, then convert a1 - a3 into the list of b1 - b3.
 a1. Docker image
 a2. Command template
 a3. Individual container configuration
+a4. Tables the group depends on, and log pattern which tells it's ready
 
 b1. Docker image
 b2. Full command
 b3. Machine to run the container
+b4. Startup stage, dependencies and readiness log pattern, only if the group uses
+    them
 
 """
 
+import hashlib
+import itertools
+import operator
+import re
+import string
+import threading
 from collections import defaultdict
-from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Hashable, List, overload
-
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    Set,
+    Tuple,
+    overload,
+)
+
+import tomlkit
 from tomlkit.toml_document import TOMLDocument
-from tomlkit.toml_file import TOMLFile
 
-from . import utils
+try:
+    import tomllib as _toml
+except ImportError:
+    try:
+        import tomli as _toml
+    except ImportError:
+        _toml = None
+
+from docker_launch import logger
+from . import profiling, utils
 from .exceptions import ConfigFileError
+from .plan_cache import PlanCache
 from .typing import Literal, PathLike
 
 
 Substitution = Dict[str, str]
-LaunchConfiguration = Dict[Literal["image", "cmd", "machine"], str]
+LaunchConfiguration = Dict[
+    Literal["image", "cmd", "machine", "stage", "ready_log", "table", "depends_on"],
+    Any,
+]
+FileStamp = Tuple[int, int, str]
+"""Modification time in ns, size and SHA-256 digest of a file."""
+MatrixAxis = Tuple[str, Sequence]
+
+
+def _toml_loads(text: str) -> Dict[str, Any]:
+    """Parse TOML into plain dicts, using ``tomllib`` or ``tomli`` if available.
+
+    Style-preserving documents of ``tomlkit`` are only worth their cost when the
+    file is written back, which the parser never does.
+
+    """
+    if _toml is not None:
+        return _toml.loads(text)
+    return tomlkit.parse(text).unwrap()
+
+
+class CommandTemplate:
+    """Command template parsed once, then rendered for any number of targets.
+
+    Placeholders are renumbered into positional fields, so rendering a target is a
+    single ``str.format`` call on the values looked up by name. Placeholders missing
+    in a target are rendered as empty string, as ``format_map`` with default value
+    would do.
+
+    Parameters
+    ----------
+    template
+        Command with ``str.format`` style placeholders, e.g. ``"ls {dir}"``.
+
+    Raises
+    ------
+    ConfigFileError
+        If the template is malformed or contains positional placeholder such as
+        ``{}`` or ``{0}``.
+
+    Examples
+    --------
+    >>> template = CommandTemplate("ls {opt} {dir}")
+    >>> template.fields
+    ('opt', 'dir')
+    >>> template.render_all([{"opt": "-l", "dir": "./"}, {"dir": "../"}])
+    ['ls -l ./', 'ls  ../']
+
+    """
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        fields: List[str] = []
+        try:
+            self._format = self._compile(template, fields)
+        except ValueError as e:
+            raise ConfigFileError(f"Invalid command template {template!r} : {e}")
+        self.fields: Tuple[str, ...] = tuple(fields)
+
+    @classmethod
+    def _compile(cls, template: str, fields: List[str]) -> str:
+        """Renumber the placeholders, appending new names to ``fields`` in place."""
+        compiled = []
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            compiled.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            name = re.match(r"[^.\[]*", field).group()
+            if (name == "") or name.isdigit():
+                raise ValueError(
+                    f"positional placeholder '{{{field}}}' isn't supported"
+                )
+            if name not in fields:
+                fields.append(name)
+            # Placeholders nested in format spec, e.g. "{value:{width}}".
+            spec = cls._compile(spec, fields) if spec else ""
+            compiled.append(
+                "{"
+                + str(fields.index(name))
+                + field[len(name) :]
+                + (f"!{conversion}" if conversion else "")
+                + (f":{spec}" if spec else "")
+                + "}"
+            )
+        return "".join(compiled)
+
+    def render(self, values: Substitution) -> str:
+        return self._format.format(*[values.get(f, "") for f in self.fields])
+
+    def render_all(self, values: List[Substitution]) -> List[str]:
+        """Render the template for every target, in one pass."""
+        render, fields = self._format.format, self.fields
+        if not fields:
+            return [render()] * len(values)
+        if len(fields) == 1:
+            return [render(v.get(fields[0], "")) for v in values]
+        try:
+            # Fast path for the common case, every target defines every placeholder.
+            get = operator.itemgetter(*fields)
+            return [render(*get(v)) for v in values]
+        except KeyError:
+            return [render(*[v.get(f, "") for f in fields]) for v in values]
+
+    def check(self, values: List[Substitution], name: str = "") -> None:
+        """Warn about placeholders missing in targets, and target keys never used.
+
+        Keys wrapped in double underscores, such as ``__machine__``, are not
+        placeholders and are ignored.
+
+        """
+        fields = set(self.fields)
+        keys = set().union(*values) if values else set()
+        unused = {k for k in keys - fields if not k.startswith("__")}
+        where = f" of '{name}'" if name else ""
+        if unused:
+            logger.warning(
+                f"Keys {sorted(unused)} of targets{where} aren't used by command "
+                f"{self.template!r}."
+            )
+        missing = [(f, sum(f not in v for v in values)) for f in self.fields]
+        missing = [f"{{{f}}} in {n} of {len(values)}" for f, n in missing if n > 0]
+        if missing:
+            logger.warning(
+                f"Placeholders of command{where} are missing in targets, rendered as "
+                f"empty string : {', '.join(missing)}"
+            )
+
+
+def _matrix_axes(matrix: Any, name: str = "") -> List[MatrixAxis]:
+    """Validate ``matrix`` table of a config table, into (key, values) pairs.
+
+    Each value is either an array, or a table of integer ``start``, ``stop`` and
+    optional ``step``, which is expanded like ``range`` (``stop`` is exclusive).
+
+    """
+    if not isinstance(matrix, dict):
+        raise ConfigFileError(
+            f"Value of 'matrix' in '{name}' should be table, got {type(matrix)}."
+        )
+    axes = []
+    for key, values in matrix.items():
+        if isinstance(values, list):
+            axes.append((str(key), list(values)))
+            continue
+        if not isinstance(values, dict):
+            raise ConfigFileError(
+                f"Value of '{name}.matrix.{key}' should be array or table, got "
+                f"{type(values)}."
+            )
+        unknown = set(values.keys()) - {"start", "stop", "step"}
+        bounds = [values.get(k) for k in ("start", "stop")] + [values.get("step", 1)]
+        if unknown or not all(isinstance(b, int) for b in bounds) or bounds[2] == 0:
+            raise ConfigFileError(
+                f"Range '{name}.matrix.{key}' should be table of integer 'start', "
+                f"'stop' and optional non-zero 'step', got {dict(values)}."
+            )
+        axes.append((str(key), range(*[int(b) for b in bounds])))
+    return axes
+
+
+def _expand_targets(
+    targets: List[Substitution], axes: List[MatrixAxis]
+) -> Iterator[Substitution]:
+    """Yield every target combined with every combination of matrix values."""
+    if not axes:
+        yield from targets
+        return
+    keys = [key for key, _ in axes]
+    for target in targets or [{}]:
+        for combination in itertools.product(*[values for _, values in axes]):
+            substitution = dict(target)
+            substitution.update(zip(keys, combination))
+            yield substitution
 
 
 @overload
@@ -37,46 +240,149 @@ def _substitute_command(template: str, values: Substitution) -> str:
 
 def _substitute_command(template: str, values: List[Substitution]) -> List[str]:
     if isinstance(values, dict):
-        return template.format_map(defaultdict(lambda: "", values))
+        return CommandTemplate(template).render(values)
 
-    return [template.format_map(defaultdict(lambda: "", v)) for v in values]
+    return CommandTemplate(template).render_all(values)
 
 
 class ConfigFileParser:
 
     SpecialTopLevelKeys: List[str] = ["include"]
-    SpecialInTableKeys: List[str] = ["baseimg", "command", "targets"]
+    SpecialInTableKeys: List[str] = [
+        "baseimg",
+        "command",
+        "targets",
+        "depends_on",
+        "ready_log",
+        "matrix",
+    ]
+
+    ChunkSize: int = 1024
+    """Number of targets expanded from matrix and rendered at once."""
+    ReadWorkers: int = 8
+    """Maximum number of sibling include files read concurrently."""
+
+    _cache: Dict[Path, Tuple[FileStamp, Dict[str, Any]]] = {}
+    _cache_lock = threading.Lock()
 
     def __init__(self, config_path: PathLike):
         self.config_path = Path(config_path)
+        self.stamps: Dict[Path, FileStamp] = {}
+        self.dependencies: Dict[str, List[str]] = {}
+        self.ready_logs: Dict[str, str] = {}
+        self.sources: Dict[str, List[Path]] = defaultdict(list)
+        self._gated: Set[str] = set()
+
+    _loads = staticmethod(_toml_loads)
+    """TOML parser backend, taking text and returning plain dicts."""
 
     @property
     def raw_content(self) -> TOMLDocument:
-        return self._read(self.config_path)
+        """Style-preserving document of the config file, for editing."""
+        return tomlkit.parse(self._read_text(self.config_path))
+
+    def _read_text(self, path: PathLike) -> str:
+        path = Path(path)
+        stat = path.stat()
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        self.stamps[path.resolve()] = (stat.st_mtime_ns, stat.st_size, digest)
+        return raw.decode("utf-8")
 
-    def _read(self, path: PathLike) -> TOMLDocument:
-        return TOMLFile(path).read()
+    def _read(self, path: PathLike) -> Dict[str, Any]:
+        """Parsed content of the file, shared by every parser in this process.
 
-    def _validate(self, content: TOMLDocument) -> None:
-        _content = deepcopy(content)
-        for k, v in _content.items():
+        The content is re-read only when modification time or size of the file has
+        changed, and must not be modified.
+
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        with self._cache_lock:
+            stamp, content = self._cache.get(path, (None, None))
+        if (stamp is not None) and stamp[:2] == (stat.st_mtime_ns, stat.st_size):
+            self.stamps[path] = stamp
+            return content
+
+        text = self._read_text(path)
+        try:
+            content = self._loads(text)
+        except ValueError as e:
+            raise ConfigFileError(f"Failed to parse '{path}' : {e}")
+        with self._cache_lock:
+            self._cache[path] = (self.stamps[path], content)
+        return content
+
+    def _read_all(self, paths: List[Path]) -> Dict[Path, Dict[str, Any]]:
+        """Read the files concurrently."""
+        if len(paths) < 2:
+            return {path: self._read(path) for path in paths}
+        with ThreadPoolExecutor(min(self.ReadWorkers, len(paths))) as executor:
+            return dict(zip(paths, executor.map(self._read, paths)))
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    def _validate(self, content: Mapping[str, Any]) -> None:
+        for k, v in content.items():
             if k in self.SpecialTopLevelKeys:
                 continue
             if not isinstance(v, dict):
                 raise ConfigFileError(f"Value of '{k}' should be table, got {type(v)}.")
-            _ = [v.pop(_k, None) for _k in self.SpecialInTableKeys]
-            if len(v) > 0:
-                raise ConfigFileError(f"{v.keys()} is not supported.")
+            unsupported = [_k for _k in v if _k not in self.SpecialInTableKeys]
+            if len(unsupported) > 0:
+                raise ConfigFileError(f"{unsupported} is not supported.")
 
     @classmethod
-    def parse(cls, config_path: PathLike) -> Dict[Hashable, List[LaunchConfiguration]]:
-        parsed = cls(config_path)._parse()
-        return utils.groupby(parsed, "machine")
+    def parse(
+        cls, config_path: PathLike, cache: bool = False
+    ) -> Dict[Hashable, List[LaunchConfiguration]]:
+        """Launch configurations grouped by machine.
+
+        If ``cache`` is True, the result is kept on disk by
+        :class:`~docker_launch.plan_cache.PlanCache`, and loaded without parsing
+        while none of the files is modified.
+
+        """
+        groups, _ = cls._compile(config_path, cache)
+        return groups
+
+    @classmethod
+    def _compile(
+        cls, config_path: PathLike, cache: bool = False
+    ) -> Tuple[Dict[Hashable, List[LaunchConfiguration]], Dict[Path, FileStamp]]:
+        if cache:
+            cached = PlanCache().load(config_path)
+            if cached is not None:
+                return cached
+        parser = cls(config_path)
+        groups = utils.groupby(parser._parse(), "machine")
+        if cache:
+            PlanCache().store(config_path, groups, parser.stamps)
+        return groups, parser.stamps
+
+    @classmethod
+    def iterparse(cls, config_path: PathLike) -> Iterator[LaunchConfiguration]:
+        """Yield launch configurations one by one, as matrices are expanded.
+
+        The files are read and validated on first ``next``; targets declared by
+        ``matrix`` are rendered chunk by chunk, never all at once.
+
+        """
+        return cls(config_path)._iterparse()
 
     def _resolve_path(self, path: PathLike, parent: Path) -> Path:
-        return Path(path) if Path(path).is_absolute() else parent / path
+        """Canonical path, so a file reached via different paths is read once."""
+        path = Path(path) if Path(path).is_absolute() else parent / path
+        return path.resolve()
 
     def _parse(self, path: Path = None) -> List[LaunchConfiguration]:
+        with profiling.span("config.parse"):
+            return list(self._iterparse(path))
+
+    def _iterparse(self, path: Path = None) -> Iterator[LaunchConfiguration]:
         """Parse the config file.
 
         INTENTION OF FUNCTION NESTING
@@ -99,46 +405,313 @@ class ConfigFileParser:
         """
 
         def __parse(
-            path: Path = None, already_parsed: List[Path] = []
-        ) -> List[LaunchConfiguration]:
+            path: Path = None,
+            already_parsed: Set[Path] = set(),
+            config: Dict[str, Any] = None,
+        ) -> List[Tuple[str, Iterable[LaunchConfiguration]]]:
             if path is None:
-                path = self.config_path
+                path = self.config_path.resolve()
 
             if path in already_parsed:
                 return []
-            already_parsed.append(path)
+            already_parsed.add(path)
 
-            config = self._read(path)
+            if config is None:
+                config = self._read(path)
             self._validate(config)
 
             launch_config = []
 
-            additional_config_files = config.pop("include", [])
+            additional_config_files = [
+                self._resolve_path(_path, path.parent)
+                for _path in config.get("include", [])
+            ]
+            # Siblings are read ahead concurrently, then parsed in order.
+            unread = [
+                p
+                for p in dict.fromkeys(additional_config_files)
+                if p not in already_parsed
+            ]
+            contents = self._read_all(unread)
             for _path in additional_config_files:
-                _path = self._resolve_path(_path, path.parent)
-                parsed = __parse(_path, already_parsed)
+                parsed = __parse(_path, already_parsed, contents.get(_path))
                 launch_config.extend(parsed)
 
-            for group in config.values():
+            for name, group in config.items():
+                if name in self.SpecialTopLevelKeys:
+                    continue
                 image = group.get("baseimg", "ubuntu:latest")
                 command_template = group.get("command", "")
                 targets = group.get("targets", [])
-
-                _config = self._generate_config(image, command_template, targets)
-                launch_config.extend(_config)
+                axes = _matrix_axes(group["matrix"], name) if "matrix" in group else []
+
+                depends_on = group.get("depends_on", [])
+                if isinstance(depends_on, str):
+                    depends_on = [depends_on]
+                self.sources[name].append(path)
+                if ("depends_on" in group) or ("ready_log" in group):
+                    self._gated.add(name)
+                self.dependencies[name] = [str(d) for d in depends_on]
+                if "ready_log" in group:
+                    self.ready_logs[name] = str(group["ready_log"])
+
+                _config = self._generate_config(
+                    image, command_template, targets, name, axes
+                )
+                launch_config.append((name, _config))
             return launch_config
 
-        return __parse(path)
+        yield from self._assign_stages(__parse(path))
+
+    def _check_unique(self) -> None:
+        """Raise if table in dependency relation, referred to by name, isn't unique."""
+        depended = {d for deps in self.dependencies.values() for d in deps}
+        for name, paths in self.sources.items():
+            if (len(paths) > 1) and ((name in depended) or (name in self._gated)):
+                raise ConfigFileError(
+                    f"Table '{name}' is defined in {', '.join(map(str, paths))}; "
+                    "tables with 'depends_on' or 'ready_log', or depended on, should "
+                    "have unique names."
+                )
+
+    def _stages(self) -> Dict[str, int]:
+        """Startup stage of each table; one after the latest of its dependencies."""
+        stages: Dict[str, int] = {}
+
+        def _stage(name: str, visiting: Tuple[str, ...]) -> int:
+            if name in stages:
+                return stages[name]
+            if name in visiting:
+                cycle = " -> ".join(visiting[visiting.index(name) :] + (name,))
+                raise ConfigFileError(f"Circular dependency : {cycle}")
+            if name not in self.dependencies:
+                raise ConfigFileError(
+                    f"'{visiting[-1]}' depends on undefined table '{name}'."
+                )
+            deps = self.dependencies[name]
+            stage = max((_stage(d, visiting + (name,)) + 1 for d in deps), default=0)
+            stages[name] = stage
+            return stage
+
+        _ = [_stage(name, ()) for name in self.dependencies]
+        return stages
+
+    def _assign_stages(
+        self, tables: List[Tuple[str, Iterable[LaunchConfiguration]]]
+    ) -> Iterator[LaunchConfiguration]:
+        self._check_unique()
+        stages = self._stages()
+        depended = {d for deps in self.dependencies.values() for d in deps}
+        for name, configs in tables:
+            for config in configs:
+                if stages[name] > 0:
+                    config["stage"] = stages[name]
+                if name in self.ready_logs:
+                    config["ready_log"] = self.ready_logs[name]
+                # Launcher finds the containers to wait for by table name.
+                if name in depended:
+                    config["table"] = name
+                if self.dependencies[name]:
+                    config["depends_on"] = list(self.dependencies[name])
+                yield config
 
     def _generate_config(
-        self, image: str, command_template: str, targets: List[Substitution]
-    ) -> List[LaunchConfiguration]:
-        commands = _substitute_command(command_template, targets)
-        machines = [t.get("__machine__", None) for t in targets]
-        return [
-            {"image": image, "cmd": cmd, "machine": machine}
-            for cmd, machine in zip(commands, machines)
-        ]
+        self,
+        image: str,
+        command_template: str,
+        targets: List[Substitution],
+        name: str = "",
+        axes: Sequence[MatrixAxis] = (),
+    ) -> Iterator[LaunchConfiguration]:
+        template = CommandTemplate(command_template)
+        keys = [key for key, _ in axes]
+        duplicated = {k for t in targets for k in t if k in keys}
+        if duplicated:
+            raise ConfigFileError(
+                f"{sorted(duplicated)} of '{name}' are defined in both targets and "
+                "matrix."
+            )
+        # Templates are checked before expansion, against the keys matrix will add.
+        template.check(
+            [dict(t, **dict.fromkeys(keys)) for t in targets or [{}]]
+            if axes
+            else targets,
+            name,
+        )
+
+        def generate() -> Iterator[LaunchConfiguration]:
+            expanded = _expand_targets(targets, axes)
+            while True:
+                chunk = list(itertools.islice(expanded, self.ChunkSize))
+                if not chunk:
+                    return
+                commands = template.render_all(chunk)
+                for cmd, target in zip(commands, chunk):
+                    machine = target.get("__machine__", None)
+                    yield {"image": image, "cmd": cmd, "machine": machine}
+
+        return generate()
+
+
+class LaunchEntry:
+    """Immutable launch configuration of single container.
+
+    The container is started once all containers of the ``depends_on`` tables are
+    ready, see :func:`docker_launch.launch.wait_ready` for ``ready_log``. ``stage``
+    orders the entries so that dependencies always come first, and ``table`` is set
+    only if other tables depend on this one.
+
+    """
+
+    __slots__ = ("image", "cmd", "machine", "stage", "ready_log", "table", "depends_on")
+
+    def __init__(
+        self,
+        image: str,
+        cmd: str,
+        machine: Hashable,
+        stage: int = 0,
+        ready_log: str = None,
+        table: str = None,
+        depends_on: Sequence[str] = (),
+    ) -> None:
+        object.__setattr__(self, "image", image)
+        object.__setattr__(self, "cmd", cmd)
+        object.__setattr__(self, "machine", machine)
+        object.__setattr__(self, "stage", stage)
+        object.__setattr__(self, "ready_log", ready_log)
+        object.__setattr__(self, "table", table)
+        object.__setattr__(self, "depends_on", tuple(depends_on))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LaunchEntry):
+            return self.as_dict() == other.as_dict()
+        return self.as_dict() == other
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, k) for k in self.__slots__))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.as_dict().items())
+        return f"{self.__class__.__name__}({fields})"
+
+    def as_dict(self) -> LaunchConfiguration:
+        """Configuration as parsed; stage, readiness and dependencies only if set."""
+        config = {"image": self.image, "cmd": self.cmd, "machine": self.machine}
+        if self.stage > 0:
+            config["stage"] = self.stage
+        if self.ready_log is not None:
+            config["ready_log"] = self.ready_log
+        if self.table is not None:
+            config["table"] = self.table
+        if self.depends_on:
+            config["depends_on"] = list(self.depends_on)
+        return config
+
+
+class LaunchPlan(Mapping):
+    """Compiled launch configuration, grouped by machine.
+
+    Use :meth:`load` to get the plan; it's cached per file and re-compiled only when
+    the configuration file or any of the included files is modified.
+
+    Examples
+    --------
+    >>> plan = LaunchPlan.load("path/to/config.toml")
+    >>> plan["localhost"][0].image
+    'ros:humble-ros-core'
+    >>> plan is LaunchPlan.load("path/to/config.toml")
+    True
+
+    """
+
+    __slots__ = ("_groups", "stamps", "_digest")
+
+    _cache: Dict[Path, "LaunchPlan"] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(
+        self,
+        groups: Dict[Hashable, List[LaunchConfiguration]],
+        stamps: Dict[Path, FileStamp] = None,
+    ) -> None:
+        self._groups = {
+            machine: tuple(LaunchEntry(**c) for c in configs)
+            for machine, configs in groups.items()
+        }
+        self.stamps = {} if stamps is None else dict(stamps)
+        self._digest = None
+
+    def __getitem__(self, machine: Hashable) -> Tuple[LaunchEntry, ...]:
+        return self._groups[machine]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._groups)
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._groups!r})"
+
+    @property
+    def entries(self) -> Tuple[LaunchEntry, ...]:
+        return tuple(e for entries in self._groups.values() for e in entries)
+
+    @property
+    def layers(self) -> List[Tuple[LaunchEntry, ...]]:
+        """Entries grouped by startup stage, earliest first."""
+        layers = defaultdict(list)
+        _ = [layers[e.stage].append(e) for e in self.entries]
+        return [tuple(layers[stage]) for stage in sorted(layers)]
+
+    @property
+    def digest(self) -> str:
+        """Hash of the launch configuration, independent of the file layout."""
+        # The plan is immutable, so the hash is computed once.
+        if self._digest is None:
+            h = hashlib.sha256()
+            for e in self.entries:
+                h.update(repr(tuple(e.as_dict().values())).encode("utf-8"))
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def is_fresh(self) -> bool:
+        """Check none of the source files has been modified since compilation."""
+        for path, (mtime, size, digest) in self.stamps.items():
+            try:
+                stat = path.stat()
+                if (stat.st_mtime_ns, stat.st_size) == (mtime, size):
+                    continue
+                if hashlib.sha256(path.read_bytes()).hexdigest() != digest:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    @classmethod
+    def load(cls, config_path: PathLike, cache: bool = False) -> "LaunchPlan":
+        """Compiled plan of the config file; see ``ConfigFileParser.parse`` on cache."""
+        key = Path(config_path).resolve()
+        with cls._cache_lock:
+            plan = cls._cache.get(key)
+        if (plan is not None) and plan.is_fresh():
+            return plan
+
+        plan = cls(*ConfigFileParser._compile(config_path, cache))
+        with cls._cache_lock:
+            cls._cache[key] = plan
+        return plan
 
 
 parse = ConfigFileParser.parse
+load_plan = LaunchPlan.load
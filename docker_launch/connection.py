@@ -1,9 +1,28 @@
 """Connection checker."""
 
+import concurrent.futures
+import time
+from typing import TYPE_CHECKING, Iterable, List, NamedTuple, Optional, Type
+
 import paramiko
 
 from docker_launch import logger
-from . import utils
+from . import profiling, utils
+
+if TYPE_CHECKING:
+    from .transport import SSHSessionPool
+
+
+class ConnectionStatus(NamedTuple):
+    """Result of single SSH connection attempt."""
+
+    address: str
+    error: Optional[Type[Exception]]
+    latency: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
 def _get_ssh_client() -> paramiko.SSHClient:
@@ -17,19 +36,71 @@ def _get_ssh_client() -> paramiko.SSHClient:
     return client
 
 
-def check_connection(
-    address: str, *, username: str = None, port: int = 22, timeout: float = 3
-) -> bool:
-    client = _get_ssh_client()
+def probe_connection(
+    address: str,
+    *,
+    username: str = None,
+    port: int = 22,
+    timeout: float = 3,
+    sessions: "SSHSessionPool" = None,
+) -> ConnectionStatus:
+    """Try SSH connection once, returning the error class and the time it took.
+
+    If ``sessions`` is given, an active connection in it is reused, and new connection
+    is kept in it for later Docker traffic instead of being closed.
+
+    """
+    with profiling.span("ssh.check", address):
+        return _probe_connection(address, username, port, timeout, sessions)
+
 
+def _probe_connection(
+    address: str,
+    username: Optional[str],
+    port: int,
+    timeout: float,
+    sessions: Optional["SSHSessionPool"],
+) -> ConnectionStatus:
     ipaddr, username = utils.parse_address(address, username)
+    start = time.perf_counter()
+    if (sessions is not None) and sessions.find(ipaddr, port, username):
+        return ConnectionStatus(address, None, time.perf_counter() - start)
+
+    client = _get_ssh_client()
     try:
         client.connect(ipaddr, username=username, port=port, timeout=timeout)
+    except Exception as e:
+        return ConnectionStatus(address, e.__class__, time.perf_counter() - start)
+    latency = time.perf_counter() - start
+    if sessions is None:
         client.close()
+    else:
+        sessions.adopt(client, ipaddr, port, username)
+    return ConnectionStatus(address, None, latency)
+
+
+def probe_connections(
+    addresses: Iterable[str], *, max_workers: int = 8, **kwargs
+) -> List[ConnectionStatus]:
+    """Probe multiple hosts concurrently, keeping the order of ``addresses``."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(probe_connection, address, **kwargs)
+            for address in addresses
+        ]
+        return [f.result() for f in futures]
+
+
+def check_connection(
+    address: str, *, username: str = None, port: int = 22, timeout: float = 3
+) -> bool:
+    status = probe_connection(address, username=username, port=port, timeout=timeout)
+    if status.ok:
         return True
-    except Exception as e:
-        logger.error(
-            f"Cannot establish SSH connection with '{username}@{ipaddr}', "
-            f"got {e.__class__}.\nUse ``docker-launch check`` to debug this."
-        )
-        return False
+
+    ipaddr, username = utils.parse_address(address, username)
+    logger.error(
+        f"Cannot establish SSH connection with '{username}@{ipaddr}', "
+        f"got {status.error}.\nUse ``docker-launch check`` to debug this."
+    )
+    return False
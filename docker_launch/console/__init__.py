@@ -12,12 +12,16 @@ definition `[tool.poetry.scripts]` in "pyproject.toml".
 from cleo import Application
 
 from docker_launch import __version__
+from .apply_command import ApplyCommand
+from .attach_command import AttachCommand
 from .check_command import CheckCommand
 from .up_command import UpCommand
 
 
 def main():
     app = Application("docker-launch", __version__)
+    app.add(ApplyCommand())
+    app.add(AttachCommand())
     app.add(CheckCommand())
     app.add(UpCommand())
 
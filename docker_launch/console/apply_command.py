@@ -0,0 +1,158 @@
+"""Apply changes in launch configuration to running launch group.
+
+Unlike ``up``, which starts every container from scratch, this command compares the
+configuration with the containers already running in the launch group, then creates,
+replaces or removes only the containers that differ. The containers keep running after
+this command exits; use ``attach`` to watch them.
+
+"""
+
+import hashlib
+from pathlib import Path
+
+from .up_command import UpCommand
+
+
+class ApplyCommand(UpCommand):
+    # DO NOT EDIT DOCSTRING IF YOU DON'T KNOW "CLEO"
+    # Same options as ``up``, except ``--group`` and the lack of options on watching.
+    """
+    Create, replace or remove docker containers to match the configuration
+
+    apply
+        {config : Path to launch configuration file}
+        {--group=? :
+            ID of the launch group to reconcile, derived from the path of the
+            configuration file by default}
+        {--add-host=* : *Add custom host-to-IP mapping (host:ip)}
+        {--blkio-weight=? :
+            *Block IO (relative weight), between 10 and 1000, or 0 to disable
+            (default 0)}
+        {--blkio-weight-device=* :
+            *Block IO weight (relative device weight), device_path:weight}
+        {--cap-add=* : Add Linux capabilities}
+        {--cap-drop=* : Drop Linux capabilities}
+        {--cgroup-parent=? : *Optional parent cgroup for the container}
+        {--cpu-count=? : *CPU count (Windows only)}
+        {--cpu-percent=? : *CPU percent (Windows only)}
+        {--cpu-period=? : *Limit CPU CFS (Completely Fair Scheduler) period}
+        {--cpu-quota=? : *Limit CPU CFS (Completely Fair Scheduler) quota}
+        {--cpu-rt-period=? : *Limit CPU real-time period in microseconds}
+        {--cpu-rt-runtime=? : *Limit CPU real-time runtime in microseconds}
+        {--c|cpu-shares=? : *CPU shares (relative weight)}
+        {--cpuset-cpus=? : *CPUs in which to allow execution (0-3, 0,1)}
+        {--cpuset-mems=? : *MEMs in which to allow execution (0-3, 0,1)}
+        {--device=* : *Add a host device to the container}
+        {--device-cgroup-rule=* : *Add a rule to the cgroup allowed devices list}
+        {--device-read-bps=* : *Limit read rate (bytes per second) from a device}
+        {--device-read-iops=* : *Limit read rate (IO per second) from a device}
+        {--device-write-bps=* : *Limit write rate (bytes per second) to a device}
+        {--device-write-iops=* : *Limit write rate (IO per second) to a device}
+        {--dns=* : *Set custom DNS servers}
+        {--dns-opt=* : *Set DNS options}
+        {--dns-option=* : *Set DNS options}
+        {--dns-search=* : *Set custom DNS search domains}
+        {--domainname=* : *Container NIS domain name}
+        {--entrypoint=* : *Overwrite the default ENTRYPOINT of the image}
+        {--e|env=* : *Set environment variables}
+        {--group-add=* : *Add additional groups to join}
+        {--health-cmd=? : *Command to run to check health}
+        {--health-interval=? : *Time between running the check (ms|s|m|h) (default 0s)}
+        {--health-retries=? : *Consecutive failures needed to report unhealthy}
+        {--health-start-period=? :
+            *Start period for the container to initialize before starting health-retries
+            countdown (ms|s|m|h) (default 0s)}
+        {--health-timeout=? :
+            *Maximum time to allow one check to run (ms|s|m|h) (default 0s)}
+        {--hostname=? : *Container host name}
+        {--init :
+            *Run an init inside the container that forwards signals and reaps processes}
+        {--ipc=? : *IPC mode to use}
+        {--isolation=? : *Container isolation technology}
+        {--kernel-memory=? : *Kernel memory limit}
+        {--l|label=* : *Set meta data on a container}
+        {--link=* : *Add link to another container}
+        {--mac-address=? : *Container MAC address (e.g., 92:d0:c6:0a:29:33)}
+        {--max-per-host=8 :
+            Maximum number of concurrent API calls to single Docker daemon}
+        {--max-workers=32 :
+            Number of threads making API calls, shared by all Docker daemons}
+        {--m|memory=? : *Memory limit}
+        {--memory-reservation=? : *Memory soft limit}
+        {--memory-swap=? :
+            *Swap limit equal to memory plus swap: '-1' to enable unlimited swap}
+        {--memory-swappiness=? : *Tune container memory swappiness (0 to 100)}
+        {--name=? : *Assign a name to the container}
+        {--no-cache :
+            Parse the configuration file, instead of loading the compiled plan cached
+            in ~/.cache/docker-launch}
+        {--net=? : Conenct a container to a network}
+        {--network=? : Connect a container to a network}
+        {--oom-kill-disable : *Disable OOM killer}
+        {--oom-score-adj=? : *Tune host's OOM preferences (-1000 to 1000)}
+        {--pid=? : *PID namespace to use}
+        {--pids-limit=? : *Tune container pids limit (set -1 for unlimited)}
+        {--platform=? : *Set platform if server is multi-platform capable}
+        {--privileged : *Give extended privileges to this container}
+        {--profile : Report time spent in each launch phase on exit}
+        {--profile-output=? :
+            Write the profile report to this file in JSON, instead of the table}
+        {--p|publish=* : *Publish a container's port(s) to the host}
+        {--P|publish-all : *Publish all exposed ports to random ports}
+        {--read-only : *Mount the container's root filesystem as read only}
+        {--ready-timeout=120 :
+            Seconds to wait for containers to be ready, before starting containers
+            which depend on them}
+        {--restart=? : *Restart policy to apply when a container exits}
+        {--rm : Automatically remove the container when it exits}
+        {--runtime=? : *Runtime to use for this container}
+        {--security-opt=* : *Security options}
+        {--shm-size=? : *Size of /dev/shm}
+        {--stop-signal=? : *Signal to stop a container}
+        {--storage-opt=* : *Storage driver options for the container}
+        {--sysctl=* : *Sysctl options}
+        {--tmpfs=* : *Mount a tmpfs directory}
+        {--t|tty : *Allocate a pseudo-TTY}
+        {--u|user=? : Username or UID (format: <name:uid>[:<group|gid>])}
+        {--userns=? : *User namespace to use}
+        {--uts=? : *UTS namespace to use}
+        {--volume=* : Bind mount a volume}
+        {--volume-driver=? : *Optional volume driver for the container}
+        {--volumes-from=* : *Mount volumes from the specified container(s)}
+        {--w|workdir=? : *Working directory inside the container}
+    """
+
+    def handle(self) -> int:
+        from ..launch import Containers
+
+        try:
+            concurrency = self._concurrency_options()
+        except ValueError as e:
+            self.line_error(f"<error>{e}</>")
+            return 1
+
+        config_file_path = self.argument("config")
+        group_id = self.option("group") or self.default_group_id(config_file_path)
+        options = self._run_options()
+
+        c = Containers(
+            config_file_path,
+            group_id=group_id,
+            cache=not self.option("no-cache"),
+            **concurrency,
+        )
+        try:
+            with self._profile():
+                result = c.apply(float(self.option("ready-timeout")), **options)
+        finally:
+            c.close()
+        self.line(
+            f"Launch group <info>{group_id}</> : {len(result['kept'])} kept, "
+            f"{len(result['created'])} created, {len(result['removed'])} removed"
+        )
+        return 0
+
+    @staticmethod
+    def default_group_id(config_file_path: str) -> str:
+        path = str(Path(config_file_path).resolve())
+        return hashlib.sha256(path.encode("utf-8")).hexdigest()[:12]
@@ -0,0 +1,38 @@
+"""Regain control of running launch group.
+
+Every container started by ``docker-launch up`` is labelled with the ID of its launch
+group. When the process which started the group is gone, this command finds the
+containers by the label and watches them as ``up`` does.
+
+"""
+
+from cleo import Command
+
+
+class AttachCommand(Command):
+    # DO NOT EDIT DOCSTRING IF YOU DON'T KNOW "CLEO"
+    """
+    Attach to docker containers launched by another process
+
+    attach
+        {config : Path to launch configuration file the group was launched with}
+        {group : ID of the launch group}
+        {--events :
+            Track the status by Docker events stream, instead of polling every
+            container}
+    """
+
+    def handle(self) -> int:
+        from ..exceptions import LaunchError
+        from ..launch import attach_containers
+
+        try:
+            attach_containers(
+                self.argument("config"),
+                self.argument("group"),
+                events=self.option("events"),
+            )
+        except LaunchError as e:
+            self.line_error(str(e), "error")
+            return 1
+        return 0
@@ -27,12 +27,14 @@ provides some hints to resolve it.
 
 import logging
 from pathlib import Path
+from typing import List
 
 import paramiko
 from cleo import Command
 
 from .. import ssh, utils
-from ..connection import check_connection
+from ..config_parser import LaunchPlan
+from ..connection import check_connection, probe_connections
 
 
 SSH_DIR = Path.home() / ".ssh"
@@ -44,7 +46,9 @@ class CheckCommand(Command):
     Check and configure SSH connection with remote machines
 
     check
-        {address : Machine to check, in user@host format}
+        {address?* : Machines to check, in user@host format}
+        {--c|config=? : Also check every machine in this launch configuration file}
+        {--j|jobs=8 : Number of machines checked concurrently}
         {--s|setup : Set-up the connection if it cannot be established}
         {--allow-locked : Use default locked SSH key, if exists}
     """
@@ -52,8 +56,52 @@ class CheckCommand(Command):
     def handle(self) -> int:
         logging.root.setLevel(logging.ERROR + 1)
 
-        address = self.argument("address")
+        try:
+            jobs = utils.parse_positive_int(self.option("jobs"), "jobs")
+        except ValueError as e:
+            self.line_error(f"<error>{e}</>")
+            return 1
+
+        addresses = self._collect_addresses()
+        if len(addresses) == 0:
+            self.line_error("<error>No machine to check.</>")
+            return 1
+        if (len(addresses) == 1) and (self.option("config") is None):
+            return self._check(addresses[0])
+        return self._check_many(addresses, jobs)
+
+    def _collect_addresses(self) -> List[str]:
+        addresses = list(self.argument("address"))
+        config_path = self.option("config")
+        if config_path is not None:
+            machines = LaunchPlan.load(config_path).keys()
+            addresses.extend(m for m in machines if utils.is_ip_address(m))
+        return list(dict.fromkeys(addresses))
+
+    def _check_many(self, addresses: List[str], jobs: int) -> int:
+        results = probe_connections(addresses, max_workers=jobs)
+        rows = [
+            [
+                r.address,
+                f"{r.latency * 1e3:.0f} ms",
+                "<info>OK</>" if r.ok else f"<error>{r.error.__name__}</>",
+            ]
+            for r in results
+        ]
+        self.render_table(["Machine", "Latency", "Result"], rows)
+
+        failed = [r.address for r in results if not r.ok]
+        if len(failed) == 0:
+            return 0
+        if not self.option("setup"):
+            self.line_error(
+                f"<error>Cannot connect to {len(failed)} machine(s).</> "
+                "Use <comment>--setup</> flag to set-up."
+            )
+            return 1
+        return max(self._setup(address) for address in failed)
 
+    def _check(self, address: str) -> int:
         if check_connection(address):
             self.info("OK")
             return 0
@@ -63,7 +111,9 @@ class CheckCommand(Command):
                 "<error>Cannot connect.</> Use <comment>--setup</> flag to set-up."
             )
             return 1
+        return self._setup(address)
 
+    def _setup(self, address: str) -> int:
         private_key_path = ssh.get_default_key_path(self.option("allow-locked"))
         if private_key_path is None:
             private_key_path = ssh.generate_default_key()
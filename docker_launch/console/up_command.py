@@ -12,11 +12,12 @@ can be a cause of errors.
 
 """
 
-from typing import Dict, List, Union
+import contextlib
+from typing import Any, Dict, Iterator, List, Union
 
 from cleo import Command
 
-from ..launch import launch_containers
+from .. import profiling, utils
 from ..typing import Literal
 
 
@@ -58,6 +59,9 @@ class UpCommand(Command):
         {--domainname=* : *Container NIS domain name}
         {--entrypoint=* : *Overwrite the default ENTRYPOINT of the image}
         {--e|env=* : *Set environment variables}
+        {--events :
+            Track the status by Docker events stream, instead of polling every
+            container}
         {--group-add=* : *Add additional groups to join}
         {--health-cmd=? : *Command to run to check health}
         {--health-interval=? : *Time between running the check (ms|s|m|h) (default 0s)}
@@ -76,12 +80,23 @@ class UpCommand(Command):
         {--l|label=* : *Set meta data on a container}
         {--link=* : *Add link to another container}
         {--mac-address=? : *Container MAC address (e.g., 92:d0:c6:0a:29:33)}
+        {--max-per-host=8 :
+            Maximum number of concurrent API calls to single Docker daemon}
+        {--max-poll-interval=10 :
+            Seconds the status polling backs off to while no container changes}
+        {--max-workers=32 :
+            Number of threads making API calls, shared by all Docker daemons}
         {--m|memory=? : *Memory limit}
         {--memory-reservation=? : *Memory soft limit}
         {--memory-swap=? :
             *Swap limit equal to memory plus swap: '-1' to enable unlimited swap}
         {--memory-swappiness=? : *Tune container memory swappiness (0 to 100)}
+        {--metrics-port=? :
+            Serve metrics of the containers on this port in Prometheus format}
         {--name=? : *Assign a name to the container}
+        {--no-cache :
+            Parse the configuration file, instead of loading the compiled plan cached
+            in ~/.cache/docker-launch}
         {--net=? : Conenct a container to a network}
         {--network=? : Connect a container to a network}
         {--oom-kill-disable : *Disable OOM killer}
@@ -90,9 +105,15 @@ class UpCommand(Command):
         {--pids-limit=? : *Tune container pids limit (set -1 for unlimited)}
         {--platform=? : *Set platform if server is multi-platform capable}
         {--privileged : *Give extended privileges to this container}
+        {--profile : Report time spent in each launch phase on exit}
+        {--profile-output=? :
+            Write the profile report to this file in JSON, instead of the table}
         {--p|publish=* : *Publish a container's port(s) to the host}
         {--P|publish-all : *Publish all exposed ports to random ports}
         {--read-only : *Mount the container's root filesystem as read only}
+        {--ready-timeout=120 :
+            Seconds to wait for containers to be ready, before starting containers
+            which depend on them}
         {--restart=? : *Restart policy to apply when a container exits}
         {--rm : Automatically remove the container when it exits}
         {--runtime=? : *Runtime to use for this container}
@@ -101,6 +122,9 @@ class UpCommand(Command):
         {--stop-signal=? : *Signal to stop a container}
         {--storage-opt=* : *Storage driver options for the container}
         {--sysctl=* : *Sysctl options}
+        {--teardown=stop :
+            On exit, "stop" the containers, "remove" them forcibly one by one, or
+            stop then "prune" them with single call per host}
         {--tmpfs=* : *Mount a tmpfs directory}
         {--t|tty : *Allocate a pseudo-TTY}
         {--u|user=? : Username or UID (format: <name:uid>[:<group|gid>])}
@@ -113,8 +137,77 @@ class UpCommand(Command):
     """
 
     def handle(self) -> int:
+        from ..launch import launch_containers
+
+        try:
+            concurrency = self._concurrency_options()
+        except ValueError as e:
+            self.line_error(f"<error>{e}</>")
+            return 1
+
         config_file_path = self.argument("config")
+        options = self._run_options()
+        ready_timeout = float(self.option("ready-timeout"))
+        metrics_port = self._parse_int(self.option("metrics-port"))
+        with self._profile():
+            launch_containers(
+                config_file_path,
+                metrics_port=metrics_port,
+                ready_timeout=ready_timeout,
+                teardown=self.option("teardown"),
+                events=self.option("events"),
+                max_poll_interval=float(self.option("max-poll-interval")),
+                cache=not self.option("no-cache"),
+                **concurrency,
+                **options,
+            )
+        return 0
+
+    def _concurrency_options(self) -> Dict[str, int]:
+        return {
+            "max_workers": utils.parse_positive_int(
+                self.option("max-workers"), "max-workers"
+            ),
+            "max_per_host": utils.parse_positive_int(
+                self.option("max-per-host"), "max-per-host"
+            ),
+        }
 
+    @contextlib.contextmanager
+    def _profile(self) -> Iterator[None]:
+        output = self.option("profile-output")
+        if not (self.option("profile") or output):
+            yield
+            return
+
+        profiler = profiling.enable()
+        try:
+            yield
+        finally:
+            profiling.disable(profiler)
+            if output:
+                profiler.dump(output)
+                self.line(f"Profile written to <info>{output}</>")
+            else:
+                self._render_profile(profiler.summary())
+
+    def _render_profile(self, summary: List[Dict[str, Any]]) -> None:
+        rows = [
+            [
+                s["phase"],
+                (s["host"] or "-").split("//")[-1],
+                str(s["count"]),
+                f"{s['p50']:.3f}",
+                f"{s['p95']:.3f}",
+                f"{s['max']:.3f}",
+            ]
+            for s in sorted(summary, key=lambda s: (s["phase"], s["host"] or ""))
+        ]
+        self.render_table(
+            ["Phase", "Host", "Count", "p50 [s]", "p95 [s]", "Max [s]"], rows
+        )
+
+    def _run_options(self) -> Dict[str, Any]:
         options = {
             "blkio_weight": self._parse_int(self.option("blkio-weight")),
             "blkio_weight_device": self._parse_keyword_mapping(
@@ -216,9 +309,7 @@ class UpCommand(Command):
         max_key_len = max([len(k) for k in options.keys()])
         for k, v in options.items():
             self.line(f"    {k:{max_key_len}s} : {v}")
-
-        launch_containers(config_file_path, **options)
-        return 0
+        return options
 
     def _parse_int(self, expr: str) -> int:
         try:
@@ -6,27 +6,528 @@ concurrently in multi-threads.
 """
 
 import concurrent.futures
+import hashlib
+import json
+import queue
+import re
+import threading
 import time
-from typing import Any, Dict, Hashable, List, Tuple
+import uuid
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
 
 import docker
 
-from docker_launch import logger
-from . import utils
-from .config_parser import LaunchConfiguration, parse
+from docker_launch import check_docker_available, logger
+from . import profiling, utils
+from .config_parser import LaunchEntry, LaunchPlan
 from .exceptions import LaunchError
+from .metrics import ContainerState, LaunchMetrics, MetricsServer, host_label
+from .pool import ClientPool
 from .typing import PathLike
 
 
+def list_status(
+    client: docker.DockerClient, ids: List[str], chunk_size: int = 100
+) -> Dict[str, str]:
+    """Status of containers on single daemon, by filtered list instead of reloads.
+
+    IDs are queried in chunks, to keep the request URL short.
+
+    """
+    status = {}
+    for i in range(0, len(ids), chunk_size):
+        listed = client.containers.list(
+            all=True, sparse=True, filters={"id": ids[i : i + chunk_size]}
+        )
+        status.update({c.id: c.status for c in listed})
+    return status
+
+
+def _labels(container: docker.client.ContainerCollection) -> Dict[str, str]:
+    # Full inspection result nests labels in "Config", ``list(sparse=True)`` doesn't.
+    labels = container.attrs.get("Labels")
+    if labels is None:
+        labels = container.attrs.get("Config", {}).get("Labels")
+    return labels or {}
+
+
+def _call(
+    pool: ClientPool,
+    machine: Hashable,
+    container: docker.client.ContainerCollection,
+    method: str,
+    **kwargs,
+) -> Any:
+    """Call method of the container, reconnecting once if the daemon is lost."""
+    try:
+        return getattr(container, method)(**kwargs)
+    except docker.errors.APIError:
+        raise
+    except Exception as e:
+        logger.debug(f"Retrying '{method}' on {container} after {e!r}")
+        client = pool.reconnect(machine)
+        container.client, container.collection = client, client.containers
+        return getattr(container, method)(**kwargs)
+
+
+def _images(plan: LaunchPlan) -> Dict[Tuple[str, str], Hashable]:
+    """Images each daemon needs, mapped to one of the machine names of the daemon."""
+    targets = {}
+    for machine, conf in plan.items():
+        base_url = utils.resolve_base_url(machine)
+        targets.update({(base_url, x.image): machine for x in conf})
+    return targets
+
+
+def _hosts(plan: LaunchPlan) -> List[Hashable]:
+    """Machines in the plan, one per Docker daemon."""
+    machines = {}
+    _ = [machines.setdefault(utils.resolve_base_url(m), m) for m in plan]
+    return list(machines.values())
+
+
+def _ensure_image(client: docker.DockerClient, image: str) -> None:
+    """Pull the image, unless the daemon already has it."""
+    try:
+        client.images.get(image)
+        return
+    except docker.errors.ImageNotFound:
+        pass
+
+    _base_url = client.api.base_url.split("//")[-1]
+    logger.info(f"Pulling image '{image}' on '{_base_url}'")
+    repository, tag = docker.utils.parse_repository_tag(image)
+    progress = client.api.pull(
+        repository, tag=tag or "latest", stream=True, decode=True
+    )
+    for p in progress:
+        if "error" in p:
+            raise LaunchError(f"Failed to pull '{image}' : {p['error']}")
+        if p.get("status") in ("Pull complete", "Already exists"):
+            logger.info(f"{image}@{_base_url} : {p.get('id')} {p['status']}")
+    logger.info(f"Image '{image}' is ready on '{_base_url}'")
+
+
+def _set_status(container: docker.client.ContainerCollection, status: str) -> None:
+    state = container.attrs.get("State")
+    if isinstance(state, dict):
+        state["Status"] = status
+    else:
+        container.attrs["State"] = status
+
+
+def _parse_timestamp(stamp: bytes, default: float = None) -> Optional[float]:
+    """Seconds since epoch of timestamp Docker puts on log lines, in UTC.
+
+    Examples
+    --------
+    >>> _parse_timestamp(b"2023-04-01T12:00:00.500000000Z")
+    1680350400.5
+
+    """
+    try:
+        seconds, _, fraction = stamp.decode("ascii").rstrip("Z").partition(".")
+        parsed = datetime.strptime(seconds, "%Y-%m-%dT%H:%M:%S")
+        return parsed.replace(tzinfo=timezone.utc).timestamp() + float(f"0.{fraction}")
+    except ValueError:
+        return default
+
+
+def _in_thread(fn: Callable, *args) -> concurrent.futures.Future:
+    """Run the function on new daemon thread, which never blocks interpreter exit."""
+    future = concurrent.futures.Future()
+
+    def _run() -> None:
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    threading.Thread(target=_run, daemon=True).start()
+    return future
+
+
+def wait_ready(
+    container: docker.client.ContainerCollection,
+    ready_log: str = None,
+    timeout: float = 120.0,
+    interval: float = 0.5,
+) -> None:
+    """Block until the container can serve containers which depend on it.
+
+    The container is ready when it's running, its healthcheck (if the image defines
+    one) reports healthy, and its log matches ``ready_log`` regular expression (if
+    given).
+
+    Raises
+    ------
+    LaunchError
+        If the container exits, turns unhealthy, or isn't ready within ``timeout``.
+
+    """
+    pattern = None if ready_log is None else re.compile(ready_log, re.MULTILINE)
+    deadline = time.monotonic() + timeout
+    while True:
+        container.reload()
+        state = container.attrs.get("State", {})
+        status = state.get("Status")
+        health = (state.get("Health") or {}).get("Status")
+        if status in ("exited", "dead") or (health == "unhealthy"):
+            raise LaunchError(
+                f"Container {container.short_id} is {health or status} before ready."
+            )
+
+        ready = (status == "running") and (health in (None, "healthy"))
+        if ready and (pattern is not None):
+            logs = container.logs().decode("utf-8", "replace")
+            ready = pattern.search(logs) is not None
+        if ready:
+            return
+
+        if time.monotonic() > deadline:
+            raise LaunchError(
+                f"Container {container.short_id} isn't ready after {timeout} sec."
+            )
+        time.sleep(interval)
+
+
+class Backoff:
+    """Interval which grows geometrically up to ``maximum`` until reset.
+
+    Examples
+    --------
+    >>> backoff = Backoff(1, 5)
+    >>> [backoff.next() for _ in range(5)]
+    [1, 2, 4, 5, 5]
+    >>> backoff.reset()
+    >>> backoff.next()
+    1
+
+    """
+
+    def __init__(
+        self, minimum: float = 1.0, maximum: float = 10.0, factor: float = 2.0
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.factor = factor
+        self.current = minimum
+
+    def next(self) -> float:
+        current = self.current
+        self.current = min(self.current * self.factor, self.maximum)
+        return current
+
+    def reset(self) -> None:
+        self.current = self.minimum
+
+
+class HostScheduler:
+    """Thread pool which caps concurrent tasks per host and in total.
+
+    Tasks are queued per host and dispatched round-robin across hosts, so a host with
+    many containers cannot starve the others, nor receive more than ``max_per_host``
+    simultaneous requests (which may trip sshd's ``MaxStartups`` limit).
+
+    Parameters
+    ----------
+    max_workers
+        Global cap on concurrently running tasks.
+    max_per_host
+        Cap on concurrently running tasks for single host.
+
+    Examples
+    --------
+    >>> with HostScheduler(max_workers=16, max_per_host=4) as scheduler:
+    ...     future = scheduler.submit("ssh://user@172.29.1.2", print, "hello")
+
+    """
+
+    def __init__(self, max_workers: int = 32, max_per_host: int = 8) -> None:
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self._queues: Dict[Hashable, Deque[Tuple[concurrent.futures.Future, Callable]]]
+        self._queues = {}
+        self._order: Deque[Hashable] = deque()
+        self._running: Dict[Hashable, int] = defaultdict(int)
+        self._completed: Dict[Hashable, int] = defaultdict(int)
+        self._max_queued: Dict[Hashable, int] = defaultdict(int)
+        self._condition = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._shutdown = False
+
+    def __enter__(self) -> "HostScheduler":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown(wait=True)
+
+    def submit(
+        self, host: Hashable, fn: Callable, *args, **kwargs
+    ) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Cannot schedule new tasks after shutdown.")
+            if host not in self._queues:
+                self._queues[host] = deque()
+                self._order.append(host)
+            self._queues[host].append((future, lambda: fn(*args, **kwargs)))
+            self._max_queued[host] = max(
+                self._max_queued[host], len(self._queues[host])
+            )
+            demand = sum(map(len, self._queues.values())) + sum(self._running.values())
+            if len(self._workers) < min(self.max_workers, demand):
+                worker = threading.Thread(target=self._work, daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._condition.notify()
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+        if wait:
+            _ = [w.join() for w in self._workers]
+
+    def metrics(self) -> Dict[Hashable, Dict[str, int]]:
+        """Queue depth, running, completed and peak queue depth of each host."""
+        with self._condition:
+            return {
+                host: {
+                    "queued": len(self._queues[host]),
+                    "running": self._running[host],
+                    "completed": self._completed[host],
+                    "max_queued": self._max_queued[host],
+                }
+                for host in self._queues
+            }
+
+    def _next(self) -> Optional[Tuple[Hashable, concurrent.futures.Future, Callable]]:
+        for _ in range(len(self._order)):
+            host = self._order[0]
+            self._order.rotate(-1)
+            if self._queues[host] and (self._running[host] < self.max_per_host):
+                future, task = self._queues[host].popleft()
+                return host, future, task
+        return None
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                item = self._next()
+                while item is None:
+                    if self._shutdown and not any(self._queues.values()):
+                        return
+                    self._condition.wait()
+                    item = self._next()
+                host, future, task = item
+                self._running[host] += 1
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(task())
+                except BaseException as e:
+                    future.set_exception(e)
+
+            with self._condition:
+                self._running[host] -= 1
+                self._completed[host] += 1
+                self._condition.notify_all()
+
+
+class LogFollower:
+    """Merge continuous log streams of containers into single prefixed output.
+
+    One ``logs(stream=True, follow=True)`` generator is kept per container, opened by
+    ``open_stream(container, since)``. Lines are passed through a bounded queue, so slow
+    output blocks the readers instead of buffering indefinitely.
+
+    Docker ends the stream when the container stops, so it's reopened from the last
+    line read once the container runs again, e.g. restarted by restart policy. Failure
+    to open is logged and retried, without affecting the other containers.
+
+    """
+
+    MaxReopenInterval: float = 30.0
+    """Maximum seconds between attempts to reopen log stream."""
+    OpenTimeout: float = 30.0
+    """Seconds ``start`` waits for the streams to be opened."""
+
+    def __init__(
+        self,
+        containers: List[docker.client.ContainerCollection],
+        maxsize: int = 1000,
+        metrics: LaunchMetrics = None,
+        open_stream: Callable[
+            [docker.client.ContainerCollection, Optional[float]], Any
+        ] = None,
+        since: float = None,
+    ) -> None:
+        self.containers = containers
+        self.metrics = metrics
+        self.since = since
+        self._open = open_stream or self._open_stream
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._streams = []
+        self._writer = None
+        self._stopped = threading.Event()
+
+    @staticmethod
+    def _open_stream(
+        container: docker.client.ContainerCollection, since: Optional[float]
+    ) -> Any:
+        return container.logs(stream=True, follow=True, timestamps=True, since=since)
+
+    def start(self) -> None:
+        if self._writer is not None:
+            return
+        self._stopped.clear()
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._writer.start()
+        opened = [concurrent.futures.Future() for _ in self.containers]
+        for container, future in zip(self.containers, opened):
+            threading.Thread(
+                target=self._follow, args=(container, future), daemon=True
+            ).start()
+        _ = concurrent.futures.wait(opened, timeout=self.OpenTimeout)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        for stream in list(self._streams):
+            try:
+                stream.close()
+            except Exception:
+                pass
+        self._streams.clear()
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join(timeout=1)
+            self._writer = None
+
+    def _follow(
+        self,
+        container: docker.client.ContainerCollection,
+        opened: concurrent.futures.Future,
+    ) -> None:
+        since, last = self.since, b""
+        backoff = Backoff(1.0, self.MaxReopenInterval)
+        while not self._stopped.is_set():
+            try:
+                stream = self._open(container, since)
+            except Exception as e:
+                logger.warning(f"Failed to follow logs of {container.short_id} : {e}")
+                self._stopped.wait(backoff.next())
+                continue
+            finally:
+                if not opened.done():
+                    opened.set_result(None)
+            if self._stopped.is_set():
+                stream.close()
+                return
+
+            self._streams.append(stream)
+            try:
+                stamp = self._read(container, stream, last)
+            finally:
+                if stream in self._streams:
+                    self._streams.remove(stream)
+            if stamp != last:
+                since, last = _parse_timestamp(stamp, since), stamp
+                backoff.reset()
+
+            # Stream ends when the container stops; reopen once it runs again.
+            while not self._stopped.wait(backoff.next()):
+                if container.status in ("running", "restarting"):
+                    break
+
+    def _read(
+        self, container: docker.client.ContainerCollection, stream, last: bytes
+    ) -> bytes:
+        """Pass lines after timestamp ``last`` to the output; the last one's returned.
+
+        The reopened stream starts at the last line read, which is skipped then.
+
+        """
+        prefix = f"{container.short_id}@{container.client.api.base_url}"
+
+        def _put(line: bytes) -> None:
+            nonlocal last
+            stamp = line.split(b" ", 1)[0]
+            if stamp and stamp <= last:
+                return
+            last = stamp
+            if self.metrics is not None:
+                self.metrics.observe_log(container.id, line)
+            self._queue.put(f"{prefix} : {line.decode('utf-8', 'replace')}")
+
+        buffer = b""
+        try:
+            for chunk in stream:
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                _ = [_put(line) for line in lines]
+        except Exception as e:
+            logger.debug(f"Log stream of {container.short_id} closed : {e}")
+        if buffer:
+            _put(buffer)
+        return last
+
+    def _write(self) -> None:
+        while True:
+            line = self._queue.get()
+            if line is None:
+                return
+            logger.info(line)
+
+
 class Containers:
-    def __init__(self, config_path: PathLike) -> None:
+    def __init__(
+        self,
+        config_path: PathLike,
+        pool: ClientPool = None,
+        group_id: str = None,
+        *,
+        max_workers: int = 32,
+        max_per_host: int = 8,
+        cache: bool = False,
+    ) -> None:
         self.config_path = config_path
+        self.cache = cache
+        self.pool = ClientPool() if pool is None else pool
+        self.scheduler = HostScheduler(max_workers, max_per_host)
+        self.group_id = uuid.uuid4().hex[:12] if group_id is None else group_id
         self.containers_list = []
+        self._machines: Dict[str, Hashable] = {}
         self.last_ping = int(time.time())
+        self._status: Dict[str, str] = {}
+        self._event_streams = []
+        self._listening: Optional[threading.Event] = None
+        self._log_follower = None
+        self._log_slicer: Optional[threading.Event] = None
+        self.metrics = LaunchMetrics()
+        self._metrics_server = None
+
+    StatusEvents: List[str] = ["die", "oom", "health_status", "restart", "start"]
+    """Docker events which may change container status; ``start`` follows ``die`` when
+    restart policy brings the container back."""
+    MaxReconnectInterval: float = 30.0
+    """Maximum seconds between attempts to reopen broken event stream."""
+
+    GroupLabel: str = "docker-launch.group"
+    ConfigHashLabel: str = "docker-launch.config-hash"
+    MachineLabel: str = "docker-launch.machine"
+    FingerprintLabel: str = "docker-launch.fingerprint"
+    EntryHashLabel: str = "docker-launch.entry-hash"
+    HostsLabel: str = "docker-launch.hosts"
 
     @property
-    def config(self) -> Dict[Hashable, List[LaunchConfiguration]]:
-        return parse(self.config_path)
+    def config(self) -> LaunchPlan:
+        return LaunchPlan.load(self.config_path, cache=self.cache)
 
     @staticmethod
     def _flatten(dict_of_lists: Dict[Any, List]) -> List:
@@ -34,119 +535,1049 @@ class Containers:
         _ = [ret.extend(elem) for elem in dict_of_lists.values()]
         return ret
 
+    def _hosts(self, plan: LaunchPlan = None) -> List[Hashable]:
+        """Machines in the configuration, one per Docker daemon."""
+        return _hosts(self.config if plan is None else plan)
+
+    @classmethod
+    def _group_labels(cls, group_id: str, plan: LaunchPlan) -> Dict[str, str]:
+        """Labels identifying the launch group, shared by all of its containers.
+
+        Hosts of the plan are recorded, so that containers left on hosts removed from
+        the configuration can be found later; see :meth:`apply`.
+
+        """
+        return {
+            cls.GroupLabel: group_id,
+            cls.ConfigHashLabel: plan.digest,
+            cls.HostsLabel: json.dumps(_hosts(plan), default=str),
+        }
+
+    def prepare(self) -> None:
+        """Pull images missing on each daemon, once per (daemon, image) pair.
+
+        Without this, containers sharing an image on the same host race into the
+        implicit pull of ``containers.run``.
+
+        """
+
+        def _prepare(machine: Hashable, image: str) -> None:
+            with profiling.span("image.prepare", utils.resolve_base_url(machine)):
+                _ensure_image(self.pool.get(machine), image)
+
+        futures = [
+            self.scheduler.submit(host, _prepare, machine, image)
+            for (host, image), machine in _images(self.config).items()
+        ]
+        _ = [f.result() for f in futures]
+
+    @staticmethod
+    def fingerprint(entry: LaunchEntry, docker_run_kwargs: Dict[str, Any]) -> str:
+        """Stable identity of a container specification, used to detect changes."""
+        spec = [entry.image, entry.cmd, entry.machine, docker_run_kwargs]
+        spec = json.dumps(spec, sort_keys=True, default=str)
+        return hashlib.sha256(spec.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def entry_hash(cls, entry: LaunchEntry) -> str:
+        """Identity of the entry alone, to find out which are still configured."""
+        return cls.fingerprint(entry, {})
+
+    @classmethod
+    def _create(
+        cls,
+        client: docker.DockerClient,
+        machine: Hashable,
+        entry: LaunchEntry,
+        group_labels: Dict[str, str],
+        metrics: LaunchMetrics,
+        **kwargs,
+    ) -> docker.client.ContainerCollection:
+        """Run container of the entry, labelled as a member of the launch group.
+
+        Shared with :class:`~docker_launch.async_launch.AsyncContainers`, so that
+        containers of either engine can be attached, applied to and pruned.
+
+        """
+        labels = kwargs.get("labels")
+        if isinstance(labels, (list, tuple)):
+            labels = {k: "" for k in labels}
+        kwargs["labels"] = {
+            **(labels or {}),
+            **group_labels,
+            cls.MachineLabel: "" if machine is None else str(machine),
+            cls.EntryHashLabel: cls.entry_hash(entry),
+            cls.FingerprintLabel: cls.fingerprint(entry, kwargs),
+        }
+        with profiling.span("container.create", utils.resolve_base_url(machine)):
+            container = client.containers.run(
+                entry.image, entry.cmd, detach=True, **kwargs
+            )
+        metrics.started(container.id)
+        metrics.observe_attrs(container.id, container.attrs)
+        _base_url = client.api.base_url.split("//")[-1]
+        logger.info(
+            f"Container '{container.name}' ({container.short_id}) started "
+            f"on '{_base_url}'"
+        )
+        return container
+
+    def _run(
+        self,
+        machine: Hashable,
+        entry: LaunchEntry,
+        group_labels: Dict[str, str],
+        **kwargs,
+    ) -> docker.client.ContainerCollection:
+        client = self.pool.get(machine)
+        container = self._create(
+            client, machine, entry, group_labels, self.metrics, **kwargs
+        )
+        self._machines[container.id] = machine
+        return container
+
+    RunTimeout: float = 60.0
+    """Seconds to wait for any container to be created."""
+
+    def _start_stages(
+        self,
+        targets: List[Tuple[Hashable, LaunchEntry]],
+        group_labels: Dict[str, str],
+        ready_timeout: float = 120.0,
+        **docker_run_kwargs,
+    ) -> List[docker.client.ContainerCollection]:
+        """Start containers in parallel, each once the tables it depends on are ready.
+
+        Only containers of tables which others depend on are waited to be ready, see
+        :func:`wait_ready`; the rest may exit right away without failing the launch.
+        Tables with no container in ``targets`` are considered ready.
+        ``group_labels`` are put on every container, see :meth:`_group_labels`.
+
+        """
+
+        def _wait_ready(
+            container: docker.client.ContainerCollection, entry: LaunchEntry
+        ) -> None:
+            host = utils.resolve_base_url(self._machines.get(container.id))
+            with profiling.span("container.ready", host):
+                wait_ready(container, entry.ready_log, ready_timeout)
+
+        # Number of containers yet to be ready, per table others depend on.
+        waiting = Counter(e.table for _, e in targets if e.table is not None)
+        queued = sorted(targets, key=lambda x: x[1].stage)
+        runs: Dict[concurrent.futures.Future, LaunchEntry] = {}
+        readiness: Dict[concurrent.futures.Future, str] = {}
+        created = []
+
+        def _submit_unblocked() -> None:
+            nonlocal queued
+            blocked = []
+            for machine, entry in queued:
+                if any(waiting[d] > 0 for d in entry.depends_on):
+                    blocked.append((machine, entry))
+                    continue
+                future = self._submit(
+                    machine,
+                    self._run,
+                    machine,
+                    entry,
+                    group_labels,
+                    **docker_run_kwargs,
+                )
+                runs[future] = entry
+            queued = blocked
+
+        def _track(container: docker.client.ContainerCollection) -> None:
+            # Track immediately, so that later failure can clean it up.
+            self.containers_list.append(container)
+            created.append(container)
+
+        _submit_unblocked()
+        try:
+            while runs or readiness:
+                timeout = self.RunTimeout + (ready_timeout if readiness else 0.0)
+                done, _ = concurrent.futures.wait(
+                    [*runs, *readiness], timeout=timeout, return_when="FIRST_COMPLETED"
+                )
+                if not done:
+                    raise LaunchError(f"No container has started in {timeout} sec.")
+                for future in done:
+                    if future in runs:
+                        entry = runs.pop(future)
+                        container = future.result()
+                        _track(container)
+                        if entry.table is not None:
+                            waiter = self._submit_for(
+                                container, _wait_ready, container, entry
+                            )
+                            readiness[waiter] = entry.table
+                        continue
+
+                    table = readiness.pop(future)
+                    future.result()
+                    waiting[table] -= 1
+                    if waiting[table] == 0:
+                        logger.info(f"Containers of '{table}' are ready.")
+                        _submit_unblocked()
+        except BaseException:
+            # Containers still being created are tracked as well, queued ones aren't
+            # created at all.
+            _ = [f.cancel() for f in [*runs, *readiness]]
+            done, _ = concurrent.futures.wait(runs, timeout=self.RunTimeout)
+            for future in done:
+                if not future.cancelled() and (future.exception() is None):
+                    _track(future.result())
+            raise
+        return created
+
     def start(
-        self, **docker_run_kwargs
-    ) -> Dict[str, List[docker.client.ContainerCollection]]:
+        self, ready_timeout: float = 120.0, **docker_run_kwargs
+    ) -> List[docker.client.ContainerCollection]:
+        """Start all containers in the configuration.
+
+        Tables with ``depends_on`` are started after the tables they depend on are
+        ready, up to ``ready_timeout`` seconds per container.
+
+        """
         if len(self.containers_list) > 0:
             raise LaunchError("This process is already running a launch group.")
+        self.prepare()
 
-        def _start(
-            client: docker.DockerClient, image: str, command: str, **kwargs
-        ) -> docker.client.ContainerCollection:
-            container = client.containers.run(image, command, detach=True, **kwargs)
-            _base_url = client.api.base_url.split("//")[-1]
-            logger.info(
-                f"Container '{container.name}' ({container.short_id}) started "
-                f"on '{_base_url}'"
+        plan = self.config
+        targets = [(m, x) for m, conf in plan.items() for x in conf]
+        with profiling.span("start"):
+            _ = self._start_stages(
+                targets,
+                self._group_labels(self.group_id, plan),
+                ready_timeout,
+                **docker_run_kwargs,
             )
-            return container
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=None) as executor:
-            futures = []
-
-            for machine, conf in self.config.items():
-                daemon_url = utils.resolve_base_url(machine)
-                client = docker.DockerClient(base_url=daemon_url)
-                img_and_cmd = list(map(lambda x: (x["image"], x["cmd"]), conf))
-                _futures = [
-                    executor.submit(_start, client, img, cmd, **docker_run_kwargs)
-                    for img, cmd in img_and_cmd
-                ]
-                futures.extend(_futures)
-
-            _futures = concurrent.futures.as_completed(futures, timeout=60)
-            _futures = map(lambda x: x.result(), _futures)
-            self.containers_list.extend(_futures)
+        logger.debug(f"Queue depth per host : {self.scheduler.metrics()}")
+        logger.info(
+            f"Launch group '{self.group_id}' started. If this process is killed, run "
+            f"``docker-launch attach {self.config_path} {self.group_id}`` to regain "
+            "control."
+        )
         return self.containers_list
 
-    def stop(self) -> None:
+    def _discover(
+        self, previous: bool = False
+    ) -> List[Tuple[Hashable, docker.client.ContainerCollection]]:
+        """Containers of this launch group, with one filtered list per daemon.
+
+        If ``previous`` is True, hosts which the found containers were launched on
+        with earlier configuration are searched too; they're recorded in labels.
+        Failure on such hosts is only logged, they may have been retired.
+
+        """
+
+        def _find(machine: Hashable) -> List[docker.client.ContainerCollection]:
+            client = self.pool.get(machine)
+            return client.containers.list(
+                all=True,
+                sparse=True,
+                filters={"label": f"{self.GroupLabel}={self.group_id}"},
+            )
+
+        hosts = self._hosts()
+        searched = {utils.resolve_base_url(m) for m in hosts}
+        found, configured = [], True
+        while hosts:
+            futures = [self._submit(machine, _find, machine) for machine in hosts]
+            batch = []
+            for machine, future in zip(hosts, futures):
+                try:
+                    listed = future.result()
+                except Exception as e:
+                    if configured:
+                        raise
+                    logger.warning(f"Failed to search containers on '{machine}' : {e}")
+                    continue
+                batch.extend(
+                    (_labels(container).get(self.MachineLabel) or machine, container)
+                    for container in listed
+                )
+            found.extend(batch)
+            if not previous:
+                break
+
+            hosts, configured = [], False
+            for _, container in batch:
+                try:
+                    recorded = json.loads(_labels(container).get(self.HostsLabel, "[]"))
+                except ValueError:
+                    continue
+                for machine in recorded:
+                    if utils.resolve_base_url(machine) not in searched:
+                        searched.add(utils.resolve_base_url(machine))
+                        hosts.append(machine)
+        return found
+
+    def apply(
+        self, ready_timeout: float = 120.0, **docker_run_kwargs
+    ) -> Dict[str, List[docker.client.ContainerCollection]]:
+        """Reconcile running containers of this launch group with the configuration.
+
+        Containers whose fingerprint (image, command, machine and run options) matches
+        a target are kept, others are removed, and only missing targets are created.
+        Containers on hosts no longer in the configuration are removed as well.
+
+        Returns
+        -------
+        Containers grouped by the action taken; "kept", "created" and "removed".
+
+        """
+        existing = defaultdict(list)
+        stale = []
+        for machine, container in self._discover(previous=True):
+            self._machines[container.id] = machine
+            if container.status == "running":
+                fp = _labels(container).get(self.FingerprintLabel)
+                existing[fp].append(container)
+            else:
+                stale.append(container)
+
+        plan = self.config
+        kept, to_create = [], []
+        for machine, conf in plan.items():
+            for entry in conf:
+                fp = self.fingerprint(entry, docker_run_kwargs)
+                if existing[fp]:
+                    kept.append(existing[fp].pop())
+                else:
+                    to_create.append((machine, entry))
+        to_remove = stale + [c for cs in existing.values() for c in cs]
+
+        def _remove(container: docker.client.ContainerCollection) -> None:
+            self._call(container, "remove", force=True)
+            logger.info(f"Container {container.short_id} removed.")
+
+        if to_create:
+            self.prepare()
+        removed = [self._submit_for(c, _remove, c) for c in to_remove]
+        created = self._start_stages(
+            to_create,
+            self._group_labels(self.group_id, plan),
+            ready_timeout,
+            **docker_run_kwargs,
+        )
+        _ = [f.result() for f in removed]
+
+        self.containers_list = kept + created
+        logger.info(
+            f"Launch group '{self.group_id}' applied; {len(kept)} kept, "
+            f"{len(created)} created, {len(to_remove)} removed."
+        )
+        return {"kept": kept, "created": created, "removed": to_remove}
+
+    @classmethod
+    def attach(
+        cls, config_path: PathLike, group_id: str, pool: ClientPool = None
+    ) -> "Containers":
+        """Rediscover containers of running launch group.
+
+        Containers are searched by label, with single filtered list per Docker daemon
+        found in the configuration. Those which don't match any entry of the
+        configuration are warned about.
+
+        """
+        c = cls(config_path, pool=pool, group_id=group_id)
+        found = c._discover()
+
+        plan = c.config
+        entries = {c.entry_hash(e) for e in plan.entries}
+        for machine, container in found:
+            labels = _labels(container)
+            c._machines[container.id] = machine
+            if isinstance(container.attrs.get("Created"), int):
+                c.metrics.started(container.id, container.attrs["Created"])
+            c.containers_list.append(container)
+            # Containers kept by ``apply`` still have the hash of earlier config.
+            if c.EntryHashLabel in labels:
+                drifted = labels[c.EntryHashLabel] not in entries
+            else:
+                drifted = labels.get(c.ConfigHashLabel) != plan.digest
+            if drifted:
+                logger.warning(
+                    f"Container {container.short_id} was launched with different "
+                    "configuration."
+                )
+        if not c.containers_list:
+            raise LaunchError(f"No container of launch group '{group_id}' found.")
+        logger.info(
+            f"Attached to {len(c.containers_list)} containers of launch group "
+            f"'{group_id}'."
+        )
+        return c
+
+    @classmethod
+    def reattach(
+        cls, config_path: PathLike, group_id: str, events: bool = False
+    ) -> None:
+        """Attach to running launch group, then watch it like ``launch``.
+
+        Status is tracked by Docker events if ``events`` is True, see :meth:`watch`.
+
+        """
+        c = cls.attach(config_path, group_id)
+        try:
+            c.watch(events=events)
+        finally:
+            c.stop()
+            c.close()
+
+    def _submit(
+        self, machine: Hashable, fn: Callable, *args, **kwargs
+    ) -> concurrent.futures.Future:
+        host = utils.resolve_base_url(machine)
+        return self.scheduler.submit(host, fn, *args, **kwargs)
+
+    def _submit_for(
+        self, container: docker.client.ContainerCollection, fn: Callable, *args
+    ) -> concurrent.futures.Future:
+        return self._submit(self._machines.get(container.id), fn, *args)
+
+    def serve_metrics(self, port: int, address: str = "") -> MetricsServer:
+        """Serve metrics of this launch group over HTTP, until ``close`` is called."""
+        if self._metrics_server is None:
+            server = MetricsServer(self.render_metrics, port, address)
+            profiling.enable(self.metrics)
+            self._metrics_server = server.start()
+        return self._metrics_server
+
+    def render_metrics(self) -> str:
+        states = [
+            ContainerState(
+                c.id,
+                getattr(c, "name", c.short_id),
+                host_label(self._host_of(c)),
+                self._status.get(c.id, c.status),
+            )
+            for c in list(self.containers_list)
+        ]
+        return self.metrics.render(states)
+
+    def close(self) -> None:
+        """Release threads and connections held by this object."""
+        if self._metrics_server is not None:
+            profiling.disable(self.metrics)
+            self._metrics_server.stop()
+            self._metrics_server = None
+        self.scheduler.shutdown(wait=False)
+        self.pool.close()
+
+    def _call(
+        self, container: docker.client.ContainerCollection, method: str, **kwargs
+    ) -> Any:
+        machine = self._machines.get(container.id)
+        return _call(self.pool, machine, container, method, **kwargs)
+
+    StopSlack: float = 5.0
+    """Seconds to wait for ``stop`` beyond the grace period, before sending kill."""
+
+    def stop(
+        self, grace_period: float = 3.0, deadline: float = 30.0
+    ) -> Dict[str, List[docker.client.ContainerCollection]]:
+        """Stop all containers concurrently, giving up after ``deadline`` seconds.
+
+        Every container is sent SIGTERM, and SIGKILL by the daemon after
+        ``grace_period``. Stop requests are throttled per host like any other call,
+        so the window of each container starts when its own request is sent; the
+        ones whose request doesn't complete within it are killed explicitly. Requests
+        still queued shortly before the deadline are cancelled, and their containers
+        killed too.
+
+        Returns
+        -------
+        Containers grouped by the outcome; "stopped", "killed" and "unreachable".
+
+        """
+        start = time.monotonic()
+        # Leave time for the kills, as the last resort.
+        cutoff = start + deadline - min(self.StopSlack, deadline / 2)
+        window = grace_period + self.StopSlack
+        report = {"stopped": [], "killed": [], "unreachable": []}
+        sent: Dict[str, float] = {}
+
         def _stop(container: docker.client.ContainerCollection) -> None:
+            sent[container.id] = time.monotonic()
+            with profiling.span("container.stop", self._host_of(container)):
+                try:
+                    self._call(container, "stop", timeout=grace_period)
+                except docker.errors.NotFound:
+                    pass
+
+        def _kill(container: docker.client.ContainerCollection) -> str:
             try:
-                container.stop(timeout=3)  # Escalate to SIGKILL after 3 sec.
-                logger.info(f"Container {container} has stopped.")
+                with profiling.span("container.kill", self._host_of(container)):
+                    self._call(container, "kill")
+                return "killed"
+            except docker.errors.APIError as e:
+                # 404 and 409 mean the container is gone or already stopped.
+                return "killed" if e.status_code in (404, 409) else "unreachable"
             except Exception as e:
-                logger.warning(str(e))
+                logger.warning(f"Failed to kill {container.short_id} : {e!r}")
+                return "unreachable"
+
+        def _expiry(future: concurrent.futures.Future) -> float:
+            sent_at = sent.get(futures[future].id)
+            return cutoff if sent_at is None else min(sent_at + window, cutoff)
 
         logger.info("Gracefully stopping containers, may take time.")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=None) as executor:
-            futures = [executor.submit(_stop, c) for c in self.containers_list]
-            _ = concurrent.futures.as_completed(futures, timeout=30)
+        with profiling.span("stop"):
+            futures = {self._submit_for(c, _stop, c): c for c in self.containers_list}
+            pending = set(futures)
+            kills = {}
+            while pending:
+                now = time.monotonic()
+                expired = {f for f in pending if _expiry(f) <= now}
+                for future in expired:
+                    container = futures[future]
+                    if future.cancel():
+                        logger.warning(f"Stop of {container} wasn't sent in time.")
+                    # Workers of the scheduler may all be blocked by the stop
+                    # requests, so each kill runs on its own thread.
+                    kills[_in_thread(_kill, container)] = container
+                pending -= expired
+                if not pending:
+                    break
+
+                timeout = min(_expiry(f) for f in pending) - now
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=timeout, return_when="FIRST_COMPLETED"
+                )
+                for future in done:
+                    container = futures[future]
+                    if future.exception() is None:
+                        report["stopped"].append(container)
+                        logger.info(f"Container {container} has stopped.")
+                    else:
+                        report["unreachable"].append(container)
+                        logger.warning(
+                            f"Failed to stop {container} : {future.exception()}"
+                        )
+
+            if kills:
+                logger.warning(
+                    f"{len(kills)} container(s) didn't stop in time, killing."
+                )
+                remaining = max(deadline - (time.monotonic() - start), 0.0)
+                _ = concurrent.futures.wait(kills, timeout=remaining)
+                for future, container in kills.items():
+                    outcome = future.result() if future.done() else "unreachable"
+                    report[outcome].append(container)
+
+        logger.info(", ".join(f"{len(v)} {k}" for k, v in report.items()))
+        return report
+
+    def teardown(
+        self, deadline: float = 30.0
+    ) -> Dict[str, List[docker.client.ContainerCollection]]:
+        """Stop and remove all containers, with single API call per container.
+
+        ``remove(force=True)`` kills the container and removes it at once, which saves
+        the round trip of separate ``stop`` and ``remove``, at the cost of no grace
+        period.
+
+        Returns
+        -------
+        Containers grouped by the outcome; "removed" and "unreachable".
+
+        """
+
+        def _remove(container: docker.client.ContainerCollection) -> None:
+            with profiling.span("container.remove", self._host_of(container)):
+                try:
+                    self._call(container, "remove", force=True)
+                except docker.errors.NotFound:
+                    pass
+
+        report = {"removed": [], "unreachable": []}
+        with profiling.span("teardown"):
+            futures = {self._submit_for(c, _remove, c): c for c in self.containers_list}
+            done, _ = concurrent.futures.wait(futures, timeout=deadline)
+        for future, container in futures.items():
+            if (future in done) and (future.exception() is None):
+                report["removed"].append(container)
+            else:
+                error = future.exception() if future in done else "timed out"
+                logger.warning(f"Failed to remove {container} : {error}")
+                report["unreachable"].append(container)
+        logger.info(", ".join(f"{len(v)} {k}" for k, v in report.items()))
+        return report
+
+    def prune(self) -> List[str]:
+        """Remove stopped containers of this launch group, one API call per daemon.
+
+        Returns
+        -------
+        IDs of the removed containers.
+
+        """
+
+        def _prune(machine: Hashable) -> List[str]:
+            with profiling.span("container.prune", utils.resolve_base_url(machine)):
+                result = self.pool.get(machine).containers.prune(
+                    filters={"label": f"{self.GroupLabel}={self.group_id}"}
+                )
+            return result.get("ContainersDeleted") or []
+
+        futures = [self._submit(machine, _prune, machine) for machine in self._hosts()]
+        deleted = [i for f in futures for i in f.result()]
+        logger.info(f"Pruned {len(deleted)} container(s) of '{self.group_id}'.")
+        return deleted
 
     def remove(self) -> None:
         def _remove(container: docker.client.ContainerCollection) -> None:
             try:
-                container.remove()
+                with profiling.span("container.remove", self._host_of(container)):
+                    self._call(container, "remove")
                 logger.info(f"Container {container} successfully removed.")
             except Exception as e:
                 logger.warning(str(e))
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=None) as executor:
-            futures = [executor.submit(_remove, c) for c in self.containers_list]
-            _ = concurrent.futures.as_completed(futures, timeout=30)
+        with profiling.span("remove"):
+            futures = [self._submit_for(c, _remove, c) for c in self.containers_list]
+            _ = concurrent.futures.wait(futures)
 
-    def ping(self) -> Dict[str, List[docker.client.ContainerCollection]]:
-        now = int(time.time())
+    def _host_of(self, container: docker.client.ContainerCollection) -> Optional[str]:
+        return utils.resolve_base_url(self._machines.get(container.id))
+
+    def _by_host(
+        self, containers: List[docker.client.ContainerCollection] = None
+    ) -> Dict[Hashable, List[docker.client.ContainerCollection]]:
+        """Group containers by Docker daemon, keyed by one of the machine names."""
+        containers = self.containers_list if containers is None else containers
+        machines, grouped = {}, {}
+        for c in containers:
+            machine = self._machines.get(c.id)
+            machine = machines.setdefault(utils.resolve_base_url(machine), machine)
+            grouped.setdefault(machine, []).append(c)
+        return grouped
+
+    def _host_status(
+        self, machine: Hashable, containers: List[docker.client.ContainerCollection]
+    ) -> List[Tuple[docker.client.ContainerCollection, str]]:
+        """Status of the containers on single host, "unreachable" if the query fails.
+
+        Status of unreachable containers is left as last known.
 
-        def _ping(
-            container: docker.client.ContainerCollection,
-        ) -> Tuple[docker.client.ContainerCollection, str]:
+        """
+        ids = [c.id for c in containers]
+        try:
             try:
-                container.reload()
-                logs = container.logs(timestamps=True, since=self.last_ping, until=now)
-                if logs:
-                    base_url = container.client.api.base_url
-                    info = f"{container.short_id}@{base_url} : {logs.decode('utf-8')}"
-                    logger.info(info)
-                return container, container.status
+                with profiling.span("status.list", utils.resolve_base_url(machine)):
+                    status = list_status(self.pool.get(machine), ids)
             except docker.errors.APIError:
-                return container, "not found"
+                raise
+            except Exception as e:
+                logger.debug(f"Retrying status query on '{machine}' after {e!r}")
+                status = list_status(self.pool.reconnect(machine), ids)
+        except Exception as e:
+            logger.warning(f"Failed to query status of containers on '{machine}' : {e}")
+            return [(c, "unreachable") for c in containers]
+
+        result = [(c, status.get(c.id, "not found")) for c in containers]
+        # Restart count is only in full inspection, so it's read on status change;
+        # leaving "created" state, which ``run`` returns the container in, isn't.
+        changed = [
+            c
+            for c, s in result
+            if (s != c.status) and (s != "not found") and (c.status != "created")
+        ]
+        _ = [_set_status(c, s) for c, s in result]
+        _ = [self.metrics.observe_status(c.id, s) for c, s in result]
+        for container in changed:
+            try:
+                self._call(container, "reload")
+                self.metrics.observe_attrs(container.id, container.attrs)
+            except Exception as e:
+                logger.debug(f"Failed to inspect {container.short_id} : {e!r}")
+        return result
+
+    PingTimeout: float = 30.0
+    """Seconds to wait for status of containers on each host."""
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=None) as executor:
-            futures = [executor.submit(_ping, c) for c in self.containers_list]
-            futures = concurrent.futures.as_completed(futures, timeout=30)
+    def ping(
+        self, containers: List[docker.client.ContainerCollection] = None
+    ) -> Dict[str, List[docker.client.ContainerCollection]]:
+        """Status of containers, one API call per Docker daemon.
+
+        Containers that aren't running are returned, grouped by their status. The ones
+        on hosts which fail to answer in ``PingTimeout`` seconds are "unreachable". If
+        ``containers`` is given, only they are queried, and logs aren't printed. Logs
+        not fetched in ``PingTimeout`` seconds are skipped.
+
+        """
+        now = int(time.time())
+        with profiling.span("ping"):
+            hosts = self._by_host(containers)
+            futures = {
+                self._submit(machine, self._host_status, machine, hosted): machine
+                for machine, hosted in hosts.items()
+            }
+            futures_logs = []
+            if (self._log_follower is None) and (containers is None):
+                futures_logs = self._fetch_logs(
+                    self.containers_list, self.last_ping, now
+                )
+            done, pending = concurrent.futures.wait(
+                [*futures, *futures_logs], timeout=self.PingTimeout
+            )
+            result = [r for f in done if f in futures for r in f.result()]
+            for future in pending:
+                future.cancel()
+                if future in futures:
+                    logger.warning(f"Status query on '{futures[future]}' timed out.")
+                    result.extend((c, "unreachable") for c in hosts[futures[future]])
+            if any(f in pending for f in futures_logs):
+                logger.warning("Fetching logs of some containers timed out.")
 
         self.last_ping = now
-        result = [f.result() for f in futures]
         info = [{"container": c, "status": s} for c, s in result if s != "running"]
         return utils.groupby(info, "status")
 
-    def watch(self):
+    def listen(self) -> None:
+        """Start receiving status-changing events, one stream per Docker daemon.
+
+        Status of a container is re-fetched only when an event listed in
+        ``StatusEvents`` arrives, so a stable launch group costs no API call. Broken
+        stream is reopened from the time of the last event received, and the host is
+        polled instead until it succeeds.
+
+        """
+        if self._listening is not None:
+            return
+        stop = self._listening = threading.Event()
+        opened = int(time.time())
+
+        def _handle(event: Dict[str, Any], containers: Dict[str, Any]) -> None:
+            action = event.get("Action", event.get("status", ""))
+            if action.split(":", 1)[0] not in self.StatusEvents:
+                return
+            container = containers.get(event.get("id"))
+            if container is None:
+                return
+            if "timeNano" in event:
+                self.metrics.observe_event(event["timeNano"] / 1e9)
+            if action == "restart":
+                self.metrics.restarted(container.id)
+            try:
+                self._call(container, "reload")
+                self._status[container.id] = container.status
+                self.metrics.observe_attrs(container.id, container.attrs)
+            except docker.errors.APIError:
+                self._status[container.id] = "not found"
+
+        def _receive(machine: Hashable, containers: Dict[str, Any]) -> None:
+            filters = {"type": "container", "container": list(containers.keys())}
+            since, backoff, broken = (
+                opened,
+                Backoff(1.0, self.MaxReconnectInterval),
+                False,
+            )
+            while not stop.is_set():
+                try:
+                    client = (
+                        self.pool.reconnect(machine)
+                        if broken
+                        else self.pool.get(machine)
+                    )
+                    stream = client.events(decode=True, filters=filters, since=since)
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to open event stream of '{machine}', polling : {e}"
+                    )
+                    result = self._host_status(machine, list(containers.values()))
+                    self._status.update({c.id: s for c, s in result})
+                    stop.wait(backoff.next())
+                    broken = True
+                    continue
+
+                self._event_streams.append(stream)
+                backoff.reset()
+                try:
+                    for event in stream:
+                        since = event.get("time", since)
+                        _handle(event, containers)
+                except Exception as e:
+                    if not stop.is_set():
+                        logger.warning(f"Event stream of '{machine}' broken : {e}")
+                finally:
+                    if stream in self._event_streams:
+                        self._event_streams.remove(stream)
+                broken = True
+
+        for machine, containers in self._by_host().items():
+            threading.Thread(
+                target=_receive,
+                args=(machine, {c.id: c for c in containers}),
+                daemon=True,
+            ).start()
+
+        # Events emitted before the streams were opened are lost, so take a snapshot.
+        self._status.update({c.id: "running" for c in self.containers_list})
+        for status, info in self.ping().items():
+            self._status.update({i["container"].id: status for i in info})
+
+    def close_listeners(self) -> None:
+        if self._listening is not None:
+            self._listening.set()
+            self._listening = None
+        for stream in list(self._event_streams):
+            stream.close()
+        self._event_streams.clear()
+
+    def status(self) -> Dict[str, List[docker.client.ContainerCollection]]:
+        """Status of containers known from events, in the same format as ``ping``."""
+        info = [
+            {"container": c, "status": self._status.get(c.id, "running")}
+            for c in self.containers_list
+        ]
+        info = [i for i in info if i["status"] != "running"]
+        return utils.groupby(info, "status")
+
+    MaxLogStreams: int = 8
+    """Log streams followed on single Docker daemon. Each is a session of the SSH
+    connection, which sshd caps at 10 by default (``MaxSessions``)."""
+    LogSliceInterval: float = 10.0
+    """Seconds between log fetches of the containers beyond ``MaxLogStreams``."""
+
+    def follow_logs(self) -> None:
+        """Continuously print logs of all containers, instead of slicing in ``ping``.
+
+        Logs since the last ``ping`` (or creation of this object) are printed. Up to
+        ``MaxLogStreams`` containers per host are followed by streams, see
+        :class:`LogFollower`; logs of the rest are fetched every ``LogSliceInterval``
+        seconds.
+
+        """
+        if self._log_follower is not None:
+            return
+        hosted = list(self._by_host().values())
+        followed = [c for cs in hosted for c in cs[: self.MaxLogStreams]]
+        sliced = [c for cs in hosted for c in cs[self.MaxLogStreams :]]
+        self._log_follower = LogFollower(
+            followed,
+            metrics=self.metrics,
+            open_stream=self._open_logs,
+            since=self.last_ping,
+        )
+        self._log_follower.start()
+        if sliced:
+            self._log_slicer = threading.Event()
+            threading.Thread(
+                target=self._slice_logs, args=(sliced, self._log_slicer), daemon=True
+            ).start()
+
+    def unfollow_logs(self) -> None:
+        if self._log_slicer is not None:
+            self._log_slicer.set()
+            self._log_slicer = None
+        if self._log_follower is not None:
+            self._log_follower.stop()
+            self._log_follower = None
+
+    def _open_logs(
+        self, container: docker.client.ContainerCollection, since: Optional[float]
+    ) -> Any:
+        future = self._submit(
+            self._machines.get(container.id),
+            self._call,
+            container,
+            "logs",
+            stream=True,
+            follow=True,
+            timestamps=True,
+            since=since,
+        )
+        return future.result()
+
+    def _fetch_logs(
+        self,
+        containers: List[docker.client.ContainerCollection],
+        since: int,
+        until: int,
+    ) -> List[concurrent.futures.Future]:
+        """Print logs of the containers between the times, one call per container."""
+
+        def _logs(container: docker.client.ContainerCollection) -> None:
+            try:
+                logs = self._call(
+                    container, "logs", timestamps=True, since=since, until=until
+                )
+            except docker.errors.APIError:
+                return
+            if logs:
+                base_url = container.client.api.base_url
+                info = f"{container.short_id}@{base_url} : {logs.decode('utf-8')}"
+                logger.info(info)
+
+        return [self._submit_for(c, _logs, c) for c in containers]
+
+    def _slice_logs(
+        self,
+        containers: List[docker.client.ContainerCollection],
+        stop: threading.Event,
+    ) -> None:
+        since = self.last_ping
+        while not stop.wait(self.LogSliceInterval):
+            until = int(time.time())
+            try:
+                futures = self._fetch_logs(containers, since, until)
+                _ = concurrent.futures.wait(futures, timeout=self.PingTimeout)
+            except RuntimeError:  # Scheduler shut down.
+                return
+            since = until
+
+    def watch(
+        self,
+        events: bool = False,
+        min_interval: float = 1.0,
+        max_interval: float = 10.0,
+        intervals: Dict[str, float] = None,
+    ):
+        """Watch the containers until interrupted.
+
+        Each container is polled at an interval which starts at ``min_interval`` and
+        doubles up to its maximum while the status of the containers doesn't change.
+        Any change, unreachable host or failed poll brings every container back to
+        ``min_interval``; polling goes on until interrupted either way.
+
+        Parameters
+        ----------
+        events
+            If True, track the status via Docker events stream instead of polling
+            every container.
+        min_interval
+            Interval in seconds right after start or any status change.
+        max_interval
+            Interval in seconds the polling backs off to while nothing changes.
+        intervals
+            Maximum interval of specific containers, keyed by name or ID.
+
+        """
+        intervals = {} if intervals is None else intervals
+        backoffs: Dict[str, Backoff] = {}
+        due: Dict[str, float] = {}
+        last_status: Dict[str, str] = {}
+
+        def _backoff(container: docker.client.ContainerCollection) -> Backoff:
+            if container.id not in backoffs:
+                maximum = intervals.get(getattr(container, "name", None), max_interval)
+                maximum = intervals.get(container.id, maximum)
+                backoffs[container.id] = Backoff(min_interval, maximum)
+            return backoffs[container.id]
+
+        def _reset(now: float) -> None:
+            _ = [_backoff(c).reset() for c in self.containers_list]
+            due.update({c.id: now for c in self.containers_list})
+
+        def _poll(now: float) -> Dict[str, List[docker.client.ContainerCollection]]:
+            targets = [c for c in self.containers_list if due.get(c.id, 0) <= now]
+            not_running = self.ping(targets) if targets else {}
+            changed = any(last_status.get(c.id) != c.status for c in targets)
+            last_status.update({c.id: c.status for c in targets})
+            if changed or ("unreachable" in not_running):
+                _reset(now)
+            for c in targets:
+                due[c.id] = now + _backoff(c).next()
+            return not_running
+
         try:
+            self.follow_logs()
+            if events:
+                self.listen()
+            scheduled = time.monotonic()
             while True:
-                not_running = self.ping()
+                start = time.monotonic()
+                try:
+                    not_running = self.status() if events else _poll(start)
+                except Exception as e:
+                    logger.warning(f"Failed to poll status of containers : {e!r}")
+                    not_running = {}
+                    _reset(start)
+                    for c in self.containers_list:
+                        due[c.id] = start + _backoff(c).next()
+                self.metrics.observe_poll(
+                    time.monotonic() - start, max(start - scheduled, 0.0)
+                )
                 if not_running:
                     logger.info(str(not_running))
-                time.sleep(1)
+                now = time.monotonic()
+                if events:
+                    scheduled = now + min_interval
+                else:
+                    scheduled = max(min(due.values(), default=now + min_interval), now)
+                time.sleep(scheduled - now)
         except Exception as e:
             logger.error(e)
             self.stop()
+        finally:
+            self.close_listeners()
+            self.unfollow_logs()
+
+    TeardownModes: List[str] = ["stop", "remove", "prune"]
+    """What ``launch`` does on exit; stop the containers, remove them forcibly with
+    single call per container, or stop then remove them with single call per host."""
 
     @classmethod
-    def launch(cls, config_path: PathLike, **kwargs) -> None:
+    def launch(
+        cls,
+        config_path: PathLike,
+        metrics_port: int = None,
+        teardown: str = "stop",
+        events: bool = False,
+        max_poll_interval: float = 10.0,
+        cache: bool = False,
+        max_workers: int = 32,
+        max_per_host: int = 8,
+        **kwargs,
+    ) -> None:
         """Launch containers described in config_path.
 
+        If ``metrics_port`` is given, metrics of the containers are served on the port
+        in Prometheus format, see :meth:`serve_metrics`. On exit, the containers are
+        cleaned up as ``teardown`` specifies, see ``TeardownModes``. Containers
+        created with ``remove=True`` are removed by the daemon once stopped. Status
+        is tracked by Docker events if ``events`` is True, otherwise polling backs off
+        up to ``max_poll_interval`` seconds, see :meth:`watch`. If
+        ``cache`` is True, the compiled configuration is cached on disk, see
+        :class:`~docker_launch.plan_cache.PlanCache`. API calls are made by
+        ``max_workers`` threads, at most ``max_per_host`` at a time to single daemon.
+
         .. warning::
 
             To stop all the containers, press Ctrl+C. Killing the process will leave the
             launched containers unmanaged.
 
         """
-        c = cls(config_path)
-        c.start(**kwargs)
+        if teardown not in cls.TeardownModes:
+            raise LaunchError(
+                f"Unknown teardown mode '{teardown}', choose from {cls.TeardownModes}."
+            )
+        if not check_docker_available():
+            logger.warning("Docker isn't available in this environment.")
+        c = cls(
+            config_path,
+            max_workers=max_workers,
+            max_per_host=max_per_host,
+            cache=cache,
+        )
         try:
-            c.watch()
+            if metrics_port is not None:
+                c.serve_metrics(metrics_port)
+            c.start(**kwargs)
+            c.watch(events=events, max_interval=max_poll_interval)
         finally:
-            c.stop()
+            if teardown == "remove":
+                c.teardown()
+            else:
+                c.stop()
+            if teardown == "prune":
+                c.prune()
+            c.close()
 
 
 launch_containers = Containers.launch
+attach_containers = Containers.reattach
@@ -0,0 +1,346 @@
+"""Expose the state of a live launch group in Prometheus text format.
+
+:class:`LaunchMetrics` accumulates counters while containers are watched, and
+:class:`MetricsServer` serves them over HTTP, so monitoring can scrape the launcher
+instead of every Docker daemon.
+
+Examples
+--------
+>>> c = Containers("path/to/config.toml")
+>>> server = c.serve_metrics(9180)
+>>> c.start()
+>>> c.watch()  # Metrics are at http://localhost:9180/metrics
+
+"""
+
+import bisect
+import http.server
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Tuple
+
+from docker_launch import logger
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class ContainerState(NamedTuple):
+    id: str
+    name: str
+    host: str
+    status: str
+
+
+def host_label(host: Hashable) -> str:
+    """Host of Docker daemon as labelled in metrics, base URL without the scheme.
+
+    Examples
+    --------
+    >>> host_label("ssh://user@172.29.0.1")
+    'user@172.29.0.1'
+    >>> host_label(None)
+    'localhost'
+
+    """
+    return "localhost" if host is None else str(host).split("//")[-1]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative histogram of observations, per label set."""
+
+    def __init__(self, buckets: List[float]) -> None:
+        self.buckets = sorted(buckets)
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        with self._lock:
+            if labels not in self._counts:
+                self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._counts[labels][bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[labels] += value
+
+    def samples(self, name: str) -> Iterable[str]:
+        with self._lock:
+            items = [(k, list(v), self._sums[k]) for k, v in self._counts.items()]
+        for labels, counts, total in items:
+            cumulative = 0
+            for le, count in zip(self.buckets + [float("inf")], counts):
+                cumulative += count
+                _labels = labels + (("le", _format_value(le)),)
+                yield f"{name}_bucket{_format_labels(_labels)} {cumulative}"
+            yield f"{name}_sum{_format_labels(labels)} {_format_value(total)}"
+            yield f"{name}_count{_format_labels(labels)} {cumulative}"
+
+
+class LaunchMetrics:
+    """Counters of a launch group, rendered in Prometheus text exposition format.
+
+    This object also receives :mod:`docker_launch.profiling` spans; durations of
+    ``ApiPhases`` are observed as API call latency per host.
+
+    """
+
+    ApiPhases: List[str] = [
+        "client.connect",
+        "ssh.handshake",
+        "image.prepare",
+        "container.create",
+        "container.stop",
+        "container.kill",
+        "container.remove",
+        "container.prune",
+        "status.list",
+    ]
+    """Profiling spans which are a call to Docker daemon or SSH server."""
+
+    LatencyBuckets: List[float] = [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+
+    def __init__(self) -> None:
+        self.api_latency = Histogram(self.LatencyBuckets)
+        self.restarts: Dict[str, int] = defaultdict(int)
+        self.restart_counts: Dict[str, int] = {}
+        self.started_at: Dict[str, float] = {}
+        self.log_lines: Dict[str, int] = defaultdict(int)
+        self.log_bytes: Dict[str, int] = defaultdict(int)
+        self.polls = 0
+        self.poll_duration = 0.0
+        self.poll_lag = 0.0
+        self.event_lag = 0.0
+        self._status: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, host: Hashable, duration: float) -> None:
+        if phase in self.ApiPhases:
+            labels = (("host", host_label(host)), ("call", phase))
+            self.api_latency.observe(duration, labels)
+
+    def started(self, container_id: str, timestamp: float = None) -> None:
+        self.started_at[container_id] = time.time() if timestamp is None else timestamp
+
+    def restarted(self, container_id: str) -> None:
+        with self._lock:
+            self.restarts[container_id] += 1
+        self.started(container_id)
+
+    def observe_status(self, container_id: str, status: str) -> None:
+        """Count a restart when the container is seen entering "restarting" state.
+
+        Once ``RestartCount`` of the container is known, restarts by restart policy
+        are counted from it instead, see :meth:`observe_attrs`.
+
+        """
+        with self._lock:
+            previous = self._status.get(container_id)
+            self._status[container_id] = status
+            counted = container_id in self.restart_counts
+        if (status == "restarting") and (previous != "restarting") and not counted:
+            self.restarted(container_id)
+
+    def observe_attrs(self, container_id: str, attrs: Dict[str, Any]) -> None:
+        """Count restarts by the increase of ``RestartCount`` in full inspection.
+
+        The first count seen is the baseline. Restarts too quick to be seen in any
+        poll are counted this way too.
+
+        """
+        count = attrs.get("RestartCount")
+        if not isinstance(count, int):
+            return
+        with self._lock:
+            previous = self.restart_counts.get(container_id, count)
+            self.restart_counts[container_id] = count
+            self.restarts[container_id] += max(count - previous, 0)
+        if count > previous:
+            self.started(container_id)
+
+    def observe_poll(self, duration: float, lag: float) -> None:
+        self.polls += 1
+        self.poll_duration, self.poll_lag = duration, lag
+
+    def observe_event(self, timestamp: float) -> None:
+        self.event_lag = max(time.time() - timestamp, 0.0)
+
+    def observe_log(self, container_id: str, line: bytes) -> None:
+        with self._lock:
+            self.log_lines[container_id] += 1
+            self.log_bytes[container_id] += len(line)
+
+    def render(self, containers: Iterable[ContainerState]) -> str:
+        now = time.time()
+        lines = []
+
+        def _metric(name: str, kind: str, doc: str, samples: Iterable[str]) -> None:
+            lines.append(f"# HELP {name} {doc}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        containers = list(containers)
+        labels = {c.id: (("container", c.name), ("host", c.host)) for c in containers}
+
+        def _per_container(name: str, values: Callable[[str], float]) -> List[str]:
+            return [
+                f"{name}{_format_labels(labels[c.id])} {_format_value(values(c.id))}"
+                for c in containers
+            ]
+
+        _metric(
+            "docker_launch_container_status",
+            "gauge",
+            "Current status of the container, labelled by the status.",
+            [
+                f"docker_launch_container_status"
+                f"{_format_labels(labels[c.id] + (('status', c.status),))} 1"
+                for c in containers
+            ],
+        )
+        _metric(
+            "docker_launch_container_restarts_total",
+            "counter",
+            "Number of restarts observed by the launcher.",
+            _per_container(
+                "docker_launch_container_restarts_total", lambda i: self.restarts[i]
+            ),
+        )
+        running = {c.id for c in containers if c.status == "running"}
+        _metric(
+            "docker_launch_container_uptime_seconds",
+            "gauge",
+            "Seconds since the container started, 0 if it isn't running.",
+            _per_container(
+                "docker_launch_container_uptime_seconds",
+                lambda i: (
+                    round(now - self.started_at.get(i, now), 3) if i in running else 0
+                ),
+            ),
+        )
+        _metric(
+            "docker_launch_log_lines_total",
+            "counter",
+            "Log lines received from the container.",
+            _per_container(
+                "docker_launch_log_lines_total", lambda i: self.log_lines[i]
+            ),
+        )
+        _metric(
+            "docker_launch_log_bytes_total",
+            "counter",
+            "Bytes of log received from the container.",
+            _per_container(
+                "docker_launch_log_bytes_total", lambda i: self.log_bytes[i]
+            ),
+        )
+        _metric(
+            "docker_launch_api_call_duration_seconds",
+            "histogram",
+            "Latency of calls to Docker daemons and SSH servers.",
+            self.api_latency.samples("docker_launch_api_call_duration_seconds"),
+        )
+        scalars = [
+            ("polls_total", "counter", "Number of status polls.", self.polls),
+            (
+                "poll_duration_seconds",
+                "gauge",
+                "Duration of the latest status poll.",
+                self.poll_duration,
+            ),
+            (
+                "poll_lag_seconds",
+                "gauge",
+                "Delay of the latest status poll behind its schedule.",
+                self.poll_lag,
+            ),
+            (
+                "event_lag_seconds",
+                "gauge",
+                "Delay between the latest Docker event and its receipt.",
+                self.event_lag,
+            ),
+        ]
+        for name, kind, doc, value in scalars:
+            name = f"docker_launch_{name}"
+            _metric(name, kind, doc, [f"{name} {_format_value(value)}"])
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """HTTP server answering ``GET /metrics`` in a background thread.
+
+    Parameters
+    ----------
+    render
+        Function returning the metrics text, called on every scrape.
+    port
+        Port to listen on; 0 picks a free port, see ``port`` attribute.
+    address
+        Address to bind to, all interfaces by default.
+
+    """
+
+    ContentType: str = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, render: Callable[[], str], port: int, address: str = "") -> None:
+        self.render = render
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                try:
+                    body = server.render().encode("utf-8")
+                except Exception as e:
+                    logger.warning(f"Failed to render metrics : {e!r}")
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", server.ContentType)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                logger.debug(f"Metrics request from {self.address_string()}")
+
+        self._httpd = http.server.ThreadingHTTPServer((address, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def start(self) -> "MetricsServer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, daemon=True
+            )
+            self._thread.start()
+            logger.info(f"Serving metrics on port {self.port}")
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
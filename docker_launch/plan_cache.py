@@ -0,0 +1,200 @@
+"""Keep compiled launch plans on disk, to skip parsing on the next run.
+
+A plan is stored under a key hashed from the path, modification time and size of
+every file it was compiled from. The manifest remembers which files each
+configuration includes, so checking the cache takes a ``stat`` per file, with no
+parsing at all. Least recently used plans are evicted once the total size of the
+cache exceeds the limit.
+
+Examples
+--------
+>>> cache = PlanCache()
+>>> cache.load("path/to/config.toml") is None
+True
+>>> cache.store("path/to/config.toml", groups, stamps)
+>>> cache.load("path/to/config.toml")[0] == groups
+True
+
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from docker_launch import __version__, logger
+from .typing import PathLike
+
+Groups = Dict[Hashable, List[Dict[str, Any]]]
+Stamps = Dict[Path, Tuple[int, int, str]]
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def default_directory() -> Path:
+    """``$XDG_CACHE_HOME/docker-launch``, or ``~/.cache/docker-launch``."""
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "docker-launch"
+
+
+class PlanCache:
+    """Pickled launch plans in a directory, with size-bounded LRU eviction.
+
+    Parameters
+    ----------
+    directory
+        Where the plans and the manifest are stored, see :func:`default_directory`.
+    max_size
+        Maximum total size of the stored plans in bytes.
+
+    """
+
+    MaxSize: int = 64 * 1024 * 1024
+    ManifestName: str = "manifest.json"
+    LockName: str = "manifest.lock"
+
+    _lock = threading.Lock()
+
+    def __init__(self, directory: PathLike = None, max_size: int = None) -> None:
+        self.directory = default_directory() if directory is None else Path(directory)
+        self.max_size = self.MaxSize if max_size is None else max_size
+
+    @staticmethod
+    def _key(stamps: List[Tuple[str, int, int]]) -> str:
+        """Hash of path, modification time in ns and size of the files."""
+        h = hashlib.sha256(__version__.encode("utf-8"))
+        for path, mtime, size in stamps:
+            h.update(f"{path}\0{mtime}\0{size}\0".encode("utf-8"))
+        return h.hexdigest()
+
+    @staticmethod
+    def _stat(paths: List[str]) -> Optional[List[Tuple[str, int, int]]]:
+        stamps = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            stamps.append((path, stat.st_mtime_ns, stat.st_size))
+        return stamps
+
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return json.loads((self.directory / self.ManifestName).read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, name: str, data: bytes) -> None:
+        """Write the file atomically, so concurrent runs never see it half-written."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=f".{name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.directory / name)
+        except BaseException:
+            _unlink(Path(tmp))
+            raise
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the manifest exclusively, against other threads and processes."""
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / self.LockName, "a") as f:
+                # Released when the file is closed.
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                yield
+
+    def _update_manifest(self, config: str, entry: Optional[Dict[str, Any]]) -> None:
+        """Replace the entry of the config; call with :meth:`_locked` held."""
+        manifest = self._read_manifest()
+        old = manifest.pop(config, None)
+        if (old is not None) and ((entry is None) or old["key"] != entry["key"]):
+            _unlink(self.directory / f"{old['key']}.pickle")
+        if entry is not None:
+            manifest[config] = entry
+        self._evict(manifest)
+        self._write(self.ManifestName, json.dumps(manifest).encode("utf-8"))
+
+    def _evict(self, manifest: Dict[str, Dict[str, Any]]) -> None:
+        total = sum(e["size"] for e in manifest.values())
+        for config, entry in sorted(manifest.items(), key=lambda x: x[1]["used"]):
+            if total <= self.max_size:
+                break
+            _unlink(self.directory / f"{entry['key']}.pickle")
+            del manifest[config]
+            total -= entry["size"]
+            logger.debug(f"Evicted cached plan of '{config}'")
+
+        # Plans no entry refers to, e.g. left by a run killed before the update.
+        referenced = {f"{e['key']}.pickle" for e in manifest.values()}
+        for path in self.directory.glob("*.pickle"):
+            if path.name not in referenced:
+                _unlink(path)
+
+    def load(self, config_path: PathLike) -> Optional[Tuple[Groups, Stamps]]:
+        """Plan and stamps of the files, None if missing or any file has changed."""
+        config = str(Path(config_path).resolve())
+        entry = self._read_manifest().get(config)
+        if entry is None:
+            return None
+        stamps = self._stat(entry["files"])
+        if (stamps is None) or (self._key(stamps) != entry["key"]):
+            logger.debug(f"Cached plan of '{config}' is outdated")
+            return None
+        try:
+            data = (self.directory / f"{entry['key']}.pickle").read_bytes()
+            groups, stamps = pickle.loads(data)
+        except Exception as e:
+            logger.debug(f"Failed to load cached plan of '{config}' : {e!r}")
+            return None
+
+        entry["used"] = time.time()
+        try:
+            with self._locked():
+                self._update_manifest(config, entry)
+        except OSError as e:
+            logger.debug(f"Failed to update plan cache manifest : {e!r}")
+        return groups, {Path(p): tuple(s) for p, s in stamps.items()}
+
+    def store(self, config_path: PathLike, groups: Groups, stamps: Stamps) -> None:
+        """Save the plan compiled from the files; failures are only logged."""
+        config = str(Path(config_path).resolve())
+        files = sorted(str(p) for p in stamps)
+        key = self._key([(str(p), *stamps[p][:2]) for p in sorted(stamps, key=str)])
+        data = pickle.dumps(
+            (groups, {str(p): s for p, s in stamps.items()}),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        entry = {"key": key, "files": files, "size": len(data), "used": time.time()}
+        try:
+            # Written under the lock, so that eviction never takes it as unreferenced.
+            with self._locked():
+                self._write(f"{key}.pickle", data)
+                self._update_manifest(config, entry)
+        except OSError as e:
+            logger.debug(f"Failed to cache plan of '{config}' : {e!r}")
+
+    def clear(self) -> None:
+        with self._locked():
+            for path in self.directory.glob("*.pickle"):
+                _unlink(path)
+            _unlink(self.directory / self.ManifestName)
@@ -0,0 +1,122 @@
+"""Share Docker clients among operations.
+
+Creating a Docker client for remote host involves SSH handshake, which is far more
+expensive than the API calls themselves. This pool creates at most one client per
+daemon and hands it out to every operation in a session.
+
+"""
+
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+
+import docker
+
+from docker_launch import logger
+from . import profiling, utils
+from .transport import SSHSessionPool, create_client
+
+
+class ClientPool:
+    """Docker clients keyed by resolved base URL.
+
+    Parameters
+    ----------
+    health_check_interval
+        Minimum interval in seconds between health checks of a client. Unhealthy
+        client is closed and replaced by new one.
+    sessions
+        SSH connections to share among clients for remote daemons. A pool owned by
+        this object is created if omitted.
+
+    Examples
+    --------
+    >>> with ClientPool() as pool:
+    ...     client = pool.get("user@172.29.1.2")
+    ...     client is pool.get("user@172.29.1.2")
+    True
+
+    """
+
+    def __init__(
+        self, health_check_interval: float = 30.0, sessions: SSHSessionPool = None
+    ) -> None:
+        self.health_check_interval = health_check_interval
+        self._own_sessions = sessions is None
+        self.sessions = SSHSessionPool() if sessions is None else sessions
+        self._clients: Dict[Optional[str], docker.DockerClient] = {}
+        self._last_checked: Dict[Optional[str], float] = {}
+        self._lock = threading.Lock()
+        self._host_locks = defaultdict(threading.Lock)
+
+    def __enter__(self) -> "ClientPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _host_lock(self, base_url: Optional[str]) -> threading.Lock:
+        with self._lock:
+            return self._host_locks[base_url]
+
+    def get(self, machine: Optional[str] = None) -> docker.DockerClient:
+        """Get healthy client for the machine, creating it on first request."""
+        base_url = utils.resolve_base_url(machine)
+        with self._host_lock(base_url):
+            client = self._clients.get(base_url)
+            if (client is not None) and (not self._is_healthy(base_url, client)):
+                logger.warning(f"Lost connection with '{base_url}', reconnecting.")
+                self._discard(base_url)
+                client = None
+            if client is None:
+                client = self._create(base_url)
+            return client
+
+    def reconnect(self, machine: Optional[str] = None) -> docker.DockerClient:
+        """Replace the client for the machine, e.g. on communication failure."""
+        base_url = utils.resolve_base_url(machine)
+        with self._host_lock(base_url):
+            self._discard(base_url)
+            return self._create(base_url)
+
+    def close(self) -> None:
+        for base_url in list(self._clients.keys()):
+            with self._host_lock(base_url):
+                self._discard(base_url)
+        if self._own_sessions:
+            self.sessions.close()
+
+    def _create(self, base_url: Optional[str]) -> docker.DockerClient:
+        with profiling.span("client.connect", base_url):
+            if (base_url is not None) and base_url.startswith("ssh://"):
+                client = create_client(base_url, self.sessions)
+            else:
+                client = docker.DockerClient(base_url=base_url)
+        self._clients[base_url] = client
+        self._last_checked[base_url] = time.monotonic()
+        return client
+
+    def _discard(self, base_url: Optional[str]) -> None:
+        client = self._clients.pop(base_url, None)
+        self._last_checked.pop(base_url, None)
+        if client is None:
+            return
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug(f"Failed to close client for '{base_url}' : {e}")
+
+    def _is_healthy(self, base_url: Optional[str], client: docker.DockerClient) -> bool:
+        now = time.monotonic()
+        if now - self._last_checked.get(base_url, now) < self.health_check_interval:
+            return True
+        try:
+            client.ping()
+            self._last_checked[base_url] = now
+            return True
+        except Exception:
+            return False
@@ -0,0 +1,119 @@
+"""Measure time spent in each phase of launch.
+
+Instrumented code wraps each phase in :func:`span`, which costs nothing until a
+:class:`Profiler` is activated with :func:`enable`. Durations are kept per (phase,
+host), and summarized into percentiles.
+
+Examples
+--------
+>>> profiler = enable()
+>>> with span("pull", "ssh://user@172.29.1.2"):
+...     pull_image()
+>>> disable()
+>>> profiler.summary()
+[{'phase': 'pull', 'host': 'ssh://user@172.29.1.2', 'count': 1, 'p50': 1.2, ...}]
+
+"""
+
+import contextlib
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from .typing import PathLike
+
+SpanKey = Tuple[str, Optional[str]]
+
+
+class Profiler:
+    """Durations of launch phases, per host."""
+
+    Percentiles: List[float] = [0.5, 0.95]
+
+    def __init__(self) -> None:
+        self._durations: Dict[SpanKey, List[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, host: Hashable, duration: float) -> None:
+        key = (phase, None if host is None else str(host))
+        with self._lock:
+            self._durations[key].append(duration)
+
+    @contextlib.contextmanager
+    def span(self, phase: str, host: Hashable = None) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, host, time.perf_counter() - start)
+
+    @staticmethod
+    def percentile(durations: List[float], q: float) -> float:
+        """Nearest-rank percentile of sorted durations."""
+        return durations[max(math.ceil(q * len(durations)) - 1, 0)]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Count, percentiles and maximum duration of each (phase, host) in seconds."""
+        with self._lock:
+            items = [(k, sorted(v)) for k, v in self._durations.items()]
+
+        summary = []
+        for (phase, host), durations in items:
+            stats = {"phase": phase, "host": host, "count": len(durations)}
+            for q in self.Percentiles:
+                stats[f"p{round(q * 100)}"] = self.percentile(durations, q)
+            stats["max"] = durations[-1]
+            stats["total"] = sum(durations)
+            summary.append(stats)
+        return summary
+
+    def dump(self, path: PathLike) -> None:
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+_sinks: Tuple[Profiler, ...] = ()
+_sinks_lock = threading.Lock()
+
+
+def enable(profiler: Profiler = None) -> Profiler:
+    """Start recording spans into given or new profiler, besides the enabled ones.
+
+    Any object with ``record(phase, host, duration)`` method can be given.
+
+    """
+    global _sinks
+    profiler = Profiler() if profiler is None else profiler
+    with _sinks_lock:
+        _sinks = _sinks + (profiler,)
+    return profiler
+
+
+def disable(profiler: Profiler = None) -> None:
+    """Stop recording into the profiler, or into all profilers if omitted."""
+    global _sinks
+    with _sinks_lock:
+        _sinks = tuple(
+            p for p in _sinks if (profiler is not None) and p is not profiler
+        )
+
+
+@contextlib.contextmanager
+def _span(sinks: Tuple[Profiler, ...], phase: str, host: Hashable) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        _ = [p.record(phase, host, duration) for p in sinks]
+
+
+def span(phase: str, host: Hashable = None) -> contextlib.AbstractContextManager:
+    """Time the block as ``phase`` on ``host``, if profiling is enabled."""
+    sinks = _sinks
+    if not sinks:
+        return contextlib.nullcontext()
+    return _span(sinks, phase, host)
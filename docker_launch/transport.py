@@ -0,0 +1,175 @@
+"""Multiplex all Docker-over-SSH traffic to a host on single SSH connection.
+
+Docker SDK opens its own SSH connection for every client, and pays full key exchange
+and authentication each time. Here authenticated connections are kept in
+:class:`SSHSessionPool`, and HTTP requests to Docker daemon are sent over channels of
+the shared connection.
+
+"""
+
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+import docker
+import paramiko
+from docker.transport import SSHHTTPAdapter
+from docker.transport.basehttpadapter import BaseHTTPAdapter
+
+from docker_launch import logger
+from . import profiling
+
+SessionKey = Tuple[str, int, Optional[str]]
+
+
+class SSHSessionPool:
+    """Authenticated SSH connections keyed by (hostname, port, username).
+
+    Attributes
+    ----------
+    handshakes
+        Number of SSH connections established by this pool.
+
+    Examples
+    --------
+    >>> sessions = SSHSessionPool()
+    >>> client = sessions.get("172.29.1.2", username="user")
+    >>> client is sessions.get("172.29.1.2", username="user")
+    True
+
+    """
+
+    def __init__(self) -> None:
+        self.handshakes = 0
+        self.handshake_time = 0.0
+        self._clients: Dict[SessionKey, paramiko.SSHClient] = {}
+        self._lock = threading.Lock()
+        self._key_locks = defaultdict(threading.Lock)
+
+    def __enter__(self) -> "SSHSessionPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def key(hostname: str, port: int = None, username: str = None) -> SessionKey:
+        return (hostname, 22 if port is None else int(port), username)
+
+    def _key_lock(self, key: SessionKey) -> threading.Lock:
+        with self._lock:
+            return self._key_locks[key]
+
+    def find(
+        self, hostname: str, port: int = None, username: str = None
+    ) -> Optional[paramiko.SSHClient]:
+        """Active connection to the host, if any."""
+        client = self._clients.get(self.key(hostname, port, username))
+        return client if _is_active(client) else None
+
+    def get(
+        self, hostname: str, port: int = None, username: str = None, **connect_kwargs
+    ) -> paramiko.SSHClient:
+        """Active connection to the host, connecting if there is none."""
+        key = self.key(hostname, port, username)
+        with self._key_lock(key):
+            client = self._clients.get(key)
+            if _is_active(client):
+                return client
+            if client is not None:
+                logger.debug(f"SSH connection to '{hostname}' lost, reconnecting.")
+                client.close()
+
+            client = paramiko.SSHClient()
+            client.load_system_host_keys()
+            client.set_missing_host_key_policy(paramiko.RejectPolicy())
+            self._connect(client, key, **connect_kwargs)
+            self._clients[key] = client
+            return client
+
+    def adopt(
+        self,
+        client: paramiko.SSHClient,
+        hostname: str,
+        port: int = None,
+        username: str = None,
+    ) -> None:
+        """Keep connection established elsewhere, unless the pool already has one."""
+        key = self.key(hostname, port, username)
+        with self._key_lock(key):
+            if _is_active(self._clients.get(key)):
+                client.close()
+                return
+            self._clients[key] = client
+
+    def close(self) -> None:
+        for key in list(self._clients.keys()):
+            with self._key_lock(key):
+                client = self._clients.pop(key, None)
+                if client is not None:
+                    client.close()
+
+    def _connect(
+        self, client: paramiko.SSHClient, key: SessionKey, **connect_kwargs
+    ) -> None:
+        hostname, port, username = key
+        start = time.perf_counter()
+        with profiling.span("ssh.handshake", hostname):
+            client.connect(hostname, port=port, username=username, **connect_kwargs)
+        with self._lock:
+            self.handshakes += 1
+            self.handshake_time += time.perf_counter() - start
+
+
+def _is_active(client: Optional[paramiko.SSHClient]) -> bool:
+    if client is None:
+        return False
+    transport = client.get_transport()
+    return (transport is not None) and transport.is_active()
+
+
+class SharedSSHHTTPAdapter(SSHHTTPAdapter):
+    """Docker SDK's SSH adapter, which borrows connection from ``SSHSessionPool``."""
+
+    def __init__(self, base_url: str, sessions: SSHSessionPool, **kwargs) -> None:
+        self.sessions = sessions
+        super().__init__(base_url, **kwargs)
+
+    def _connect(self) -> None:
+        self.ssh_client = self.sessions.get(**self.ssh_params)
+
+    def get_connection(self, url, proxies=None):
+        if not _is_active(self.ssh_client):
+            self._connect()
+        return super().get_connection(url, proxies)
+
+    def close(self) -> None:
+        # The SSH connection is owned by the session pool.
+        BaseHTTPAdapter.close(self)
+
+
+def create_client(base_url: str, sessions: SSHSessionPool) -> docker.DockerClient:
+    """Docker client for ``ssh://`` URL, whose traffic goes through ``sessions``."""
+    # Shelling-out adapter doesn't connect on construction, and fixed version skips
+    # the version query, so no SSH connection is made until the adapter is replaced.
+    client = docker.DockerClient(
+        base_url=base_url,
+        use_ssh_client=True,
+        version=docker.constants.DEFAULT_DOCKER_API_VERSION,
+    )
+    api = client.api
+    if not isinstance(getattr(api, "_custom_adapter", None), SSHHTTPAdapter):
+        return client
+
+    adapter = SharedSSHHTTPAdapter(
+        base_url,
+        sessions,
+        timeout=api.timeout,
+        max_pool_size=api._custom_adapter.max_pool_size,
+    )
+    api._custom_adapter.close()
+    api._custom_adapter = adapter
+    api.mount("http+docker://ssh", adapter)
+    api._version = api._retrieve_server_version()
+    return client
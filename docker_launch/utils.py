@@ -98,3 +98,27 @@ def resolve_base_url(machine: str = None) -> str:
     if is_ip_address(machine):
         return f"ssh://{machine}"
     raise ValueError(f"Cannot interpret machine specification : '{machine}'")
+
+
+def parse_positive_int(expr: str, name: str) -> int:
+    """Value of command-line option ``name``, which should be a positive integer.
+
+    Examples
+    --------
+    >>> parse_positive_int("8", "jobs")
+    8
+    >>> parse_positive_int("eight", "jobs")
+    Traceback (most recent call last):
+    ...
+    ValueError: Option '--jobs' should be a positive integer, got 'eight'
+
+    """
+    try:
+        value = int(expr)
+    except (TypeError, ValueError):
+        value = 0
+    if value < 1:
+        raise ValueError(
+            f"Option '--{name}' should be a positive integer, got '{expr}'"
+        )
+    return value
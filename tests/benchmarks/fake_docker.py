@@ -0,0 +1,228 @@
+"""In-memory stand-in of Docker SDK client, with injectable latency per API call."""
+
+import itertools
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+_ids = itertools.count()
+
+
+class FakeContainer:
+    def __init__(
+        self, client: "FakeClient", image: str, command: str, labels: dict = None
+    ) -> None:
+        self.client = client
+        self.collection = client.containers
+        self.id = f"{next(_ids):064x}"
+        self.short_id = self.id[-10:]
+        self.name = f"fake_{self.short_id}"
+        self.image = image
+        self.command = command
+        self.attrs = {
+            "State": {"Status": "running"},
+            "Config": {"Labels": labels},
+            "RestartCount": 0,
+        }
+        # Followed log lines, put by tests; stopping the container ends the stream.
+        self.log_queue: queue.Queue = queue.Queue()
+        self.log_since: List[float] = []
+
+    @property
+    def status(self) -> str:
+        return self.attrs["State"]["Status"]
+
+    def reload(self) -> None:
+        self.client.request()
+
+    def logs(self, stream: bool = False, since: float = None, **kwargs):
+        # Every container just prints its command.
+        self.client.request()
+        if stream:
+            self.log_since.append(since)
+            return FakeEventStream(self.log_queue)
+        return f"{self.command}\n".encode("utf-8")
+
+    def stop(self, timeout: int = None) -> None:
+        self.client.request()
+        self.attrs["State"]["Status"] = "exited"
+        self.log_queue.put(None)
+
+    def kill(self, signal: str = None) -> None:
+        self.client.request()
+        self.attrs["State"]["Status"] = "exited"
+        self.log_queue.put(None)
+
+    def remove(self, force: bool = False, **kwargs) -> None:
+        self.client.request()
+        self.client.store.pop(self.id, None)
+
+
+class FakeContainerCollection:
+    def __init__(self, client: "FakeClient") -> None:
+        self.client = client
+
+    def run(self, image: str, command: str, detach: bool = True, **kwargs):
+        self.client.request()
+        container = FakeContainer(self.client, image, command, kwargs.get("labels"))
+        self.client.store[container.id] = container
+        return container
+
+    def list(self, all: bool = False, sparse: bool = False, filters: dict = None):
+        self.client.request()
+        containers = self._filter(filters)
+        if not all:
+            containers = [c for c in containers if c.status == "running"]
+        return [SparseContainer(c) for c in containers]
+
+    def _filter(self, filters: dict = None) -> List[FakeContainer]:
+        containers = list(self.client.store.values())
+        if (filters is not None) and ("id" in filters):
+            ids = set(filters["id"])
+            containers = [c for c in containers if c.id in ids]
+        if (filters is not None) and ("label" in filters):
+            key, _, value = filters["label"].partition("=")
+            containers = [
+                c
+                for c in containers
+                if (c.attrs["Config"]["Labels"] or {}).get(key) == value
+            ]
+        return containers
+
+    def prune(self, filters: dict = None) -> dict:
+        self.client.request()
+        stopped = [c.id for c in self._filter(filters) if c.status != "running"]
+        _ = [self.client.store.pop(i) for i in stopped]
+        return {"ContainersDeleted": stopped or None, "SpaceReclaimed": 0}
+
+
+class SparseContainer:
+    """Snapshot of a container, as returned by ``containers.list``."""
+
+    def __init__(self, container: FakeContainer) -> None:
+        self.id = container.id
+        self.attrs = {
+            "Id": container.id,
+            "State": container.status,
+            "Labels": container.attrs["Config"]["Labels"],
+        }
+        self._container = container
+
+    def __getattr__(self, name: str):
+        return getattr(self._container, name)
+
+    @property
+    def status(self) -> str:
+        return self.attrs["State"]
+
+
+class FakeImageCollection:
+    def __init__(self, client: "FakeClient") -> None:
+        self.client = client
+
+    def get(self, name: str) -> str:
+        self.client.request()
+        return name
+
+
+class FakeAPI:
+    def __init__(self, base_url: str) -> None:
+        self.base_url = f"http+docker://{base_url}"
+
+
+class FakeEventStream:
+    """Events (or log chunks) put in the queue by tests; exceptions are raised."""
+
+    def __init__(self, events: queue.Queue) -> None:
+        self.events = events
+        self.closed = False
+
+    def __iter__(self):
+        while True:
+            event = self.events.get()
+            if self.closed or (event is None):
+                return
+            if isinstance(event, BaseException):
+                raise event
+            yield event
+
+    def close(self) -> None:
+        self.closed = True
+        self.events.put(None)
+
+
+class FakeClient:
+    """Docker client whose every API call takes ``latency`` seconds."""
+
+    def __init__(self, base_url: str = None, latency: float = 0.0, **kwargs) -> None:
+        self.latency = latency
+        self.api = FakeAPI(base_url)
+        self.containers = FakeContainerCollection(self)
+        self.images = FakeImageCollection(self)
+        self.store: Dict[str, FakeContainer] = {}
+        self.event_queue: queue.Queue = queue.Queue()
+        self.event_since: List[int] = []
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def request(self) -> None:
+        with self._lock:
+            self.calls += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def ping(self) -> bool:
+        self.request()
+        return True
+
+    def events(self, decode: bool = False, filters: dict = None, since: int = None):
+        self.request()
+        self.event_since.append(since)
+        return FakeEventStream(self.event_queue)
+
+    def close(self) -> None:
+        pass
+
+
+class FakeClientPool:
+    """Drop-in replacement of ``ClientPool`` handing out ``FakeClient``."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.clients: Dict[str, FakeClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, machine: str = None) -> FakeClient:
+        with self._lock:
+            if machine not in self.clients:
+                self.clients[machine] = FakeClient(machine, self.latency)
+            return self.clients[machine]
+
+    reconnect = get
+
+    def close(self) -> None:
+        pass
+
+    @property
+    def calls(self) -> int:
+        return sum(c.calls for c in self.clients.values())
+
+
+def write_config(path: Path, n_containers: int, n_hosts: int) -> Path:
+    """Write launch configuration with containers spread evenly over hosts."""
+    machines: List[str] = [
+        f"user@172.29.{i // 250}.{i % 250 + 1}" for i in range(n_hosts)
+    ]
+    targets = ",\n".join(
+        f'    {{ id = "{i}", __machine__ = "{machines[i % n_hosts]}" }}'
+        for i in range(n_containers)
+    )
+    path.write_text(
+        "[bench]\n"
+        'baseimg = "ubuntu:latest"\n'
+        'command = "sleep {id}"\n'
+        f"targets = [\n{targets}\n]\n"
+    )
+    return path
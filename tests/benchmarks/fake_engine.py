@@ -0,0 +1,280 @@
+"""In-process fake of Docker Engine API, served over localhost HTTP.
+
+Unlike ``fake_docker``, which replaces Docker SDK objects, this fake serves the HTTP
+API itself, so the real Docker SDK, connection pooling and serialization are
+exercised. Every simulated host is a separate server with its own latency.
+
+"""
+
+import http.server
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional, Union
+from urllib.parse import parse_qs, unquote, urlparse
+
+import docker
+
+from docker_launch.pool import ClientPool
+
+_ids = itertools.count()
+
+ThreadName = "fake-engine"
+"""Name of threads serving the fake daemons, to tell them from those of launcher."""
+
+
+class FakeHost:
+    """Container store and request statistics of single simulated daemon."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.containers: Dict[str, dict] = {}
+        self.calls: Counter = Counter()
+        self.lock = threading.Lock()
+
+    def create(self, body: dict, name: Optional[str]) -> dict:
+        container_id = uuid.uuid4().hex + f"{next(_ids):032x}"
+        self.containers[container_id] = {
+            "Id": container_id,
+            "Name": f"/{name or 'fake_' + container_id[-10:]}",
+            "Created": int(time.time()),
+            "State": {"Status": "created", "Running": False, "ExitCode": 0},
+            "Config": {
+                "Image": body.get("Image"),
+                "Cmd": body.get("Cmd"),
+                "Labels": body.get("Labels") or {},
+                "Tty": bool(body.get("Tty")),
+            },
+            "HostConfig": body.get("HostConfig") or {},
+        }
+        return {"Id": container_id, "Warnings": []}
+
+    def summary(self, container: dict) -> dict:
+        """Entry of ``GET /containers/json``."""
+        return {
+            "Id": container["Id"],
+            "Names": [container["Name"]],
+            "Image": container["Config"]["Image"],
+            "Created": container["Created"],
+            "State": container["State"]["Status"],
+            "Status": container["State"]["Status"],
+            "Labels": container["Config"]["Labels"],
+        }
+
+    def filter(self, filters: dict, all: bool = True) -> List[dict]:
+        containers = list(self.containers.values())
+        if "id" in filters:
+            ids = set(filters["id"])
+            containers = [c for c in containers if c["Id"] in ids]
+        for label in filters.get("label", []):
+            key, _, value = label.partition("=")
+            containers = [
+                c for c in containers if c["Config"]["Labels"].get(key) == value
+            ]
+        if not all:
+            containers = [c for c in containers if c["State"]["Status"] == "running"]
+        return containers
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    def process_request(self, request, client_address) -> None:
+        threading.Thread(
+            target=self.process_request_thread,
+            args=(request, client_address),
+            name=ThreadName,
+            daemon=True,
+        ).start()
+
+
+class FakeEngine:
+    """Fake Docker daemons, one localhost HTTP server per simulated host.
+
+    Parameters
+    ----------
+    latency
+        Seconds each request takes, for every host or per base URL of the hosts.
+
+    """
+
+    def __init__(self, latency: Union[float, Dict[str, float]] = 0.0) -> None:
+        self.latency = latency
+        self.hosts: Dict[str, FakeHost] = {}
+        self._servers: Dict[str, _Server] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "FakeEngine":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def calls(self) -> int:
+        return sum(sum(h.calls.values()) for h in self.hosts.values())
+
+    def url(self, base_url: Optional[str]) -> str:
+        """``tcp://`` URL of the server simulating the host, started on demand."""
+        key = str(base_url)
+        with self._lock:
+            if key not in self._servers:
+                latency = self.latency
+                if isinstance(latency, dict):
+                    latency = latency.get(key, 0.0)
+                host = FakeHost(latency)
+                server = _Server(("127.0.0.1", 0), _handler(host))
+                threading.Thread(
+                    target=server.serve_forever, name=ThreadName, daemon=True
+                ).start()
+                self.hosts[key], self._servers[key] = host, server
+            return f"tcp://127.0.0.1:{self._servers[key].server_address[1]}"
+
+    def close(self) -> None:
+        for server in self._servers.values():
+            server.shutdown()
+            server.server_close()
+        self._servers.clear()
+
+
+class EnginePool(ClientPool):
+    """``ClientPool`` whose clients talk to ``FakeEngine`` instead of remote hosts."""
+
+    def __init__(self, engine: FakeEngine, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.engine = engine
+
+    def _create(self, base_url: Optional[str]) -> docker.DockerClient:
+        client = docker.DockerClient(base_url=self.engine.url(base_url), version="1.41")
+        self._clients[base_url] = client
+        self._last_checked[base_url] = time.monotonic()
+        return client
+
+
+def _handler(host: FakeHost):
+    routes = []
+
+    def route(method: str, pattern: str):
+        def decorator(func):
+            routes.append((method, re.compile(f"^{pattern}$"), func))
+            return func
+
+        return decorator
+
+    @route("GET", r"/_ping")
+    def _ping(query, body):
+        return 200, "OK"
+
+    @route("GET", r"/version")
+    def _version(query, body):
+        return 200, {"ApiVersion": "1.41", "Version": "fake"}
+
+    @route("GET", r"/images/(?P<name>.+)/json")
+    def _image(query, body, name):
+        return 200, {"Id": f"sha256:{name}", "RepoTags": [name]}
+
+    @route("POST", r"/containers/create")
+    def _create(query, body):
+        return 201, host.create(body, query.get("name", [None])[0])
+
+    @route("GET", r"/containers/json")
+    def _list(query, body):
+        filters = json.loads(query.get("filters", ["{}"])[0])
+        containers = host.filter(filters, query.get("all", ["0"])[0] in ("1", "true"))
+        return 200, [host.summary(c) for c in containers]
+
+    @route("POST", r"/containers/prune")
+    def _prune(query, body):
+        filters = json.loads(query.get("filters", ["{}"])[0])
+        pruned = [
+            c["Id"] for c in host.filter(filters) if c["State"]["Status"] != "running"
+        ]
+        _ = [host.containers.pop(i) for i in pruned]
+        return 200, {"ContainersDeleted": pruned or None, "SpaceReclaimed": 0}
+
+    @route("GET", r"/containers/(?P<id>\w+)/json")
+    def _inspect(query, body, id):
+        return 200, host.containers[id]
+
+    @route("GET", r"/containers/(?P<id>\w+)/logs")
+    def _logs(query, body, id):
+        return 200, b""
+
+    @route("POST", r"/containers/(?P<id>\w+)/start")
+    def _start(query, body, id):
+        host.containers[id]["State"].update(Status="running", Running=True)
+        return 204, None
+
+    @route("POST", r"/containers/(?P<id>\w+)/(?P<action>stop|kill)")
+    def _stop(query, body, id, action):
+        code = 0 if action == "stop" else 137
+        host.containers[id]["State"].update(Status="exited", Running=False)
+        host.containers[id]["State"]["ExitCode"] = code
+        return 204, None
+
+    @route("DELETE", r"/containers/(?P<id>\w+)")
+    def _remove(query, body, id):
+        container = host.containers[id]
+        running = container["State"]["Status"] == "running"
+        if running and query.get("force", ["False"])[0] not in ("1", "True", "true"):
+            return 409, {"message": "You cannot remove a running container"}
+        host.containers.pop(id)
+        return 204, None
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _dispatch(self, method: str) -> None:
+            url = urlparse(self.path)
+            path = re.sub(r"^/v[\d.]+", "", unquote(url.path))
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            body = json.loads(raw) if raw else {}
+
+            if host.latency > 0:
+                time.sleep(host.latency)
+            for _method, pattern, func in routes:
+                match = pattern.match(path)
+                if (_method == method) and match:
+                    with host.lock:
+                        host.calls[func.__name__.lstrip("_")] += 1
+                        try:
+                            code, payload = func(
+                                parse_qs(url.query), body, **match.groupdict()
+                            )
+                        except KeyError:
+                            code, payload = 404, {"message": "No such container"}
+                    break
+            else:
+                code, payload = 404, {"message": f"Not implemented : {method} {path}"}
+            self._respond(code, payload)
+
+        def _respond(self, code: int, payload) -> None:
+            if payload is None:
+                data, content_type = b"", "text/plain"
+            elif isinstance(payload, (bytes, str)):
+                data = payload if isinstance(payload, bytes) else payload.encode()
+                content_type = "text/plain"
+            else:
+                data, content_type = json.dumps(payload).encode(), "application/json"
+            self.send_response(code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            self._dispatch("GET")
+
+        def do_POST(self) -> None:
+            self._dispatch("POST")
+
+        def do_DELETE(self) -> None:
+            self._dispatch("DELETE")
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return Handler
@@ -0,0 +1,52 @@
+"""Compare threaded and asyncio launch engines over fake Docker daemons."""
+
+import asyncio
+
+import pytest
+
+from docker_launch.async_launch import AsyncContainers
+from docker_launch.launch import Containers
+
+from .fake_docker import FakeClientPool, write_config
+
+LATENCY = 0.001
+N_HOSTS = 10
+
+
+def run_threaded(config_path, pool) -> None:
+    c = Containers(config_path, pool=pool)
+    c.start()
+    c.ping(c.containers_list)
+    c.stop()
+    c.remove()
+    c.close()
+
+
+def run_async(config_path, pool) -> None:
+    async def main():
+        c = AsyncContainers(config_path, pool=pool)
+        await c.start()
+        await c.ping()
+        await c.stop()
+        await c.remove()
+        c.close()
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("n_containers", [10, 100, 1000])
+def test_engines(tmp_path, n_containers):
+    config_path = write_config(tmp_path / "config.toml", n_containers, N_HOSTS)
+
+    threaded_pool = FakeClientPool(LATENCY)
+    run_threaded(config_path, threaded_pool)
+    async_pool = FakeClientPool(LATENCY)
+    run_async(config_path, async_pool)
+
+    # Both engines make the same calls; image check once per host, run per
+    # container, single list per host, then stop and remove per container.
+    expected = 2 * N_HOSTS + 3 * n_containers
+    assert threaded_pool.calls == async_pool.calls == expected
+    assert len(async_pool.clients) == len(threaded_pool.clients) == N_HOSTS
+    for client in async_pool.clients.values():
+        assert len(client.store) == 0
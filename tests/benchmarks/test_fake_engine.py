@@ -0,0 +1,140 @@
+"""Measure launch hot paths against fake Docker daemons served over HTTP.
+
+Wall time, API calls and peak thread count of each phase are printed; run with
+``pytest -s tests/benchmarks``. Set ``DOCKER_LAUNCH_BENCHMARK_FULL=1`` to include the
+largest launch groups.
+
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+import pytest
+
+from docker_launch.config_parser import ConfigFileParser
+from docker_launch.launch import Containers
+
+from .fake_docker import write_config
+from .fake_engine import EnginePool, FakeEngine, ThreadName
+
+LATENCY = 0.001
+N_HOSTS = 10
+
+full = pytest.mark.skipif(
+    not os.environ.get("DOCKER_LAUNCH_BENCHMARK_FULL"),
+    reason="Set DOCKER_LAUNCH_BENCHMARK_FULL=1 to run the largest benchmarks.",
+)
+SIZES = [10, 100, 1000, pytest.param(5000, marks=full)]
+
+
+@contextmanager
+def measure(engine: FakeEngine, result: Dict[str, float]) -> Iterator[None]:
+    """Record wall time, API calls and peak number of launcher threads of the block."""
+
+    def count() -> int:
+        return sum(t.name != ThreadName for t in threading.enumerate())
+
+    peak = count()
+    done = threading.Event()
+
+    def sample() -> None:
+        nonlocal peak
+        while not done.wait(0.005):
+            peak = max(peak, count())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    calls, start = engine.calls, time.perf_counter()
+    try:
+        yield
+    finally:
+        result["time"] = time.perf_counter() - start
+        result["calls"] = engine.calls - calls
+        done.set()
+        sampler.join()
+        # The sampler thread itself isn't counted.
+        result["threads"] = peak - 1
+
+
+def report(name: str, n_containers: int, results: Dict[str, Dict[str, float]]):
+    lines = [f"\n{name}, {n_containers} containers on {N_HOSTS} hosts"]
+    for phase, r in results.items():
+        lines.append(
+            f"  {phase:8s} {r['time']:8.3f}s {r['calls']:6d} calls "
+            f"{r['threads']:4d} threads"
+        )
+    print("\n".join(lines))
+
+
+@pytest.mark.parametrize("n_containers", SIZES)
+def test_lifecycle(tmp_path, n_containers):
+    config_path = write_config(tmp_path / "config.toml", n_containers, N_HOSTS)
+    results = {phase: {} for phase in ["start", "ping", "stop", "remove"]}
+
+    baseline = threading.active_count()
+    with FakeEngine(LATENCY) as engine:
+        c = Containers(config_path, pool=EnginePool(engine))
+        with measure(engine, results["start"]):
+            _ = c.start()
+        with measure(engine, results["ping"]):
+            not_running = c.ping(c.containers_list)
+        with measure(engine, results["stop"]):
+            stopped = c.stop()
+        with measure(engine, results["remove"]):
+            c.remove()
+        c.close()
+
+        assert len(c.containers_list) == n_containers
+        assert not_running == {}
+        assert len(stopped["stopped"]) == n_containers
+        assert all(len(h.containers) == 0 for h in engine.hosts.values())
+
+    report("lifecycle", n_containers, results)
+    # Image check once per host, then create, inspect and start per container.
+    assert results["start"]["calls"] == N_HOSTS + 3 * n_containers
+    # Single filtered list per host, regardless of the number of containers.
+    assert results["ping"]["calls"] == N_HOSTS
+    assert results["stop"]["calls"] == results["remove"]["calls"] == n_containers
+    # Thread count is bounded by the scheduler, not by the number of containers.
+    assert results["start"]["threads"] <= baseline + c.scheduler.max_workers
+
+
+@pytest.mark.parametrize("n_containers", SIZES)
+def test_teardown(tmp_path, n_containers):
+    config_path = write_config(tmp_path / "config.toml", n_containers, N_HOSTS)
+    results = {phase: {} for phase in ["teardown", "prune"]}
+
+    with FakeEngine(LATENCY) as engine:
+        pool = EnginePool(engine)
+        c = Containers(config_path, pool=pool)
+        _ = c.start()
+        with measure(engine, results["teardown"]):
+            removed = c.teardown()
+        c.close()
+
+        # Prune removes stopped containers of the group, so launch another one.
+        c = Containers(config_path, pool=pool)
+        _ = c.start()
+        _ = c.stop()
+        with measure(engine, results["prune"]):
+            pruned = c.prune()
+        c.close()
+
+    report("teardown", n_containers, results)
+    assert len(removed["removed"]) == len(pruned) == n_containers
+    assert results["teardown"]["calls"] == n_containers
+    assert results["prune"]["calls"] == N_HOSTS
+
+
+@pytest.mark.parametrize("n_containers", SIZES)
+def test_parse(tmp_path, n_containers):
+    config_path = write_config(tmp_path / "config.toml", n_containers, N_HOSTS)
+    start = time.perf_counter()
+    parsed = ConfigFileParser.parse(config_path)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nparse, {n_containers} targets : {elapsed:.3f}s")
+    assert sum(len(v) for v in parsed.values()) == n_containers
@@ -0,0 +1,60 @@
+"""Compare TOML parser backends on a large tree of included config files."""
+
+import time
+from pathlib import Path
+
+import pytest
+import tomlkit
+
+from docker_launch.config_parser import ConfigFileParser, _toml
+
+N_TARGETS = 200
+
+
+def write_tree(root: Path, depth: int, fanout: int) -> Path:
+    """Write config files including ``fanout`` files each, ``depth`` levels deep."""
+
+    def _write(name: str, level: int) -> str:
+        children = [f"{name}_{i}" for i in range(fanout)] if level < depth else []
+        targets = ",\n".join(
+            f'    {{ id = "{i}", __machine__ = "user@172.29.1.{i % 10 + 1}" }}'
+            for i in range(N_TARGETS)
+        )
+        (root / f"{name}.toml").write_text(
+            f"include = {[f'{c}.toml' for c in children]}\n".replace("'", '"')
+            + f'[{name}]\nbaseimg = "ubuntu:latest"\ncommand = "run {{id}}"\n'
+            + f"targets = [\n{targets}\n]\n"
+        )
+        _ = [_write(c, level + 1) for c in children]
+        return name
+
+    return root / f"{_write('root', 0)}.toml"
+
+
+@pytest.mark.skipif(_toml is None, reason="Neither tomllib nor tomli is installed.")
+def test_backends(tmp_path, monkeypatch):
+    path = write_tree(tmp_path, depth=3, fanout=3)
+
+    def timed_parse():
+        start = time.perf_counter()
+        parsed = ConfigFileParser.parse(path)
+        return parsed, time.perf_counter() - start
+
+    ConfigFileParser.clear_cache()
+    fast, fast_time = timed_parse()
+    cached, cached_time = timed_parse()
+
+    monkeypatch.setattr(
+        ConfigFileParser, "_loads", staticmethod(lambda t: tomlkit.parse(t).unwrap())
+    )
+    ConfigFileParser.clear_cache()
+    slow, slow_time = timed_parse()
+    ConfigFileParser.clear_cache()
+
+    n_files = len(list(tmp_path.glob("*.toml")))
+    print(
+        f"\n{n_files} files, {n_files * N_TARGETS} targets : "
+        f"{_toml.__name__} {fast_time:.3f}s, tomlkit {slow_time:.3f}s "
+        f"({slow_time / fast_time:.1f}x), cached {cached_time:.3f}s"
+    )
+    assert fast == slow == cached
@@ -0,0 +1,53 @@
+"""Count SSH handshakes needed to talk to remote Docker daemons."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import docker
+import pytest
+
+from docker_launch.transport import SharedSSHHTTPAdapter, SSHSessionPool, create_client
+
+HANDSHAKE_LATENCY = 0.02
+N_CLIENTS = 10
+HOSTS = ["ssh://user@172.29.1.2", "ssh://user@172.29.1.3"]
+
+
+@pytest.fixture
+def slow_handshake():
+    handshakes = []
+
+    def connect(self, hostname, port=22, username=None, **kwargs) -> None:
+        time.sleep(HANDSHAKE_LATENCY)
+        handshakes.append(hostname)
+        self._transport = MagicMock()
+        self._transport.is_active.return_value = True
+
+    with patch("paramiko.SSHClient.connect", connect), patch(
+        "docker.api.client.APIClient._retrieve_server_version", lambda self: "1.41"
+    ):
+        yield handshakes
+
+
+def test_handshake_count(slow_handshake):
+    start = time.perf_counter()
+    for _ in range(N_CLIENTS):
+        _ = [docker.DockerClient(base_url=url, version="1.41") for url in HOSTS]
+    plain = time.perf_counter() - start
+    plain_handshakes = len(slow_handshake)
+
+    slow_handshake.clear()
+    sessions = SSHSessionPool()
+    start = time.perf_counter()
+    for _ in range(N_CLIENTS):
+        clients = [create_client(url, sessions) for url in HOSTS]
+    shared = time.perf_counter() - start
+
+    print(
+        f"\n{N_CLIENTS} clients x {len(HOSTS)} hosts : "
+        f"plain {plain_handshakes} handshakes in {plain:.3f}s, "
+        f"shared {len(slow_handshake)} handshakes in {shared:.3f}s"
+    )
+    assert plain_handshakes == N_CLIENTS * len(HOSTS)
+    assert sessions.handshakes == len(slow_handshake) == len(HOSTS)
+    assert all(isinstance(c.api._custom_adapter, SharedSSHHTTPAdapter) for c in clients)
@@ -0,0 +1,39 @@
+"""Compare compiled command template against ``format_map`` per target."""
+
+import time
+from collections import defaultdict
+
+import pytest
+
+from docker_launch.config_parser import CommandTemplate
+
+TEMPLATE = "ros2 run bench node --ros-args -p receiver:={receiver} -p board:={board} -p channel:={channel} -r __ns:=/{receiver}/{board}"  # noqa: E501
+
+
+def format_map(template, targets):
+    return [template.format_map(defaultdict(lambda: "", v)) for v in targets]
+
+
+def compiled(template, targets):
+    return CommandTemplate(template).render_all(targets)
+
+
+@pytest.mark.parametrize("n_targets", [1000, 10000])
+def test_throughput(n_targets):
+    targets = [
+        {"receiver": f"rx{i % 7}", "board": str(i % 16), "channel": i, "id": i}
+        for i in range(n_targets)
+    ]
+
+    results = {}
+    for func in [format_map, compiled]:
+        start = time.perf_counter()
+        results[func.__name__] = func(TEMPLATE, targets)
+        results[func.__name__ + "_time"] = time.perf_counter() - start
+    speedup = results["format_map_time"] / results["compiled_time"]
+
+    print(
+        f"\n{n_targets} targets : format_map {results['format_map_time']:.4f}s, "
+        f"compiled {results['compiled_time']:.4f}s ({speedup:.1f}x)"
+    )
+    assert results["compiled"] == results["format_map"]
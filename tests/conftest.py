@@ -7,10 +7,20 @@ import pytest
 from cleo import Application, CommandTester
 from docker import DockerClient as OriginalDockerClient
 
+from docker_launch.console.apply_command import ApplyCommand
+from docker_launch.console.attach_command import AttachCommand
 from docker_launch.console.check_command import CheckCommand
 from docker_launch.console.up_command import UpCommand
 
 
+@pytest.fixture(autouse=True)
+def plan_cache_dir(tmp_path_factory, monkeypatch) -> Path:
+    """Keep compiled plans cached by the tests out of user's cache directory."""
+    path = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(path))
+    return path / "docker-launch"
+
+
 @pytest.fixture
 def sample_dir() -> Path:
     return Path(__file__).parent / "sample"
@@ -19,6 +29,8 @@ def sample_dir() -> Path:
 @pytest.fixture
 def app() -> Application:
     _app = Application()
+    _app.add(ApplyCommand())
+    _app.add(AttachCommand())
     _app.add(CheckCommand())
     _app.add(UpCommand())
     return _app
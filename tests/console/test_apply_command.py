@@ -0,0 +1,74 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from cleo import CommandTester
+
+from docker_launch.launch import HostScheduler
+
+from ..benchmarks.fake_docker import FakeClient
+
+
+@pytest.fixture
+def tester(command_tester_factory) -> CommandTester:
+    return command_tester_factory("apply")
+
+
+def test_apply(tester, sample_dir):
+    with patch("docker.DockerClient", FakeClient):
+        tester.execute(f"{sample_dir / 'config.toml'} --group=test --tty")
+    assert "Launch group test : 0 kept, 3 created, 0 removed" in (
+        tester.io.fetch_output()
+    )
+    assert tester.status_code == 0
+
+
+def test_profile(tester, sample_dir):
+    with patch("docker.DockerClient", FakeClient):
+        tester.execute(f"{sample_dir / 'config.toml'} --group=test --profile")
+    output = tester.io.fetch_output()
+    assert "image.prepare" in output
+    assert "p95 [s]" in output
+
+
+def test_profile_output(tester, sample_dir, tmp_path):
+    path = tmp_path / "profile.json"
+    with patch("docker.DockerClient", FakeClient):
+        tester.execute(
+            f"{sample_dir / 'config.toml'} --group=test --profile-output {path}"
+        )
+    summary = json.loads(path.read_text())
+    phases = {s["phase"] for s in summary}
+    assert {"client.connect", "image.prepare", "container.create"} <= phases
+    creates = [s["count"] for s in summary if s["phase"] == "container.create"]
+    assert sum(creates) == 3
+
+
+@pytest.mark.parametrize("no_cache", [False, True])
+def test_cache(tester, sample_dir, tmp_path, plan_cache_dir, no_cache):
+    config = tmp_path / "config.toml"
+    config.write_text((sample_dir / "config.toml").read_text())
+    with patch("docker.DockerClient", FakeClient):
+        tester.execute(f"{config} --group=test" + (" --no-cache" if no_cache else ""))
+    assert tester.status_code == 0
+    assert (plan_cache_dir / "manifest.json").exists() is not no_cache
+
+
+def test_concurrency_options(tester, sample_dir):
+    with patch("docker.DockerClient", FakeClient), patch(
+        "docker_launch.launch.HostScheduler", wraps=HostScheduler
+    ) as scheduler:
+        tester.execute(
+            f"{sample_dir / 'config.toml'} --group=test --max-workers=4 "
+            "--max-per-host=2"
+        )
+    assert tester.status_code == 0
+    scheduler.assert_called_once_with(4, 2)
+
+
+@pytest.mark.parametrize("option", ["--max-workers=many", "--max-per-host=0"])
+def test_invalid_concurrency_options(tester, sample_dir, option):
+    with patch("docker.DockerClient", FakeClient):
+        tester.execute(f"{sample_dir / 'config.toml'} --group=test {option}")
+    assert "should be a positive integer" in tester.io.fetch_error()
+    assert tester.status_code == 1
@@ -0,0 +1,25 @@
+from unittest.mock import patch
+
+import pytest
+from cleo import CommandTester
+
+from ..benchmarks.fake_docker import FakeClient
+
+
+@pytest.fixture
+def tester(command_tester_factory) -> CommandTester:
+    return command_tester_factory("attach")
+
+
+def test_attach_unknown_group(tester, sample_dir):
+    with patch("docker.DockerClient", FakeClient):
+        tester.execute(f"{sample_dir / 'config.toml'} unknown")
+    assert "No container of launch group 'unknown' found." in tester.io.fetch_error()
+    assert tester.status_code == 1
+
+
+def test_attach_events(tester, sample_dir):
+    with patch("docker_launch.launch.attach_containers") as attach:
+        tester.execute(f"{sample_dir / 'config.toml'} test --events")
+    attach.assert_called_once_with(str(sample_dir / "config.toml"), "test", events=True)
+    assert tester.status_code == 0
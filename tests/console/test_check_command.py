@@ -214,3 +214,42 @@ def test_check_setup_unknown_failure_interactive(
 
     assert "Unknown error." in tester.io.fetch_output()
     assert tester.status_code == 4
+
+
+def test_check_multiple_pass(tester):
+    with patch("paramiko.SSHClient.connect", lambda *args, **kwargs: None):
+        tester.execute("user@172.29.0.1 user@172.29.0.2", interactive=False)
+    output = tester.io.fetch_output()
+    assert output.count("OK") == 2
+    assert tester.status_code == 0
+
+
+@pytest.mark.usefixtures("mock_ssh_connection")
+def test_check_multiple_fail(tester):
+    tester.execute("user@172.29.0.1 me@172.29.0.1 -j 2", interactive=False)
+    output = tester.io.fetch_output()
+    assert "user@172.29.0.1" in output
+    assert "AuthenticationException" in output
+    assert "Cannot connect to 1 machine(s)." in tester.io.fetch_error()
+    assert tester.status_code == 1
+
+
+@pytest.mark.usefixtures("mock_ssh_connection")
+def test_check_config(tester, sample_dir):
+    tester.execute(f"--config {sample_dir / 'config.toml'}", interactive=False)
+    output = tester.io.fetch_output()
+    assert "user@172.29.1.2" in output
+    assert "localhost" not in output
+    assert tester.status_code == 1
+
+
+def test_check_no_address(tester):
+    tester.execute("", interactive=False)
+    assert tester.status_code == 1
+
+
+@pytest.mark.parametrize("jobs", ["eight", "0"])
+def test_check_invalid_jobs(tester, jobs):
+    tester.execute(f"user@172.29.0.1 user@172.29.0.2 -j {jobs}", interactive=False)
+    assert "Option '--jobs' should be a positive integer" in tester.io.fetch_error()
+    assert tester.status_code == 1
@@ -267,6 +267,13 @@ def test_up_mac_address():
     ...
 
 
+@pytest.mark.parametrize("option", ["--max-workers=many", "--max-per-host=0"])
+def test_up_invalid_concurrency(tester, sample_dir, option):
+    tester.execute(f"{sample_dir / 'config.toml'} --rm {option}")
+    assert "should be a positive integer" in tester.io.fetch_error()
+    assert tester.status_code == 1
+
+
 @pytest.mark.skip(reason="Still experimental")
 def test_up_memory():
     ...
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import threading
+
+import pytest
+
+from docker_launch.async_launch import AsyncContainers
+from docker_launch.exceptions import LaunchError
+from docker_launch.launch import Containers
+
+from .benchmarks.fake_docker import FakeClient, FakeClientPool, write_config
+
+
+class ConcurrencyTrackingClient(FakeClient):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._counter_lock = threading.Lock()
+
+    def request(self) -> None:
+        with self._counter_lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        super().request()
+        with self._counter_lock:
+            self.in_flight -= 1
+
+
+class TrackingPool(FakeClientPool):
+    def get(self, machine=None):
+        with self._lock:
+            if machine not in self.clients:
+                self.clients[machine] = ConcurrencyTrackingClient(machine, self.latency)
+            return self.clients[machine]
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    return write_config(tmp_path / "config.toml", 40, 2)
+
+
+def test_lifecycle(config_path):
+    pool = FakeClientPool()
+
+    async def main():
+        c = AsyncContainers(config_path, pool=pool)
+        await c.start()
+        assert len(c.containers_list) == 40
+        assert await c.ping() == {}
+
+        await c.stop()
+        assert len((await c.ping())["exited"]) == 40
+        await c.remove()
+        c.close()
+
+    asyncio.run(main())
+    assert all(len(client.store) == 0 for client in pool.clients.values())
+
+
+def test_already_running(config_path):
+    async def main():
+        c = AsyncContainers(config_path, pool=FakeClientPool())
+        await c.start()
+        with pytest.raises(LaunchError):
+            await c.start()
+        c.close()
+
+    asyncio.run(main())
+
+
+def test_per_host_limit(config_path):
+    pool = TrackingPool(latency=0.005)
+
+    async def main():
+        c = AsyncContainers(config_path, pool=pool, max_per_host=3, max_workers=16)
+        await c.start()
+        c.close()
+
+    asyncio.run(main())
+    assert len(pool.clients) == 2
+    assert all(client.max_in_flight <= 3 for client in pool.clients.values())
+
+
+def test_start_stages(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text(
+        """
+[master]
+command = "master"
+targets = [{ __machine__ = "user@172.29.0.1" }]
+
+[nodes]
+command = "node {i}"
+depends_on = ["master"]
+targets = [
+    { i = "0", __machine__ = "user@172.29.0.1" },
+    { i = "1", __machine__ = "user@172.29.0.2" },
+]
+"""
+    )
+
+    async def main():
+        c = AsyncContainers(path, pool=FakeClientPool())
+        await c.start(ready_timeout=1)
+        c.close()
+        return c.containers_list
+
+    containers = asyncio.run(main())
+    assert containers[0].command == "master"
+    assert sorted(x.command for x in containers[1:]) == ["node 0", "node 1"]
+
+
+def test_attach(config_path, caplog):
+    caplog.set_level(logging.WARNING)
+    pool = FakeClientPool()
+
+    async def main():
+        c = AsyncContainers(config_path, pool=pool, group_id="async")
+        await c.start()
+        return c
+
+    c = asyncio.run(main())
+    assert len(c.metrics.started_at) == 40
+    # Labelled the same as the threaded engine does.
+    attached = Containers.attach(config_path, "async", pool=pool)
+    assert len(attached.containers_list) == 40
+    assert attached.ping() == {}
+    assert "different configuration" not in caplog.text
+    c.close()
@@ -1,6 +1,20 @@
+import hashlib
+import itertools
+import logging
+from collections import defaultdict
+
 import pytest
+import tomlkit
 
-from docker_launch.config_parser import _substitute_command, parse
+from docker_launch.config_parser import (
+    CommandTemplate,
+    ConfigFileParser,
+    _toml_loads,
+    _substitute_command,
+    load_plan,
+    parse,
+)
+from docker_launch import utils
 from docker_launch.exceptions import ConfigFileError
 
 
@@ -41,6 +55,49 @@ class TestSubstituteCommand:
         ) == ["ls -l ./", "ls -l ../"]
 
 
+class TestCommandTemplate:
+    @pytest.mark.parametrize(
+        "template",
+        ["ls", "ls {a} {b}", "{a:>5}|{a!r}|{b}", "{{literal}} {a:{b}}", "{a}{a}"],
+    )
+    def test_same_as_format_map(self, template):
+        targets = [{"a": "-l", "b": 3}, {"a": "x"}, {}]
+        expected = [template.format_map(defaultdict(str, t)) for t in targets]
+        assert CommandTemplate(template).render_all(targets) == expected
+        assert [CommandTemplate(template).render(t) for t in targets] == expected
+
+    def test_fields(self):
+        assert CommandTemplate("ls").fields == ()
+        assert CommandTemplate("ls {a} {b[0]} {a.real} {c:{d}}").fields == (
+            "a",
+            "b",
+            "c",
+            "d",
+        )
+
+    def test_field_after_nested_spec(self):
+        template = CommandTemplate("{value:{width}} {other}")
+        assert template.fields == ("value", "width", "other")
+        assert template.render({"value": 1, "width": 3, "other": "x"}) == "  1 x"
+
+    @pytest.mark.parametrize("template", ["ls {}", "ls {0}", "ls {a", "ls }"])
+    def test_invalid_template(self, template):
+        with pytest.raises(ConfigFileError):
+            CommandTemplate(template)
+
+    def test_check(self, caplog):
+        caplog.set_level(logging.WARNING)
+        targets = [{"a": "-l", "c": "x", "__machine__": "localhost"}, {"a": "-a"}]
+        CommandTemplate("ls {a} {b}").check(targets, "group")
+        assert "['c'] of targets of 'group'" in caplog.text
+        assert "{b} in 2 of 2" in caplog.text
+        assert "__machine__" not in caplog.text
+
+        caplog.clear()
+        CommandTemplate("ls {a}").check([{"a": "-l"}, {"a": "-a"}])
+        assert caplog.text == ""
+
+
 class TestParse:
     def test_parse(self, sample_dir):
         assert parse(sample_dir / "config.toml") == {
@@ -255,3 +312,247 @@ class TestParse:
                 }
             ],
         }
+
+
+class TestDependsOn:
+    def test_stages(self, sample_dir):
+        parsed = parse(sample_dir / "config_depends_on.toml")
+        assert parsed["localhost"] == [
+            {
+                "image": "ros:humble-ros-core",
+                "cmd": "ros2 daemon start",
+                "machine": "localhost",
+                "ready_log": "daemon started",
+                "table": "master",
+            },
+            {
+                "image": "ros:humble-ros-core",
+                "cmd": "ros2 topic pub first std_msgs/msg/Float64 '{data: 123.45}'",
+                "machine": "localhost",
+                "stage": 2,
+                "depends_on": ["master", "bridge"],
+            },
+            {
+                "image": "ros:humble-ros-core",
+                "cmd": "ros2 topic list",
+                "machine": "localhost",
+                "stage": 1,
+                "depends_on": ["master"],
+            },
+        ]
+        assert [e["stage"] for e in parsed["user@172.29.1.2"]] == [1, 2]
+        assert parsed["user@172.29.1.2"][0]["table"] == "bridge"
+
+    def test_layers(self, sample_dir):
+        layers = load_plan(sample_dir / "config_depends_on.toml").layers
+        assert [[e.cmd.split()[1] for e in layer] for layer in layers] == [
+            ["daemon"],
+            ["topic", "run"],
+            ["topic", "topic"],
+        ]
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            '[a]\ndepends_on = ["b"]\n[b]\ndepends_on = ["a"]\n',
+            '[a]\ndepends_on = ["a"]\n',
+            '[a]\ndepends_on = ["undefined"]\n',
+        ],
+    )
+    def test_invalid(self, tmp_path, content):
+        path = tmp_path / "config.toml"
+        path.write_text(content)
+        with pytest.raises(ConfigFileError):
+            parse(path)
+
+    @pytest.mark.parametrize(
+        "included",
+        [
+            '[nodes]\ncommand = "ls"\n',
+            '[nodes]\nready_log = "ready"\n',
+            '[c]\n[b]\ndepends_on = "c"\n',
+        ],
+    )
+    def test_duplicated_table(self, tmp_path, included):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "b.toml").write_text(included)
+        path = tmp_path / "config.toml"
+        path.write_text(
+            'include = ["sub/b.toml"]\n[c]\n[nodes]\ndepends_on = ["c"]\n'
+            '[b]\ndepends_on = "nodes"\n'
+        )
+        with pytest.raises(ConfigFileError, match="unique"):
+            parse(path)
+
+    def test_duplicated_table_without_dependency(self, sample_dir):
+        # Tables of the same name are fine, unless they're in dependency relation.
+        parsed = parse(sample_dir / "config_include_samebase.toml")
+        assert len(parsed["localhost"]) == 2
+
+    def test_digest_unchanged_without_stages(self, sample_dir):
+        plan = load_plan(sample_dir / "config.toml")
+        h = hashlib.sha256()
+        for e in plan.entries:
+            h.update(repr((e.image, e.cmd, e.machine)).encode("utf-8"))
+        assert plan.digest == h.hexdigest()
+
+
+class TestMatrix:
+    def test_cartesian_product(self, sample_dir):
+        parsed = parse(sample_dir / "config_matrix.toml")
+        assert [c["cmd"] for c in parsed[None]] == [
+            f"receive --board {b} --channel {c} fast" for b in "ab" for c in [0, 2, 4]
+        ]
+        assert len(parsed["user@172.29.1.2"]) == 6 + 2
+        assert [c["cmd"] for c in parsed["user@172.29.1.3"]] == [
+            "sweep 1 on user@172.29.1.3",
+            "sweep 2 on user@172.29.1.3",
+        ]
+
+    def test_lazy(self, tmp_path):
+        path = tmp_path / "config.toml"
+        path.write_text(
+            '[a]\ncommand = "run {x} {y}"\n'
+            "matrix = { x = { start = 0, stop = 1000000 }, y = { start = 0, stop = 1000000 } }\n"  # noqa: E501
+        )
+        entries = ConfigFileParser.iterparse(path)
+        assert [e["cmd"] for e in itertools.islice(entries, 3)] == [
+            "run 0 0",
+            "run 0 1",
+            "run 0 2",
+        ]
+
+    @pytest.mark.parametrize(
+        "matrix",
+        [
+            '"a"',
+            '{ x = "a" }',
+            "{ x = { start = 0 } }",
+            "{ x = { start = 0, stop = 3, step = 0 } }",
+            '{ x = { start = 0, stop = "3" } }',
+            "{ x = { start = 0, stop = 3, by = 1 } }",
+            "{ i = [1, 2] }",
+        ],
+    )
+    def test_invalid(self, tmp_path, matrix):
+        path = tmp_path / "config.toml"
+        path.write_text(f"[a]\ntargets = [{{ i = 0 }}]\nmatrix = {matrix}\n")
+        with pytest.raises(ConfigFileError):
+            parse(path)
+
+
+class TestBackend:
+    @pytest.mark.parametrize(
+        "name",
+        ["config.toml", "config_include_differentbase.toml", "config_matrix.toml"],
+    )
+    def test_tomlkit_fallback(self, sample_dir, monkeypatch, name):
+        expected = parse(sample_dir / name)
+        monkeypatch.setattr(
+            ConfigFileParser,
+            "_loads",
+            staticmethod(lambda t: tomlkit.parse(t).unwrap()),
+        )
+        ConfigFileParser.clear_cache()
+        assert parse(sample_dir / name) == expected
+
+    def test_invalid_toml(self, tmp_path):
+        path = tmp_path / "config.toml"
+        path.write_text("[a\n")
+        with pytest.raises(ConfigFileError):
+            parse(path)
+
+    def test_raw_content(self, sample_dir):
+        content = ConfigFileParser(sample_dir / "config.toml").raw_content
+        assert isinstance(content, tomlkit.TOMLDocument)
+
+
+class TestIncludeTree:
+    @pytest.fixture
+    def tree(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "root.toml").write_text(
+            'include = ["sub/a.toml", "sub/../b.toml", "b.toml", "c.toml"]\n'
+        )
+        (tmp_path / "sub" / "a.toml").write_text(
+            'include = ["../b.toml"]\n[a]\ncommand = "a"\ntargets = [{}]\n'
+        )
+        (tmp_path / "b.toml").write_text('[b]\ncommand = "b"\ntargets = [{}]\n')
+        (tmp_path / "c.toml").write_text('[c]\ncommand = "c"\ntargets = [{}]\n')
+        ConfigFileParser.clear_cache()
+        return tmp_path
+
+    @pytest.fixture
+    def loads(self, monkeypatch):
+        calls = []
+
+        def _loads(text):
+            calls.append(text)
+            return _toml_loads(text)
+
+        monkeypatch.setattr(ConfigFileParser, "_loads", staticmethod(_loads))
+        return calls
+
+    def test_read_once(self, tree, loads):
+        parsed = parse(tree / "root.toml")
+        assert [c["cmd"] for c in parsed[None]] == ["b", "a", "c"]
+        assert len(loads) == 4
+
+    def test_shared_cache(self, tree, loads):
+        first = parse(tree / "root.toml")
+        parser = ConfigFileParser(tree / "sub" / ".." / "root.toml")
+        assert utils.groupby(parser._parse(), "machine") == first
+        assert len(loads) == 4
+        assert set(parser.stamps) == {
+            (tree / name).resolve()
+            for name in ["root.toml", "sub/a.toml", "b.toml", "c.toml"]
+        }
+
+        (tree / "c.toml").write_text('[c]\ncommand = "cc"\ntargets = [{}]\n')
+        assert [c["cmd"] for c in parse(tree / "root.toml")[None]] == ["b", "a", "cc"]
+        assert len(loads) == 5
+
+
+class TestLaunchPlan:
+    @pytest.fixture
+    def config_dir(self, sample_dir, tmp_path):
+        for path in sample_dir.glob("*.toml"):
+            (tmp_path / path.name).write_text(path.read_text())
+        return tmp_path
+
+    def test_same_as_parse(self, sample_dir):
+        path = sample_dir / "config_include_differentbase.toml"
+        plan = load_plan(path)
+        assert {k: list(v) for k, v in plan.items()} == parse(path)
+        assert plan["localhost"][0].image == "ros:humble-ros-core"
+        assert plan["localhost"][0]["image"] == "ros:humble-ros-core"
+        assert len(plan.entries) == 6
+
+    def test_immutable(self, sample_dir):
+        entry = load_plan(sample_dir / "config.toml")["localhost"][0]
+        with pytest.raises(AttributeError):
+            entry.image = "ubuntu:latest"
+        with pytest.raises(AttributeError):
+            entry.tag = "latest"
+
+    def test_cached(self, config_dir):
+        plan = load_plan(config_dir / "config_include_samebase.toml")
+        assert load_plan(config_dir / "config_include_samebase.toml") is plan
+
+    def test_touched_but_unchanged(self, config_dir):
+        path = config_dir / "config_include_samebase.toml"
+        plan = load_plan(path)
+        (config_dir / "config.toml").write_text(
+            (config_dir / "config.toml").read_text()
+        )
+        assert load_plan(path) is plan
+
+    def test_invalidated_by_included_file(self, config_dir):
+        path = config_dir / "config_include_samebase.toml"
+        plan = load_plan(path)
+        included = config_dir / "config.toml"
+        included.write_text(included.read_text().replace("humble", "foxy"))
+
+        new_plan = load_plan(path)
+        assert new_plan is not plan
+        assert new_plan["localhost"][0].image == "ros:foxy-ros-core"
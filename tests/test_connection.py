@@ -1,6 +1,8 @@
+import paramiko
 import pytest
 
 from docker_launch import check_connection
+from docker_launch.connection import probe_connections
 
 
 @pytest.mark.usefixtures("mock_ssh_connection")
@@ -29,3 +31,13 @@ def test_check_connection_to_different_port():
     assert check_connection("user@172.29.0.1", port=21) is False
     assert check_connection("172.29.0.1", username="user", port=21) is False
     assert check_connection("user@172.29.0.1", username="user", port=21) is False
+
+
+@pytest.mark.usefixtures("mock_ssh_connection")
+def test_probe_connections():
+    addresses = ["user@172.29.0.1", "you@172.29.0.1", "user@172.29.0.11"]
+    results = probe_connections(addresses, max_workers=2)
+    assert [r.address for r in results] == addresses
+    assert [r.ok for r in results] == [True, False, False]
+    assert results[1].error is paramiko.AuthenticationException
+    assert all(r.latency >= 0 for r in results)
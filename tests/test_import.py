@@ -0,0 +1,38 @@
+import subprocess
+import sys
+from typing import List
+
+import docker_launch
+
+
+def imported_modules(statement: str) -> List[str]:
+    code = f"import sys; {statement}; print(' '.join(sys.modules.keys()))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+    return result.stdout.split()
+
+
+def test_no_heavy_import():
+    modules = imported_modules("import docker_launch")
+    assert "docker" not in modules
+    assert "paramiko" not in modules
+
+
+def test_check_command_does_not_import_docker():
+    modules = imported_modules("import docker_launch.console")
+    assert "docker" not in modules
+    assert "docker_launch.launch" not in modules
+
+
+def test_lazy_alias():
+    modules = imported_modules("from docker_launch import launch_containers")
+    assert "docker" in modules
+
+
+def test_aliases_import_on_access():
+    lazy = set(imported_modules("import docker_launch"))
+    for name, module in docker_launch._aliases.items():
+        module = f"docker_launch{module}"
+        assert module not in lazy
+        assert module in imported_modules(f"from docker_launch import {name}")
@@ -1,8 +1,30 @@
+import logging
+import threading
+import time
+from unittest.mock import MagicMock
+
 import docker
 import pytest
 
 from docker_launch import launch_containers, check_docker_available
-from docker_launch.launch import Containers
+from docker_launch.config_parser import LaunchPlan
+from docker_launch.exceptions import LaunchError
+from docker_launch.launch import (
+    Backoff,
+    Containers,
+    HostScheduler,
+    list_status,
+    wait_ready,
+)
+from docker_launch.utils import resolve_base_url
+
+from .benchmarks.fake_docker import (
+    FakeClient,
+    FakeClientPool,
+    FakeContainerCollection,
+    write_config,
+)
+from .test_async_launch import TrackingPool
 
 DOCKER_NOT_AVAILABLE = not check_docker_available()
 skip_if_docker_not_available = pytest.mark.skipif(
@@ -68,6 +90,34 @@ class TestContainers:
         c.stop()
         c.remove()
 
+    def test_listen(self, sample_dir, config_file_name):
+        c = Containers(sample_dir / config_file_name)
+        _ = c.start()
+        c.listen()
+        assert c.status() == {}
+
+        c.containers_list[0].stop()
+        for _ in range(50):
+            if c.status():
+                break
+            time.sleep(0.1)
+        assert len(c.status()["exited"]) == 1
+
+        c.close_listeners()
+        c.stop()
+        c.remove()
+
+    def test_follow_logs(self, sample_dir, config_file_name):
+        c = Containers(sample_dir / config_file_name)
+        _ = c.start()
+        c.follow_logs()
+        assert c.ping() == {}
+
+        c.unfollow_logs()
+        assert c._log_follower is None
+        c.stop()
+        c.remove()
+
     @pytest.mark.usefixtures("keyboardinterrupt_on_sleep")
     def test_watch(self, sample_dir, config_file_name):
         c = Containers(sample_dir / config_file_name)
@@ -85,3 +135,786 @@ class TestContainers:
 @pytest.mark.usefixtures("mock_docker_client", "keyboardinterrupt_on_sleep")
 def test_launch_containers(sample_dir, config_file_name):
     _ = launch_containers(sample_dir / config_file_name, remove=True)
+
+
+@pytest.mark.parametrize("events", [False, True])
+def test_launch_events(tmp_path, monkeypatch, events):
+    watched = []
+    monkeypatch.setattr(Containers, "watch", lambda self, **kw: watched.append(kw))
+    monkeypatch.setattr("docker.DockerClient", FakeClient)
+    launch_containers(write_config(tmp_path / "config.toml", 2, 1), events=events)
+    assert watched[0]["events"] is events
+
+
+class TestPrepare:
+    @pytest.fixture
+    def pool(self):
+        clients = {}
+
+        def get(machine):
+            base_url = resolve_base_url(machine)
+            if base_url not in clients:
+                client = MagicMock()
+                client.api.base_url = f"http+docker://{base_url}"
+                client.images.get.side_effect = docker.errors.ImageNotFound("")
+                client.api.pull.return_value = iter([{"status": "Pull complete"}])
+                clients[base_url] = client
+            return clients[base_url]
+
+        pool = MagicMock()
+        pool.get.side_effect = get
+        pool.clients = clients
+        return pool
+
+    def test_pull_once_per_host(self, sample_dir, pool):
+        c = Containers(sample_dir / "config_multiple_differentbase.toml", pool=pool)
+        c.prepare()
+
+        assert set(pool.clients.keys()) == {None, "ssh://user@172.29.1.2"}
+        for client in pool.clients.values():
+            pulled = [call.args for call in client.api.pull.call_args_list]
+            assert sorted(pulled) == [("ros",), ("ros",)]
+            tags = sorted(call.kwargs["tag"] for call in client.api.pull.call_args_list)
+            assert tags == ["foxy-ros-core", "humble-ros-core"]
+
+    def test_skip_existing(self, sample_dir, pool):
+        c = Containers(sample_dir / "config.toml", pool=pool)
+        for machine in ["localhost", "user@172.29.1.2"]:
+            pool.get(machine).images.get.side_effect = None
+        c.prepare()
+        for client in pool.clients.values():
+            client.api.pull.assert_not_called()
+
+    def test_pull_error(self, sample_dir, pool):
+        c = Containers(sample_dir / "config.toml", pool=pool)
+        pool.get("localhost").api.pull.return_value = iter([{"error": "denied"}])
+        with pytest.raises(LaunchError):
+            c.prepare()
+
+
+class TestHostScheduler:
+    def run_tracked(self, scheduler, hosts, n_tasks):
+        lock = threading.Lock()
+        in_flight = {host: 0 for host in hosts}
+        peak = {host: 0 for host in hosts}
+        total = {"now": 0, "peak": 0}
+        order = []
+
+        def task(host):
+            with lock:
+                order.append(host)
+                in_flight[host] += 1
+                total["now"] += 1
+                peak[host] = max(peak[host], in_flight[host])
+                total["peak"] = max(total["peak"], total["now"])
+            time.sleep(0.01)
+            with lock:
+                in_flight[host] -= 1
+                total["now"] -= 1
+            return host
+
+        futures = [
+            scheduler.submit(host, task, host) for host in hosts for _ in range(n_tasks)
+        ]
+        assert [f.result() for f in futures] == [
+            h for h in hosts for _ in range(n_tasks)
+        ]
+        return peak, total["peak"], order
+
+    def test_per_host_limit(self):
+        with HostScheduler(max_workers=16, max_per_host=3) as scheduler:
+            peak, total, _ = self.run_tracked(scheduler, ["a", "b"], 12)
+        assert peak == {"a": 3, "b": 3}
+        assert total == 6
+
+    def test_global_limit(self):
+        with HostScheduler(max_workers=4, max_per_host=8) as scheduler:
+            _, total, _ = self.run_tracked(scheduler, ["a", "b", "c"], 8)
+        assert total <= 4
+
+    def test_fair_interleaving(self):
+        with HostScheduler(max_workers=2, max_per_host=2) as scheduler:
+            _, _, order = self.run_tracked(scheduler, ["a", "b"], 10)
+        # Tasks of the second host don't wait for all tasks of the first.
+        assert "b" in order[:4]
+
+    def test_metrics(self):
+        scheduler = HostScheduler(max_workers=2, max_per_host=1)
+        event = threading.Event()
+        futures = [scheduler.submit("a", event.wait) for _ in range(5)]
+        assert scheduler.metrics()["a"]["max_queued"] >= 4
+        event.set()
+        _ = [f.result() for f in futures]
+        scheduler.shutdown(wait=True)
+        assert scheduler.metrics()["a"]["queued"] == 0
+        assert scheduler.metrics()["a"]["running"] == 0
+        assert scheduler.metrics()["a"]["completed"] == 5
+
+    def test_exception(self):
+        with HostScheduler() as scheduler:
+            future = scheduler.submit("a", int, "not a number")
+            with pytest.raises(ValueError):
+                future.result()
+
+    def test_start_per_host_limit(self, tmp_path):
+        pool = TrackingPool(latency=0.01)
+        config_path = write_config(tmp_path / "config.toml", 40, 2)
+        c = Containers(config_path, pool=pool, max_per_host=4)
+        _ = c.start()
+        assert len(c.containers_list) == 40
+        assert all(0 < x.max_in_flight <= 4 for x in pool.clients.values())
+        c.stop()
+        c.close()
+
+
+class TestStartStages:
+    @pytest.fixture
+    def config_path(self, tmp_path):
+        path = tmp_path / "config.toml"
+        path.write_text(
+            """
+[master]
+command = "master {i}"
+ready_log = "^master"
+targets = [{ i = "0", __machine__ = "user@172.29.0.1" }]
+
+[nodes]
+command = "node {i}"
+depends_on = ["master"]
+targets = [
+    { i = "0", __machine__ = "user@172.29.0.1" },
+    { i = "1", __machine__ = "user@172.29.0.2" },
+]
+"""
+        )
+        return path
+
+    def test_ordered(self, config_path):
+        c = Containers(config_path, pool=FakeClientPool())
+        _ = c.start(ready_timeout=1)
+        assert len(c.containers_list) == 3
+        master, *nodes = sorted(c.containers_list, key=lambda x: x.id)
+        assert master.command == "master 0"
+        assert all(x.command.startswith("node") for x in nodes)
+
+    def test_not_ready(self, config_path):
+        config_path.write_text(
+            config_path.read_text().replace('"^master"', '"never printed"')
+        )
+        c = Containers(config_path, pool=FakeClientPool())
+        with pytest.raises(LaunchError):
+            c.start(ready_timeout=0.1)
+        # Already started containers are tracked, to be stopped on failure.
+        assert [x.command for x in c.containers_list] == ["master 0"]
+
+    def test_gated_by_dependencies_only(self, config_path, monkeypatch):
+        config_path.write_text(
+            config_path.read_text()
+            + """
+[monitor]
+command = "monitor"
+depends_on = "master"
+targets = [{ __machine__ = "user@172.29.0.1" }]
+
+[late]
+command = "late"
+depends_on = ["nodes"]
+targets = [{ __machine__ = "user@172.29.0.2" }]
+"""
+        )
+        run = FakeContainerCollection.run
+
+        def run_monitor_exits(self, image, command, **kwargs):
+            container = run(self, image, command, **kwargs)
+            if command == "monitor":
+                container.attrs["State"]["Status"] = "exited"
+            return container
+
+        monkeypatch.setattr(FakeContainerCollection, "run", run_monitor_exits)
+        c = Containers(config_path, pool=FakeClientPool())
+        # Nothing depends on 'monitor', so its exit doesn't block 'late'.
+        _ = c.start(ready_timeout=1)
+        commands = sorted(x.command for x in c.containers_list)
+        assert commands == ["late", "master 0", "monitor", "node 0", "node 1"]
+
+    def test_failure_tracks_in_flight(self, tmp_path, monkeypatch):
+        run = FakeContainerCollection.run
+
+        def run_fails_once(self, image, command, **kwargs):
+            if command == "sleep 0":
+                raise docker.errors.APIError("no space left on device")
+            time.sleep(0.05)
+            return run(self, image, command, **kwargs)
+
+        monkeypatch.setattr(FakeContainerCollection, "run", run_fails_once)
+        pool = FakeClientPool()
+        c = Containers(write_config(tmp_path / "config.toml", 6, 1), pool=pool)
+        with pytest.raises(docker.errors.APIError):
+            c.start()
+        c.stop()
+        time.sleep(0.2)
+        # Containers created while the failure propagated are stopped too.
+        created = list(pool.get("user@172.29.0.1").store.values())
+        assert sorted(c.containers_list, key=id) == sorted(created, key=id)
+        assert all(x.status == "exited" for x in created)
+
+    def test_exited(self):
+        container = FakeClientPool().get().containers.run("ubuntu", "true")
+        container.stop()
+        with pytest.raises(LaunchError):
+            wait_ready(container, timeout=1)
+
+    def test_healthcheck(self):
+        container = FakeClientPool().get().containers.run("ubuntu", "true")
+        container.attrs["State"]["Health"] = {"Status": "starting"}
+        with pytest.raises(LaunchError):
+            wait_ready(container, timeout=0.1, interval=0.01)
+        container.attrs["State"]["Health"] = {"Status": "healthy"}
+        wait_ready(container, timeout=0.1)
+
+
+class TestStop:
+    @pytest.fixture
+    def containers(self, tmp_path):
+        c = Containers(
+            write_config(tmp_path / "config.toml", 6, 2), pool=FakeClientPool()
+        )
+        _ = c.start()
+        yield c
+        c.close()
+
+    def test_stopped(self, containers):
+        report = containers.stop()
+        assert len(report["stopped"]) == 6
+        assert report["killed"] == report["unreachable"] == []
+
+    def test_kill_stragglers(self, containers):
+        hung = containers.containers_list[0]
+        hung.stop = lambda timeout=None: time.sleep(5)
+
+        start = time.monotonic()
+        report = containers.stop(grace_period=0.1, deadline=1)
+        assert time.monotonic() - start < 2
+        assert report["killed"] == [hung]
+        assert hung.status == "exited"
+        assert len(report["stopped"]) == 5
+
+    def test_unreachable(self, containers):
+        def fail(*args, **kwargs):
+            raise ConnectionError
+
+        lost, hung = containers.containers_list[:2]
+        lost.stop = fail
+        hung.stop = lambda timeout=None: time.sleep(5)
+        hung.kill = lambda: time.sleep(5)
+
+        start = time.monotonic()
+        report = containers.stop(grace_period=0.1, deadline=0.5)
+        assert time.monotonic() - start < 1
+        assert set(report["unreachable"]) == {lost, hung}
+        assert len(report["stopped"]) == 4
+
+    def test_window_per_container(self, tmp_path, monkeypatch):
+        # Stops run one at a time, so a window shared by all would expire early.
+        monkeypatch.setattr(Containers, "StopSlack", 0.2)
+        c = Containers(
+            write_config(tmp_path / "config.toml", 4, 1),
+            pool=FakeClientPool(),
+            max_per_host=1,
+        )
+        _ = c.start()
+        for container in c.containers_list:
+            container.stop = lambda timeout=None: time.sleep(0.25)
+        report = c.stop(grace_period=0.1, deadline=5)
+        c.close()
+        assert len(report["stopped"]) == 4
+        assert report["killed"] == []
+
+    def test_cancel_queued(self, tmp_path):
+        c = Containers(
+            write_config(tmp_path / "config.toml", 3, 1),
+            pool=FakeClientPool(),
+            max_per_host=1,
+        )
+        _ = c.start()
+        hung, *queued = c.containers_list
+        hung.stop = lambda timeout=None: time.sleep(5)
+        stopped = []
+        for container in queued:
+            container.stop = lambda timeout=None: stopped.append(1)
+
+        start = time.monotonic()
+        report = c.stop(grace_period=0.1, deadline=1)
+        c.close()
+        assert time.monotonic() - start < 2
+        assert set(report["killed"]) == set(c.containers_list)
+        # Requests still queued behind the hung one are never sent.
+        assert stopped == []
+
+
+class TestTeardown:
+    @pytest.fixture
+    def pool(self):
+        return FakeClientPool()
+
+    @pytest.fixture
+    def containers(self, tmp_path, pool):
+        c = Containers(write_config(tmp_path / "config.toml", 6, 2), pool=pool)
+        _ = c.start()
+        yield c
+        c.close()
+
+    def test_teardown(self, containers, pool):
+        calls = pool.calls
+        report = containers.teardown()
+        assert len(report["removed"]) == 6
+        assert report["unreachable"] == []
+        assert pool.calls - calls == 6
+        assert all(len(client.store) == 0 for client in pool.clients.values())
+
+    def test_prune(self, containers, pool):
+        other = Containers(containers.config_path, pool=pool)
+        _ = other.start()
+        containers.stop()
+        other.stop()
+
+        calls = pool.calls
+        assert len(containers.prune()) == 6
+        assert pool.calls - calls == 2
+        assert sum(len(client.store) for client in pool.clients.values()) == 6
+
+
+class FakeClock:
+    """Replacement of ``time`` module, whose ``sleep`` advances virtual time."""
+
+    def __init__(self, until: float, on_sleep=None) -> None:
+        self.now = 0.0
+        self.until = until
+        self.on_sleep = on_sleep
+        self.sleeps = []
+        self.time = time.time
+        self.perf_counter = time.perf_counter
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+        if self.on_sleep is not None:
+            self.on_sleep(self.now)
+        if self.now >= self.until:
+            raise KeyboardInterrupt
+
+
+class TestAdaptiveWatch:
+    def test_backoff(self):
+        backoff = Backoff(1, 5)
+        assert [backoff.next() for _ in range(5)] == [1, 2, 4, 5, 5]
+        backoff.reset()
+        assert backoff.next() == 1
+
+    @pytest.fixture
+    def containers(self, tmp_path):
+        c = Containers(
+            write_config(tmp_path / "config.toml", 4, 2), pool=FakeClientPool()
+        )
+        _ = c.start()
+        yield c
+        c.close()
+
+    def watch(self, monkeypatch, containers, clock, **kwargs):
+        monkeypatch.setattr("docker_launch.launch.time", clock)
+        with pytest.raises(KeyboardInterrupt):
+            containers.watch(**kwargs)
+        return clock.sleeps
+
+    def test_back_off_when_stable(self, monkeypatch, containers):
+        sleeps = self.watch(monkeypatch, containers, FakeClock(60), max_interval=10)
+        assert sleeps[:6] == [1, 2, 4, 8, 10, 10]
+
+    def test_snap_back_on_change(self, monkeypatch, containers):
+        def on_sleep(now):
+            if 20 <= now < 30:
+                containers.containers_list[0].stop()
+
+        clock = FakeClock(60, on_sleep)
+        sleeps = self.watch(monkeypatch, containers, clock, max_interval=10)
+        assert sleeps[:5] == [1, 2, 4, 8, 10]
+        assert sleeps[5:8] == [1, 2, 4]
+
+    def test_unreachable_host(self, monkeypatch, containers):
+        def fail(*args, **kwargs):
+            raise docker.errors.APIError("daemon is shutting down")
+
+        client = containers.pool.get("user@172.29.0.1")
+        monkeypatch.setattr(client.containers, "list", fail)
+        _ = self.watch(monkeypatch, containers, FakeClock(30), max_interval=10)
+        # Failed poll doesn't end watching, so the containers are left running.
+        assert all(x.status == "running" for x in containers.containers_list)
+
+    def test_snap_back_on_failure(self, monkeypatch, containers):
+        ping = containers.ping
+        clock = FakeClock(60)
+
+        # Fails only on the poll at 25.
+        def flaky_ping(*args, **kwargs):
+            if clock.now == 25:
+                raise ConnectionError("connection reset")
+            return ping(*args, **kwargs)
+
+        monkeypatch.setattr(containers, "ping", flaky_ping)
+        sleeps = self.watch(monkeypatch, containers, clock, max_interval=10)
+        assert sleeps[:5] == [1, 2, 4, 8, 10]
+        assert sleeps[5:8] == [1, 2, 4]
+        assert all(x.status == "running" for x in containers.containers_list)
+
+    def test_snap_back_on_unreachable(self, monkeypatch, containers):
+        client = containers.pool.get("user@172.29.0.1")
+        clock = FakeClock(60)
+
+        def on_sleep(now):
+            # Unreachable only on the poll at 25.
+            if now == 25:
+                client.containers.list = MagicMock(side_effect=ConnectionError)
+            else:
+                client.containers.__dict__.pop("list", None)
+
+        clock.on_sleep = on_sleep
+        sleeps = self.watch(monkeypatch, containers, clock, max_interval=10)
+        assert sleeps[:5] == [1, 2, 4, 8, 10]
+        assert sleeps[5:8] == [1, 2, 4]
+
+    def test_per_container_interval(self, monkeypatch, containers):
+        name = containers.containers_list[0].name
+        sleeps = self.watch(
+            monkeypatch,
+            containers,
+            FakeClock(60),
+            max_interval=10,
+            intervals={name: 2},
+        )
+        assert max(sleeps) == 2
+
+
+class TestBatchedPing:
+    def test_one_call_per_host(self, tmp_path):
+        pool = FakeClientPool()
+        c = Containers(write_config(tmp_path / "config.toml", 30, 3), pool=pool)
+        _ = c.start()
+        c.follow_logs()
+
+        calls = pool.calls
+        assert c.ping() == {}
+        assert pool.calls - calls == 3
+
+        c.containers_list[0].stop()
+        c.containers_list[1].remove()
+        result = c.ping()
+        assert len(result["exited"]) == 1
+        assert len(result["not found"]) == 1
+        assert c.containers_list[0].status == "exited"
+        c.unfollow_logs()
+
+    def test_unreachable_host(self, tmp_path, monkeypatch):
+        pool = FakeClientPool()
+        c = Containers(write_config(tmp_path / "config.toml", 4, 2), pool=pool)
+        _ = c.start()
+
+        def fail(*args, **kwargs):
+            raise docker.errors.APIError("daemon is shutting down")
+
+        monkeypatch.setattr(pool.get("user@172.29.0.1").containers, "list", fail)
+        result = c.ping(c.containers_list)
+        lost = [x for x in c.containers_list if c._machines[x.id] == "user@172.29.0.1"]
+        assert [r["container"] for r in result["unreachable"]] == lost
+        assert list(result) == ["unreachable"]
+        # Last known status is kept.
+        assert all(x.status == "running" for x in lost)
+
+    def test_hung_log_fetch(self, tmp_path, monkeypatch, caplog):
+        caplog.set_level(logging.WARNING)
+        c = Containers(
+            write_config(tmp_path / "config.toml", 4, 2), pool=FakeClientPool()
+        )
+        _ = c.start()
+        c.PingTimeout = 0.1
+        released = threading.Event()
+        monkeypatch.setattr(
+            c.containers_list[0], "logs", lambda **kwargs: released.wait()
+        )
+
+        start = time.monotonic()
+        assert c.ping() == {}
+        assert time.monotonic() - start < 1
+        assert "Fetching logs of some containers timed out." in caplog.text
+        released.set()
+        c.close()
+
+    def test_list_status_chunked(self, tmp_path):
+        pool = FakeClientPool()
+        c = Containers(write_config(tmp_path / "config.toml", 25, 1), pool=pool)
+        _ = c.start()
+        client = pool.get("user@172.29.0.1")
+        calls = client.calls
+
+        ids = [x.id for x in c.containers_list]
+        status = list_status(client, ids, chunk_size=10)
+        assert status == {i: "running" for i in ids}
+        assert client.calls - calls == 3
+
+
+class TestListen:
+    @pytest.fixture
+    def containers(self, tmp_path):
+        c = Containers(
+            write_config(tmp_path / "config.toml", 2, 1), pool=FakeClientPool()
+        )
+        _ = c.start()
+        c.listen()
+        yield c
+        c.close_listeners()
+        c.close()
+
+    @staticmethod
+    def wait_until(condition, timeout: float = 2.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+    def test_restarted_by_policy(self, containers):
+        container = containers.containers_list[0]
+        events = container.client.event_queue
+        container.attrs["State"]["Status"] = "exited"
+        events.put({"Action": "die", "id": container.id, "time": 100})
+        self.wait_until(lambda: "exited" in containers.status())
+
+        container.attrs["State"]["Status"] = "running"
+        events.put({"Action": "start", "id": container.id, "time": 101})
+        self.wait_until(lambda: containers.status() == {})
+
+    def test_reconnect_since_last_event(self, containers, caplog):
+        caplog.set_level(logging.WARNING)
+        container = containers.containers_list[0]
+        client = container.client
+        client.event_queue.put(
+            {"Action": "exec_start", "id": container.id, "time": 100}
+        )
+        client.event_queue.put(ConnectionError("stream reset"))
+        self.wait_until(lambda: client.event_since[-1:] == [100])
+        assert "broken" in caplog.text
+
+        container.attrs["State"]["Status"] = "exited"
+        client.event_queue.put({"Action": "die", "id": container.id, "time": 102})
+        self.wait_until(lambda: "exited" in containers.status())
+
+    def test_poll_while_disconnected(self, containers, monkeypatch):
+        container = containers.containers_list[0]
+        client = container.client
+
+        def fail(*args, **kwargs):
+            raise ConnectionError("connection refused")
+
+        monkeypatch.setattr(client, "events", fail)
+        container.attrs["State"]["Status"] = "exited"
+        client.event_queue.put(ConnectionError("stream reset"))
+        # Host is polled, though no event arrives.
+        self.wait_until(lambda: "exited" in containers.status())
+
+
+class TestFollowLogs:
+    @pytest.fixture
+    def containers(self, tmp_path, caplog):
+        caplog.set_level(logging.INFO)
+        c = Containers(
+            write_config(tmp_path / "config.toml", 4, 2), pool=FakeClientPool()
+        )
+        _ = c.start()
+        yield c
+        c.unfollow_logs()
+        c.close()
+
+    wait_until = staticmethod(TestListen.wait_until)
+
+    def test_since_last_ping(self, containers):
+        containers.follow_logs()
+        since = [x.log_since for x in containers.containers_list]
+        assert since == [[containers.last_ping]] * 4
+
+    def test_open_failure(self, monkeypatch, containers, caplog):
+        failing = containers.containers_list[0]
+
+        def fail(stream=False, **kwargs):
+            raise ConnectionError("channel open failed")
+
+        monkeypatch.setattr(failing, "logs", fail)
+        monkeypatch.setattr("docker_launch.launch.time", FakeClock(5))
+        with pytest.raises(KeyboardInterrupt):
+            containers.watch()
+        assert f"Failed to follow logs of {failing.short_id}" in caplog.text
+        assert all(x.status == "running" for x in containers.containers_list)
+
+    def test_reopen(self, containers, caplog):
+        container = containers.containers_list[0]
+        containers.follow_logs()
+        container.log_queue.put(b"2023-04-01T12:00:00.500000000Z first\n")
+        container.log_queue.put(None)  # Ended by restart.
+        self.wait_until(lambda: len(container.log_since) == 2, timeout=3)
+        assert container.log_since[1] == 1680350400.5
+
+        # Lines since the last one read, which is included.
+        container.log_queue.put(
+            b"2023-04-01T12:00:00.500000000Z first\n"
+            b"2023-04-01T12:00:01.000000000Z second\n"
+        )
+        self.wait_until(lambda: "second" in caplog.text)
+        assert caplog.text.count("first") == 1
+
+    def test_streams_per_host(self, tmp_path, caplog):
+        caplog.set_level(logging.INFO)
+        c = Containers(
+            write_config(tmp_path / "config.toml", 10, 1), pool=FakeClientPool()
+        )
+        c.LogSliceInterval = 0.05
+        _ = c.start()
+        c.follow_logs()
+        sliced = [x for x in c.containers_list if not x.log_since]
+        assert len(sliced) == 10 - c.MaxLogStreams
+        # Logs of the rest are fetched periodically.
+        self.wait_until(lambda: all(x.command in caplog.text for x in sliced))
+        c.unfollow_logs()
+        c.close()
+
+
+class TestAttach:
+    @pytest.fixture
+    def config_path(self, tmp_path):
+        return write_config(tmp_path / "config.toml", 12, 3)
+
+    def test_labels(self, config_path):
+        c = Containers(config_path, pool=FakeClientPool())
+        _ = c.start(labels={"owner": "me"})
+        for container in c.containers_list:
+            labels = container.attrs["Config"]["Labels"]
+            assert labels["owner"] == "me"
+            assert labels[c.GroupLabel] == c.group_id
+            assert labels[c.ConfigHashLabel] == c.config.digest
+            assert labels[c.MachineLabel] == c._machines[container.id]
+
+    def test_plan_loaded_once(self, config_path, monkeypatch):
+        loads = []
+        load = LaunchPlan.load.__func__
+        monkeypatch.setattr(
+            LaunchPlan,
+            "load",
+            classmethod(lambda cls, *a, **kw: loads.append(a) or load(cls, *a, **kw)),
+        )
+        c = Containers(config_path, pool=FakeClientPool())
+        _ = c.start()
+        # Once for image preparation and once for the targets, not per container.
+        assert len(loads) == 2
+
+    def test_attach(self, config_path):
+        pool = FakeClientPool()
+        c = Containers(config_path, pool=pool)
+        _ = c.start()
+        other = Containers(config_path, pool=pool)
+        _ = other.start()
+
+        calls = pool.calls
+        attached = Containers.attach(config_path, c.group_id, pool=pool)
+        assert pool.calls - calls == 3
+        assert {x.id for x in attached.containers_list} == {
+            x.id for x in c.containers_list
+        }
+        assert attached._machines == c._machines
+
+        attached.stop()
+        assert len(c.ping()["exited"]) == 12
+        assert other.ping() == {}
+
+    def test_attach_unknown_group(self, config_path):
+        with pytest.raises(LaunchError):
+            Containers.attach(config_path, "unknown", pool=FakeClientPool())
+
+
+class TestApply:
+    @pytest.fixture
+    def config_path(self, tmp_path):
+        return write_config(tmp_path / "config.toml", 12, 3)
+
+    def test_create_all(self, config_path):
+        c = Containers(config_path, pool=FakeClientPool(), group_id="g")
+        result = c.apply()
+        assert len(result["created"]) == 12
+        assert len(result["kept"]) == len(result["removed"]) == 0
+        assert len(c.containers_list) == 12
+
+    def test_no_change(self, config_path):
+        pool = FakeClientPool()
+        _ = Containers(config_path, pool=pool, group_id="g").apply()
+        c = Containers(config_path, pool=pool, group_id="g")
+        result = c.apply()
+        assert len(result["kept"]) == 12
+        assert len(result["created"]) == len(result["removed"]) == 0
+
+    def test_single_target_changed(self, config_path):
+        pool = FakeClientPool()
+        _ = Containers(config_path, pool=pool, group_id="g").apply()
+        config_path.write_text(config_path.read_text().replace('id = "3"', 'id = "x"'))
+
+        c = Containers(config_path, pool=pool, group_id="g")
+        result = c.apply()
+        assert len(result["kept"]) == 11
+        assert [x.command for x in result["created"]] == ["sleep x"]
+        assert [x.command for x in result["removed"]] == ["sleep 3"]
+        assert sum(len(client.store) for client in pool.clients.values()) == 12
+
+    def test_host_removed(self, config_path):
+        pool = FakeClientPool()
+        _ = Containers(config_path, pool=pool, group_id="g").apply()
+        write_config(config_path, 12, 2)
+
+        result = Containers(config_path, pool=pool, group_id="g").apply()
+        assert len(result["kept"]) + len(result["created"]) == 12
+        assert len(pool.get("user@172.29.0.3").store) == 0
+        assert sum(len(client.store) for client in pool.clients.values()) == 12
+
+    def test_attach_after_apply(self, config_path, caplog):
+        caplog.set_level(logging.WARNING)
+        pool = FakeClientPool()
+        _ = Containers(config_path, pool=pool, group_id="g").apply()
+        config_path.write_text(config_path.read_text().replace('id = "3"', 'id = "x"'))
+        _ = Containers(config_path, pool=pool, group_id="g").apply()
+
+        attached = Containers.attach(config_path, "g", pool=pool)
+        assert len(attached.containers_list) == 12
+        assert "different configuration" not in caplog.text
+
+        config_path.write_text(config_path.read_text().replace('id = "x"', 'id = "y"'))
+        _ = Containers.attach(config_path, "g", pool=pool)
+        assert caplog.text.count("different configuration") == 1
+
+    def test_run_options_changed(self, config_path):
+        pool = FakeClientPool()
+        _ = Containers(config_path, pool=pool, group_id="g").apply()
+        result = Containers(config_path, pool=pool, group_id="g").apply(tty=True)
+        assert len(result["created"]) == len(result["removed"]) == 12
+
+    def test_exited_container_replaced(self, config_path):
+        pool = FakeClientPool()
+        c = Containers(config_path, pool=pool, group_id="g")
+        _ = c.apply()
+        c.containers_list[0].stop()
+
+        result = Containers(config_path, pool=pool, group_id="g").apply()
+        assert len(result["kept"]) == 11
+        assert len(result["created"]) == len(result["removed"]) == 1
+
+    def test_other_group_untouched(self, config_path):
+        pool = FakeClientPool()
+        _ = Containers(config_path, pool=pool, group_id="g").apply()
+        result = Containers(config_path, pool=pool, group_id="h").apply()
+        assert len(result["created"]) == 12
+        assert len(result["removed"]) == 0
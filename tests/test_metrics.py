@@ -0,0 +1,113 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from docker_launch.launch import Containers
+from docker_launch.metrics import (
+    ContainerState,
+    Histogram,
+    LaunchMetrics,
+    MetricsServer,
+)
+
+from .benchmarks.fake_docker import FakeClientPool, write_config
+
+
+def test_histogram():
+    h = Histogram([0.1, 1])
+    for value in [0.05, 0.5, 0.5, 5]:
+        h.observe(value, (("host", "a"),))
+    assert list(h.samples("x")) == [
+        'x_bucket{host="a",le="0.1"} 1',
+        'x_bucket{host="a",le="1"} 3',
+        'x_bucket{host="a",le="+Inf"} 4',
+        'x_sum{host="a"} 6.05',
+        'x_count{host="a"} 4',
+    ]
+
+
+def test_render():
+    metrics = LaunchMetrics()
+    metrics.started("a", 0)
+    metrics.observe_status("a", "restarting")
+    metrics.observe_status("a", "restarting")
+    metrics.observe_status("a", "running")
+    metrics.observe_log("a", b"hello")
+    metrics.record("container.create", "ssh://user@172.29.1.2", 0.2)
+    metrics.record("config.parse", None, 0.2)
+    text = metrics.render([ContainerState("a", 'na"me', "172.29.1.2", "running")])
+
+    labels = 'container="na\\"me",host="172.29.1.2"'
+    assert f'docker_launch_container_status{{{labels},status="running"}} 1' in text
+    assert f"docker_launch_container_restarts_total{{{labels}}} 1" in text
+    assert f"docker_launch_log_lines_total{{{labels}}} 1" in text
+    assert f"docker_launch_log_bytes_total{{{labels}}} 5" in text
+    assert 'call="container.create"' in text
+    assert "config.parse" not in text
+    assert "# TYPE docker_launch_api_call_duration_seconds histogram" in text
+
+
+def test_restart_count():
+    metrics = LaunchMetrics()
+    metrics.observe_attrs("a", {"RestartCount": 2})
+    metrics.observe_status("a", "restarting")
+    metrics.observe_attrs("a", {"RestartCount": 5})
+    metrics.observe_attrs("a", {"RestartCount": 5})
+    metrics.observe_attrs("b", {})
+    assert metrics.restarts["a"] == 3
+    assert "b" not in metrics.restarts
+
+
+def test_restart_count_on_status_change(tmp_path, monkeypatch):
+    c = Containers(write_config(tmp_path / "config.toml", 2, 1), pool=FakeClientPool())
+    _ = c.start()
+    container = c.containers_list[0]
+
+    def listed(status):
+        return lambda client, ids: {i: status for i in ids}
+
+    container.attrs["RestartCount"] = 1
+    monkeypatch.setattr("docker_launch.launch.list_status", listed("restarting"))
+    _ = c.ping(c.containers_list)
+    assert c.metrics.restarts[container.id] == 1
+
+    # Restarted twice more, too quickly to be seen restarting.
+    container.attrs["RestartCount"] = 3
+    monkeypatch.setattr("docker_launch.launch.list_status", listed("running"))
+    _ = c.ping(c.containers_list)
+    c.close()
+    assert c.metrics.restarts[container.id] == 3
+
+
+def test_server():
+    server = MetricsServer(lambda: "metric 1\n", 0, "127.0.0.1").start()
+    try:
+        url = f"http://127.0.0.1:{server.port}"
+        with urllib.request.urlopen(f"{url}/metrics") as response:
+            assert response.read() == b"metric 1\n"
+            assert response.headers["Content-Type"].startswith("text/plain")
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{url}/other")
+    finally:
+        server.stop()
+
+
+def test_serve_launch_group(tmp_path):
+    c = Containers(write_config(tmp_path / "config.toml", 4, 2), pool=FakeClientPool())
+    server = c.serve_metrics(0, "127.0.0.1")
+    _ = c.start()
+    c.containers_list[0].stop()
+    _ = c.ping()
+
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as r:
+        text = r.read().decode("utf-8")
+    c.close()
+
+    assert text.count('status="running"} 1') == 3
+    assert text.count('status="exited"} 1') == 1
+    # Hosts are labelled the same in every metric.
+    host = 'host="user@172.29.0.1"'
+    name = "docker_launch_api_call_duration_seconds_count"
+    assert f'{name}{{{host},call="status.list"}} 1' in text
+    assert text.count(f'{host},status="running"}} 1') == 1
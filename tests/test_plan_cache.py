@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+
+import pytest
+
+from docker_launch.config_parser import ConfigFileParser, LaunchPlan, parse
+from docker_launch.plan_cache import PlanCache, fcntl
+
+
+@pytest.fixture
+def config(sample_dir, tmp_path):
+    for name in ["config.toml", "config_include_differentbase.toml"]:
+        (tmp_path / name).write_text((sample_dir / name).read_text())
+    return tmp_path / "config_include_differentbase.toml"
+
+
+class TestPlanCache:
+    def test_default_directory(self, plan_cache_dir):
+        assert PlanCache().directory == plan_cache_dir
+
+    def test_store_and_load(self, tmp_path, config):
+        cache = PlanCache(tmp_path / "cache")
+        assert cache.load(config) is None
+
+        groups, stamps = ConfigFileParser._compile(config)
+        cache.store(config, groups, stamps)
+        assert cache.load(config) == (groups, stamps)
+
+    def test_outdated(self, tmp_path, config):
+        cache = PlanCache(tmp_path / "cache")
+        cache.store(config, *ConfigFileParser._compile(config))
+
+        included = tmp_path / "config.toml"
+        stat = included.stat()
+        os.utime(included, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+        assert cache.load(config) is None
+
+    def test_corrupted(self, tmp_path, config):
+        cache = PlanCache(tmp_path / "cache")
+        cache.store(config, *ConfigFileParser._compile(config))
+        _ = [p.write_bytes(b"broken") for p in cache.directory.glob("*.pickle")]
+        assert cache.load(config) is None
+
+    def test_lru_eviction(self, tmp_path, sample_dir):
+        cache = PlanCache(tmp_path / "cache")
+        paths = [tmp_path / f"config{i}.toml" for i in range(3)]
+        for path in paths:
+            path.write_text((sample_dir / "config.toml").read_text())
+            cache.store(path, *ConfigFileParser._compile(path))
+        size = max(e["size"] for e in cache._read_manifest().values())
+
+        assert cache.load(paths[0]) is not None  # Now paths[1] is the oldest.
+        cache.max_size = 2 * size
+        cache.store(paths[2], *ConfigFileParser._compile(paths[2]))
+
+        manifest = cache._read_manifest()
+        assert set(manifest) == {str(paths[0].resolve()), str(paths[2].resolve())}
+        assert len(list(cache.directory.glob("*.pickle"))) == 2
+
+    def test_unreferenced_removed(self, tmp_path, config):
+        cache = PlanCache(tmp_path / "cache")
+        cache.directory.mkdir()
+        (cache.directory / "orphan.pickle").write_bytes(b"left by a killed run")
+        cache.store(config, *ConfigFileParser._compile(config))
+        assert len(list(cache.directory.glob("*.pickle"))) == 1
+
+    @pytest.mark.skipif(fcntl is None, reason="fcntl is not available")
+    def test_locked_across_processes(self, tmp_path, config):
+        cache = PlanCache(tmp_path / "cache")
+        cache.directory.mkdir()
+        compiled = ConfigFileParser._compile(config)
+        # flock is per open file, so this blocks as another process would.
+        with open(cache.directory / cache.LockName, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            thread = threading.Thread(target=cache.store, args=(config, *compiled))
+            thread.start()
+            thread.join(0.2)
+            assert thread.is_alive()
+            assert cache._read_manifest() == {}
+        thread.join()
+        assert str(config.resolve()) in cache._read_manifest()
+
+    def test_clear(self, tmp_path, config):
+        cache = PlanCache(tmp_path / "cache")
+        cache.store(config, *ConfigFileParser._compile(config))
+        cache.clear()
+        assert list(cache.directory.iterdir()) == [cache.directory / cache.LockName]
+
+
+class TestParseWithCache:
+    def test_zero_parse(self, config, monkeypatch, plan_cache_dir):
+        expected = parse(config, cache=True)
+        manifest = json.loads((plan_cache_dir / "manifest.json").read_text())
+        assert len(manifest[str(config.resolve())]["files"]) == 2
+
+        monkeypatch.setattr(ConfigFileParser, "_parse", None)
+        assert parse(config, cache=True) == expected
+
+    def test_modified(self, config, tmp_path):
+        _ = parse(config, cache=True)
+        (tmp_path / "config.toml").write_text('[a]\ncommand = "ls"\ntargets = [{}]\n')
+        expected = {"image": "ubuntu:latest", "cmd": "ls", "machine": None}
+        assert expected in parse(config, cache=True)[None]
+
+    def test_disabled(self, config, plan_cache_dir):
+        _ = parse(config)
+        assert not plan_cache_dir.exists()
+
+    def test_launch_plan(self, config, monkeypatch):
+        _ = parse(config, cache=True)
+        monkeypatch.setattr(ConfigFileParser, "_parse", None)
+        plan = LaunchPlan.load(config, cache=True)
+        assert len(plan.entries) == 6
+        assert plan.is_fresh()
@@ -0,0 +1,54 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from docker_launch.pool import ClientPool
+
+
+@pytest.fixture
+def mock_client_factory():
+    factory = MagicMock(side_effect=lambda base_url=None, **kw: MagicMock(url=base_url))
+    with patch("docker.DockerClient", factory):
+        yield factory
+
+
+class TestClientPool:
+    def test_lazy_creation(self, mock_client_factory):
+        pool = ClientPool()
+        assert len(pool) == 0
+        assert mock_client_factory.call_count == 0
+
+        client = pool.get("user@172.29.1.2")
+        assert client.url == "ssh://user@172.29.1.2"
+        assert mock_client_factory.call_count == 1
+
+    def test_shared_per_base_url(self, mock_client_factory):
+        pool = ClientPool()
+        assert pool.get("user@172.29.1.2") is pool.get("user@172.29.1.2")
+        assert pool.get("localhost") is pool.get(None)
+        assert pool.get("localhost") is pool.get("host")
+        assert pool.get("localhost") is not pool.get("user@172.29.1.2")
+        assert mock_client_factory.call_count == 2
+
+    def test_reconnect_on_failed_health_check(self, mock_client_factory):
+        pool = ClientPool(health_check_interval=0)
+        client = pool.get("user@172.29.1.2")
+        assert pool.get("user@172.29.1.2") is client
+
+        client.ping.side_effect = ConnectionError
+        new_client = pool.get("user@172.29.1.2")
+        assert new_client is not client
+        client.close.assert_called_once()
+
+    def test_reconnect(self, mock_client_factory):
+        pool = ClientPool()
+        client = pool.get("user@172.29.1.2")
+        assert pool.reconnect("user@172.29.1.2") is not client
+        client.close.assert_called_once()
+
+    def test_close(self, mock_client_factory):
+        with ClientPool() as pool:
+            clients = [pool.get("localhost"), pool.get("user@172.29.1.2")]
+        assert len(pool) == 0
+        for client in clients:
+            client.close.assert_called_once()
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from docker_launch import profiling
+from docker_launch.launch import Containers
+
+from .benchmarks.fake_docker import FakeClientPool, write_config
+
+
+@pytest.fixture
+def profiler():
+    profiler = profiling.enable()
+    yield profiler
+    profiling.disable(profiler)
+
+
+def test_disabled():
+    profiler = profiling.enable()
+    profiling.disable(profiler)
+    with profiling.span("phase"):
+        pass
+    assert profiler.summary() == []
+
+
+def test_multiple_sinks():
+    first, second = profiling.enable(), profiling.enable()
+    with profiling.span("phase"):
+        pass
+    profiling.disable(first)
+    with profiling.span("phase"):
+        pass
+    profiling.disable(second)
+    assert [s["count"] for s in first.summary()] == [1]
+    assert [s["count"] for s in second.summary()] == [2]
+
+
+def test_summary(profiler):
+    for duration in range(1, 21):
+        profiler.record("phase", "host", duration)
+    with profiling.span("other"):
+        time.sleep(0.01)
+
+    summary = {(s["phase"], s["host"]): s for s in profiler.summary()}
+    assert summary[("phase", "host")]["count"] == 20
+    assert summary[("phase", "host")]["p50"] == 10
+    assert summary[("phase", "host")]["p95"] == 19
+    assert summary[("phase", "host")]["max"] == 20
+    assert summary[("other", None)]["max"] >= 0.01
+
+
+def test_launch_phases(profiler, tmp_path):
+    c = Containers(write_config(tmp_path / "config.toml", 6, 2), pool=FakeClientPool())
+    _ = c.start()
+    _ = c.ping()
+    c.stop()
+    c.remove()
+    c.close()
+
+    summary = profiler.summary()
+    counts = {}
+    for s in summary:
+        counts.setdefault(s["phase"], {})[s["host"]] = s["count"]
+    assert counts["config.parse"] == {None: 1}
+    assert counts["container.create"] == {
+        "ssh://user@172.29.0.1": 3,
+        "ssh://user@172.29.0.2": 3,
+    }
+    assert sum(counts["status.list"].values()) == 2
+    assert sum(counts["container.stop"].values()) == 6
+    assert sum(counts["container.remove"].values()) == 6
+    for phase in ["start", "ping", "stop", "remove"]:
+        assert counts[phase] == {None: 1}
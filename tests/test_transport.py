@@ -0,0 +1,92 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import paramiko
+import pytest
+
+from docker_launch.connection import probe_connection
+from docker_launch.transport import SharedSSHHTTPAdapter, SSHSessionPool
+
+
+@pytest.fixture
+def mock_ssh_handshake():
+    connected = []
+
+    def connect(self, hostname, port=22, username=None, **kwargs) -> None:
+        connected.append((hostname, port, username))
+        self._transport = MagicMock()
+        self._transport.is_active.return_value = True
+
+    with patch("paramiko.SSHClient.connect", connect):
+        yield connected
+
+
+class TestSSHSessionPool:
+    def test_shared_per_host(self, mock_ssh_handshake):
+        sessions = SSHSessionPool()
+        client = sessions.get("172.29.1.2", username="user")
+        assert sessions.get("172.29.1.2", 22, "user") is client
+        assert sessions.get("172.29.1.2", username="other") is not client
+        assert sessions.handshakes == 2
+
+    def test_concurrent_get(self, mock_ssh_handshake):
+        sessions = SSHSessionPool()
+        threads = [
+            threading.Thread(target=sessions.get, args=("172.29.1.2",))
+            for _ in range(20)
+        ]
+        _ = [t.start() for t in threads]
+        _ = [t.join() for t in threads]
+        assert sessions.handshakes == 1
+
+    def test_reconnect_inactive(self, mock_ssh_handshake):
+        sessions = SSHSessionPool()
+        client = sessions.get("172.29.1.2")
+        client.get_transport().is_active.return_value = False
+        assert sessions.find("172.29.1.2") is None
+        assert sessions.get("172.29.1.2") is not client
+        assert sessions.handshakes == 2
+
+    def test_close(self, mock_ssh_handshake):
+        with SSHSessionPool() as sessions:
+            client = sessions.get("172.29.1.2")
+        assert client.get_transport() is None
+
+
+class TestSharedSSHHTTPAdapter:
+    def test_single_handshake(self, mock_ssh_handshake):
+        sessions = SSHSessionPool()
+        adapters = [
+            SharedSSHHTTPAdapter("ssh://user@172.29.1.2", sessions) for _ in range(5)
+        ]
+        assert sessions.handshakes == 1
+        assert len({id(a.ssh_client) for a in adapters}) == 1
+
+        adapters[0].close()
+        assert sessions.find("172.29.1.2", 22, "user") is not None
+
+
+class TestProbeConnection:
+    def test_reuse_session(self, mock_ssh_handshake):
+        sessions = SSHSessionPool()
+        _ = sessions.get("172.29.1.2", username="user")
+        assert probe_connection("user@172.29.1.2", sessions=sessions).ok
+        assert len(mock_ssh_handshake) == 1
+
+    def test_adopt_session(self, mock_ssh_handshake):
+        sessions = SSHSessionPool()
+        assert probe_connection("user@172.29.1.2", sessions=sessions).ok
+        _ = sessions.get("172.29.1.2", username="user")
+        assert len(mock_ssh_handshake) == 1
+        assert sessions.handshakes == 0
+
+    def test_failure_not_kept(self):
+        sessions = SSHSessionPool()
+
+        def connect(self, *args, **kwargs):
+            raise paramiko.AuthenticationException
+
+        with patch("paramiko.SSHClient.connect", connect):
+            status = probe_connection("user@172.29.1.2", sessions=sessions)
+        assert status.error is paramiko.AuthenticationException
+        assert sessions.find("172.29.1.2", 22, "user") is None